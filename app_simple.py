@@ -1,13 +1,190 @@
-from flask import Flask, render_template, request, jsonify
-import requests
+from flask import Flask, Response, abort, g, render_template, request, jsonify, send_file, stream_with_context, url_for
+from jinja2 import FileSystemBytecodeCache, __version__ as jinja2_version
+from werkzeug.security import safe_join
+from urllib.parse import quote
+import atexit
 import csv
-from io import StringIO
-from datetime import datetime
+import hashlib
+import json
+import logging
+import logging.handlers
+import mimetypes
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from changes import ChangeFeed
+from history import HistoryStore
+from instrumentation import metrics
+from lazy_imports import asyncio, np, requests
+from page_cache import RenderedReportCache
+from resilience import PERMANENT_FAILURE, CircuitBreaker, FetchPolicy, current_deadline, set_request_deadline
+from search import StudentSearchIndex
+from sheet_cache import CachedSheet, SheetCache
+from sheet_model import (CHART_POINT_COLORS, PERFORMANCE_BUCKETS, ClassSheetModel, StudentReport, SubjectReport,
+                         Topic, _round, class_sort_key, scan_student_list, sheet_version)
+from snapshots import SnapshotStore
+from sources import (NOT_MODIFIED, FetchedSheet, GspreadSource, LocalDirectorySource, PublishedCsvSource,
+                     iter_csv_lines)
 
 app = Flask(__name__)
 
-class GoogleSheetsConnector:
+
+def _env_flag(name, default=False):
+    """Read a boolean flag from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Jinja bytecode cache that also loads templates precompiled into the deployment
+
+    ``precompiled_dir`` holds the Python source Jinja generates for every
+    template (written by ``cold_start.py build`` and committed with the app).
+    Unlike marshalled bytecode it loads on any Python version; an entry is only
+    used while its checksum matches the template source, so an edited template
+    is compiled afresh instead of served stale.
+    """
+    PRECOMPILED_HEADER = '# jinja2 {version} {checksum} {name}\n'
+    
+    def __init__(self, directory=None, precompiled_dir=None):
+        super().__init__(directory)
+        self.precompiled_dir = precompiled_dir
+    
+    def get_cache_key(self, name, filename=None):
+        # Keyed by template name only, so a cache built on another machine (another
+        # absolute path) still matches; Jinja discards entries whose source changed
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def precompiled_path(cls, directory, name):
+        return os.path.join(directory, f"tmpl_{hashlib.sha1(name.encode('utf-8')).hexdigest()}.py")
+    
+    @classmethod
+    def precompiled_header(cls, name, checksum):
+        # Jinja only changes the code it generates between minor versions
+        version = '.'.join(jinja2_version.split('.')[:2])
+        return cls.PRECOMPILED_HEADER.format(version=version, checksum=checksum, name=name)
+    
+    def get_bucket(self, environment, name, filename, source):
+        bucket = super().get_bucket(environment, name, filename, source)
+        if bucket.code is None and self.precompiled_dir:
+            try:
+                with open(self.precompiled_path(self.precompiled_dir, name), encoding='utf-8') as f:
+                    if f.readline() == self.precompiled_header(name, bucket.checksum):
+                        bucket.code = compile(f.read(), filename or '<template>', 'exec')
+            except (OSError, SyntaxError, ValueError):
+                pass
+        return bucket
+    
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+# Precompiled templates shipped with the app (see cold_start.py build)
+PRECOMPILED_TEMPLATES_DIR = os.path.join(app.root_path, 'template_cache')
+
+
+def template_cache_dir():
+    """Where templates compiled at runtime are cached, or None when TEMPLATE_CACHE_DIR=off"""
+    directory = os.environ.get('TEMPLATE_CACHE_DIR')
+    if directory:
+        return None if directory.lower() == 'off' else directory
+    return os.path.join(tempfile.gettempdir(), 'student-report-templates')
+
+
+# Load templates precompiled at build time (or on an earlier start) instead of parsing
+# them on the first request
+_template_cache_dir = template_cache_dir()
+if _template_cache_dir:
+    try:
+        os.makedirs(_template_cache_dir, exist_ok=True)
+    except OSError:
+        pass    # read-only filesystem: only the shipped templates are used
+    app.jinja_options = {**app.jinja_options,
+                         'bytecode_cache': TemplateBytecodeCache(_template_cache_dir, PRECOMPILED_TEMPLATES_DIR)}
+
+
+logger = logging.getLogger('student_report')
+
+
+def _configure_logging():
+    """Level from LOG_LEVEL; records are written by a background thread so requests never wait on I/O"""
+    logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    if logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    
+    def start_listener():
+        listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+    
+    start_listener()
+    # Forked workers (gunicorn --preload, process pools) need their own writer thread
+    os.register_at_fork(after_in_child=start_listener)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+
+
+_configure_logging()
+
+
+def app_data_dir():
+    """Private directory for the app's on-disk stores, or None when there is none to use
+
+    APP_DATA_DIR, else $XDG_DATA_HOME/student-report (~/.local/share/student-report).
+    It is created owner-only and refused if another user owns it or can write to it:
+    the stores are loaded at startup, so nobody else may plant files there.
+    """
+    directory = os.environ.get('APP_DATA_DIR') or os.path.join(
+        os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share'),
+        'student-report'
+    )
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+    except OSError as e:
+        logger.warning("⚠️  No app data directory (%s): %s", directory, e)
+        return None
+    if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+        logger.warning("⚠️  Not using app data directory %s: it is writable by other users", directory)
+        return None
+    return directory
+
+
+def _store_path(env_var, filename):
+    """Path of an on-disk store: its environment variable, else a file in the app data directory, else 'off'"""
+    path = os.environ.get(env_var)
+    if path:
+        return path
+    directory = app_data_dir()
+    return os.path.join(directory, filename) if directory else 'off'
+
+
+class _InflightFetch:
+    """A sheet download in progress that concurrent callers for the same class wait on"""
     def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class GoogleSheetsConnector:
+    def __init__(self, cache_ttl=None, cache_stale_ttl=None, cache_max_entries=None,
+                 pool_connections=None, pool_maxsize=None, snapshot_path=None, local_dir=None,
+                 source=None, history_path=None, fetch_policy=None, circuit_breaker=None):
         # Dictionary to store URLs for each class - will be populated with your sheet URLs
         self.class_sheet_urls = {
             # Will be populated with your individual sheet URLs
@@ -15,462 +192,858 @@ class GoogleSheetsConnector:
             # '1C': 'https://docs.google.com/spreadsheets/d/e/...',
             # etc.
         }
-        print("✅ Google Sheets connector initialized - ready for multiple class URLs!")
+        # Per-class sheet cache (TTL, stale-while-revalidate and LRU size are configurable)
+        self.sheet_cache = SheetCache(
+            ttl=cache_ttl if cache_ttl is not None else int(os.environ.get('SHEET_CACHE_TTL', 300)),
+            stale_ttl=cache_stale_ttl if cache_stale_ttl is not None else int(os.environ.get('SHEET_CACHE_STALE_TTL', 3600)),
+            max_entries=cache_max_entries if cache_max_entries is not None else int(os.environ.get('SHEET_CACHE_MAX_ENTRIES', 64))
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresher_thread = None
+        self._refresher_stop = threading.Event()
+        
+        # One keep-alive session for every sheet download, with explicit pool limits
+        self.fetch_timeout = float(os.environ.get('SHEET_FETCH_TIMEOUT', 10))
+        self.pool_maxsize = pool_maxsize if pool_maxsize is not None else int(os.environ.get('SHEET_HTTP_POOL_MAXSIZE', 16))
+        self.pool_connections = pool_connections if pool_connections is not None else int(os.environ.get('SHEET_HTTP_POOL_CONNECTIONS', 4))
+        self._session = None
+        self._fetch_executor = None
+        self._hedge_executor = None
+        
+        # Retries, hedging and a per-class circuit breaker keep a slow or failing Google from
+        # holding requests past their deadline; an open circuit serves the last good copy
+        self.fetch_policy = fetch_policy if fetch_policy is not None else FetchPolicy.from_env()
+        self.breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker.from_env()
+        
+        # Concurrent misses for the same class share a single download
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Callbacks run whenever a class sheet changes: fn(class_name, new_entry, previous_entry)
+        self._sheet_listeners = []
+        # Which classes, topics and students changed in each new sheet version
+        self.change_feed = ChangeFeed(max_entries=int(os.environ.get('CHANGE_FEED_MAX_ENTRIES', 1000)))
+        
+        # School-wide student search, kept up to date as class sheets change
+        self.search_index = StudentSearchIndex()
+        self._search_attempts = {}   # class -> when it was last queued for indexing (guarded by _refresh_lock)
+        self.add_sheet_listener(self._index_students)
+        
+        # Cold student lists read only the top of the sheet instead of downloading all of it
+        self.stream_student_list = _env_flag('SHEET_STREAM_STUDENT_LIST', True)
+        
+        # Where sheets are read from: published CSV (default), gspread batches or a local directory
+        self.source = source if source is not None else self._source_from_env(local_dir)
+        for class_name in self.source.class_names():
+            self.class_sheet_urls.setdefault(class_name, None)
+        
+        # Last good sheets on disk, so cold starts and Google outages still have data to serve
+        if snapshot_path is None:
+            snapshot_path = _store_path('SHEET_SNAPSHOT_PATH', 'snapshots.sqlite3')
+        self.snapshots = None
+        if snapshot_path and snapshot_path.lower() != 'off':
+            try:
+                self.snapshots = SnapshotStore(snapshot_path)
+                self.add_sheet_listener(self._save_snapshot)
+            except Exception as e:
+                logger.warning("⚠️  Sheet snapshots disabled (%s): %s", snapshot_path, e)
+        
+        # Every sheet version's marks, for progress over time
+        if history_path is None:
+            history_path = _store_path('SHEET_HISTORY_PATH', 'history.sqlite3')
+        self.history = None
+        if history_path and history_path.lower() != 'off':
+            try:
+                self.history = HistoryStore(history_path)
+                self.add_sheet_listener(self._record_history)
+            except Exception as e:
+                logger.warning("⚠️  Sheet history disabled (%s): %s", history_path, e)
+        logger.info("✅ Google Sheets connector initialized - ready for multiple class URLs!")
+    
+    def _source_from_env(self, local_dir=None):
+        """The sheet source selected by SHEET_SOURCE (csv, gspread or local)"""
+        local_dir = local_dir if local_dir is not None else os.environ.get('SHEETS_LOCAL_DIR')
+        kind = (os.environ.get('SHEET_SOURCE') or ('local' if local_dir else 'csv')).strip().lower()
+        if kind == 'local':
+            if local_dir:
+                return LocalDirectorySource(local_dir)
+            logger.warning("⚠️  SHEET_SOURCE=local needs SHEETS_LOCAL_DIR, using published CSV URLs")
+        elif kind == 'gspread':
+            try:
+                source = GspreadSource.from_config(os.environ.get('SHEETS_GSPREAD_CONFIG', 'gspread_sources.json'))
+                logger.info("📗 Reading %d class sheets through the Sheets API", len(source.ranges))
+                return source
+            except Exception as e:
+                logger.error("❌ gspread source unavailable, using published CSV URLs: %s", e)
+        elif kind != 'csv':
+            logger.warning("⚠️  Unknown SHEET_SOURCE %r, using published CSV URLs", kind)
+        return PublishedCsvSource(self.class_sheet_urls, lambda: self.session, self.fetch_timeout)
+    
+    @property
+    def session(self):
+        """The keep-alive HTTP session, created (and requests imported) on the first download"""
+        if self._session is None:
+            with self._inflight_lock:
+                if self._session is None:
+                    from requests.adapters import HTTPAdapter
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=True)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
     
     def add_class_sheet_url(self, class_name, sheet_url):
         """Add a published sheet URL for a specific class"""
         self.class_sheet_urls[class_name] = sheet_url
-        print(f"📋 Added sheet URL for class {class_name}")
+        self.sheet_cache.invalidate(class_name)
+        logger.debug("📋 Added sheet URL for class %s", class_name)
+    
+    def load_class_sheet(self, class_name, data, version=None):
+        """Seed the cache with sheet rows obtained elsewhere (e.g. by a parent process or a test)
+
+        Classes without a registered URL are added with no URL, so they are
+        served from what was loaded instead of being downloaded.
+        """
+        self.class_sheet_urls.setdefault(class_name, None)
+        previous = self.sheet_cache.get(class_name)
+        entry = CachedSheet(data, version=version, previous=previous)
+        self.sheet_cache.put(class_name, entry)
+        if previous is None or previous.version != entry.version:
+            self._notify_sheet_listeners(class_name, entry, previous)
+        return entry
+    
+    def _index_students(self, class_name, entry, previous):
+        if self.search_index.update_class(class_name, entry.model.students):
+            logger.debug("🔎 Re-indexed %d students of class %s", len(entry.model.students), class_name)
+    
+    def search_students(self, query, limit=10):
+        """Search every class for a student by name or class and roll number
+
+        Searches only read the in-memory index. Classes missing from it are
+        indexed from their on-disk snapshot right away and from their student
+        lists in the background, so a cold worker answers with what it has
+        instead of waiting on every sheet.
+        """
+        self._index_missing_classes()
+        return self.search_index.search(query, limit)
+    
+    def _index_missing_classes(self):
+        """Queue classes that are not in the search index yet (each at most once a minute)"""
+        class_names = self.get_classes()
+        now = time.time()
+        with self._refresh_lock:
+            missing = [
+                class_name for class_name in class_names
+                if not self.search_index.has_class(class_name) and now - self._search_attempts.get(class_name, 0) > 60
+            ]
+            for class_name in missing:
+                self._search_attempts[class_name] = now
+        
+        executor = self._get_fetch_executor() if missing else None
+        for class_name in missing:
+            self._index_from_snapshot(class_name)
+            executor.submit(self._index_class, class_name)
+    
+    def _index_from_snapshot(self, class_name):
+        if self.snapshots is None:
+            return
+        try:
+            entry = self.snapshots.load(class_name)
+        except Exception as e:
+            logger.error("Error loading snapshot for class %s: %s", class_name, e)
+            return
+        if entry is not None and not self.search_index.has_class(class_name):
+            self.search_index.update_class(class_name, entry.model.students)
+    
+    def _index_class(self, class_name):
+        try:
+            students = self.get_students_by_class(class_name)
+            if students:
+                self.search_index.update_class(class_name, students)
+        except Exception as e:
+            logger.error("Error indexing students of class %s: %s", class_name, e)
+    
+    def _save_snapshot(self, class_name, entry, previous):
+        self.snapshots.save(class_name, entry)
+    
+    def _record_history(self, class_name, entry, previous):
+        cells = self.history.append(class_name, entry.model, entry.version, entry.downloaded_at)
+        if cells:
+            logger.debug("🕰️  Recorded %d changed cells of class %s in the history", cells, class_name)
+    
+    def get_student_history(self, class_name, roll_number, since=None):
+        """Marks of one student across every recorded sheet version, or None without history"""
+        if self.history is None:
+            return None
+        try:
+            return self.history.student_history(class_name, roll_number, since)
+        except Exception as e:
+            logger.error("Error reading history for %s/%s: %s", class_name, roll_number, e)
+            return None
+    
+    def _load_snapshot(self, class_name):
+        """Put the newest on-disk snapshot of a class in the cache, or return None"""
+        if self.snapshots is None:
+            return None
+        try:
+            entry = self.snapshots.load(class_name)
+        except Exception as e:
+            logger.error("Error loading snapshot for class %s: %s", class_name, e)
+            return None
+        if entry is not None:
+            self.sheet_cache.put(class_name, entry)
+            self.sheet_cache.record('snapshot_loads')
+            logger.info("💾 Loaded snapshot %s for class %s", entry.version, class_name)
+        return entry
+    
+    def add_sheet_listener(self, listener):
+        """Register fn(class_name, new_entry, previous_entry), called when a class sheet changes"""
+        self._sheet_listeners.append(listener)
+    
+    def _notify_sheet_listeners(self, class_name, entry, previous):
+        changes = getattr(entry.model, 'changes', None)
+        if changes is not None and not changes.is_empty():
+            self.change_feed.record(class_name, changes, entry.downloaded_at)
+            logger.info("🔀 Class %s changed: %s", class_name,
+                        'layout changed, recomputed everything' if changes.structural else
+                        f"{sum(len(t) for t in changes.topics.values())} topics re-ranked, {len(changes.rolls)} reports affected")
+        for listener in self._sheet_listeners:
+            try:
+                listener(class_name, entry, previous)
+            except Exception as e:
+                logger.error("Error in sheet listener for class %s: %s", class_name, e)
     
     def get_sheet_data_for_class(self, class_name):
-        """Get data from the published sheet for a specific class"""
+        """Get data from the published sheet for a specific class (served from cache when fresh)"""
+        entry = self._get_sheet_entry(class_name)
+        return entry.data if entry is not None else []
+    
+    def get_class_model(self, class_name):
+        """Get the parsed ClassSheetModel for a class, or None if the sheet is unavailable"""
+        entry = self._get_sheet_entry(class_name)
+        return entry.model if entry is not None else None
+    
+    def _get_sheet_entry(self, class_name):
+        """Look up a class sheet in the cache, downloading or revalidating it as needed"""
         try:
-            if class_name not in self.class_sheet_urls:
-                print(f"❌ No sheet URL configured for class {class_name}")
-                return []
-                
-            sheet_url = self.class_sheet_urls[class_name]
-            response = requests.get(sheet_url, timeout=10)
-            
-            if response.status_code == 200:
-                csv_data = csv.reader(StringIO(response.text))
-                data = list(csv_data)
-                print(f"✅ Retrieved {len(data)} rows for class {class_name}")
-                return data
-            else:
-                print(f"❌ Failed to get data for class {class_name}: HTTP {response.status_code}")
-                return []
+            entry, cached = self._lookup_cached(class_name)
+            if entry is not None or class_name not in self.class_sheet_urls:
+                return entry
+            return self._fetch_sheet(class_name, cached, current_deadline())
                 
         except Exception as e:
-            print(f"Error getting data for class {class_name}: {e}")
-            return []
+            logger.error("Error getting data for class %s: %s", class_name, e)
+            return None
+    
+    def _lookup_cached(self, class_name):
+        """Serve a class from the cache if possible
+
+        Returns (entry, cached): ``entry`` is what to serve, or None when the
+        caller has to fetch; ``cached`` is any expired copy to revalidate against.
+        """
+        if class_name not in self.class_sheet_urls:
+            logger.warning("❌ No sheet URL configured for class %s", class_name)
+            return None, None
+        
+        cached = self.sheet_cache.get(class_name)
+        if cached is not None:
+            if self.sheet_cache.is_fresh(cached):
+                self.sheet_cache.record('hits')
+                return cached, cached
+            if self.sheet_cache.is_servable_stale(cached):
+                # Serve what we have and revalidate without blocking the request
+                self.sheet_cache.record('stale_hits')
+                self._refresh_in_background(class_name)
+                return cached, cached
+        
+        self.sheet_cache.record('misses')
+        
+        if cached is None:
+            # Cold start: serve the last snapshot right away and refresh it in the background
+            snapshot = self._load_snapshot(class_name)
+            if snapshot is not None:
+                self._refresh_in_background(class_name)
+                return snapshot, snapshot
+        return None, cached
+    
+    async def get_sheet_data_for_class_async(self, class_name):
+        """Coroutine version of get_sheet_data_for_class that never blocks the event loop"""
+        entry = await self._get_sheet_entry_async(class_name)
+        return entry.data if entry is not None else []
+    
+    async def get_class_model_async(self, class_name):
+        """Coroutine version of get_class_model that never blocks the event loop"""
+        entry = await self._get_sheet_entry_async(class_name)
+        return entry.model if entry is not None else None
+    
+    async def _get_sheet_entry_async(self, class_name):
+        try:
+            entry, cached = self._lookup_cached(class_name)
+            if entry is not None or class_name not in self.class_sheet_urls:
+                return entry
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_fetch_executor(), self._fetch_sheet, class_name, cached,
+                                              current_deadline())
+        
+        except Exception as e:
+            logger.error("Error getting data for class %s: %s", class_name, e)
+            return None
+    
+    async def prefetch_all_classes_async(self):
+        """Fetch (or revalidate) every registered class sheet concurrently from a coroutine"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_fetch_executor()
+        if self.source.batched:
+            return await loop.run_in_executor(executor, self.prefetch_all_classes)
+        class_names = list(self.class_sheet_urls.keys())
+        entries = await asyncio.gather(
+            *[loop.run_in_executor(executor, self._fetch_sheet, class_name, self.sheet_cache.get(class_name))
+              for class_name in class_names],
+            return_exceptions=True
+        )
+        return {class_name: isinstance(entry, CachedSheet) for class_name, entry in zip(class_names, entries)}
+    
+    def _get_fetch_executor(self):
+        """Thread pool the async fetch path runs blocking downloads on (sized to the HTTP pool)"""
+        if self._fetch_executor is None:
+            with self._inflight_lock:
+                if self._fetch_executor is None:
+                    self._fetch_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize, thread_name_prefix='sheet-fetch')
+        return self._fetch_executor
+    
+    def _get_hedge_executor(self):
+        """Threads that race a slow download against a hedged copy of it"""
+        if self._hedge_executor is None:
+            with self._inflight_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize, thread_name_prefix='sheet-hedge')
+        return self._hedge_executor
+    
+    def _model_for_data(self, data):
+        """Reuse the compiled model of a cached sheet, or compile rows handed in by a caller"""
+        if isinstance(data, ClassSheetModel):
+            return data
+        for entry in self.sheet_cache.entries():
+            if entry.data is data:
+                return entry.model
+        return ClassSheetModel.from_rows(data)
+    
+    def _fetch_sheet(self, class_name, cached=None, deadline=None):
+        """Download a class sheet, coalescing concurrent requests for the same class into one download
+
+        Callers waiting on another request's download give up at their own deadline.
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(class_name)
+            leader = inflight is None
+            if leader:
+                inflight = _InflightFetch()
+                self._inflight[class_name] = inflight
+        
+        if not leader:
+            self.sheet_cache.record('coalesced')
+            wait_for = self.fetch_policy.budget(self.fetch_timeout)
+            inflight.done.wait(min(wait_for, deadline.remaining()) if deadline is not None else wait_for)
+            return inflight.result if inflight.result is not None else cached
+        
+        try:
+            inflight.result = self._download_sheet(class_name, cached, deadline)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(class_name, None)
+            inflight.done.set()
+        
+        if inflight.result is None and deadline is not None and self.breaker.state(class_name) != CircuitBreaker.OPEN:
+            # The request gave up (or left the circuit trial to others); finish the download
+            # with the full timeout in the background so the next request has data
+            self._refresh_in_background(class_name)
+        return inflight.result
+    
+    def _download_sheet(self, class_name, cached=None, deadline=None):
+        """Read a class sheet from the source, revalidating against the cached copy when there is one"""
+        if not self.source.has_sheet(class_name):
+            # Loaded through load_class_sheet - there is nothing to download
+            if cached is not None:
+                cached.touch()
+            return cached
+        return self._apply_fetch(class_name, self._fetch_from_source(class_name, cached, deadline), cached)
+    
+    def _fetch_from_source(self, class_name, cached=None, deadline=None):
+        """One source fetch with retries and hedging inside the deadline, guarded by the class's circuit"""
+        state = self.breaker.acquire(class_name)
+        if state == CircuitBreaker.OPEN:
+            logger.debug("⚡ Circuit for class %s is open, not waiting on the source", class_name)
+            return None
+        if state == CircuitBreaker.HALF_OPEN and deadline is not None:
+            # Trial downloads get the full timeout in the background (see _fetch_sheet), not a
+            # user's remaining time
+            self.breaker.release(class_name)
+            return None
+        
+        executor = self._get_hedge_executor() if self.fetch_policy.hedge_percentile else None
+        fetched, attempts = self.fetch_policy.run(
+            lambda timeout: self.source.fetch(class_name, cached, timeout=timeout),
+            deadline, self.fetch_timeout, executor
+        )
+        if fetched is PERMANENT_FAILURE:
+            # The source answered; the sheet is just not readable, which says nothing about its health
+            self.breaker.release(class_name)
+        elif fetched is not None:
+            self.breaker.record_success(class_name)
+        elif attempts:
+            self.breaker.record_failure(class_name)
+        else:
+            self.breaker.release(class_name)
+        return fetched
+    
+    def _apply_fetch(self, class_name, fetched, cached=None):
+        """Cache what a source returned for a class and return the entry to serve"""
+        if fetched is NOT_MODIFIED and cached is not None:
+            # Unchanged upstream - keep the parsed copy and restart its TTL
+            cached.touch()
+            self.sheet_cache.put(class_name, cached)
+            self.sheet_cache.record('revalidated')
+            logger.debug("♻️  Sheet for class %s not modified, reusing cached copy", class_name)
+            return cached
+        if isinstance(fetched, FetchedSheet):
+            return self._store_sheet(class_name, fetched.rows, fetched.version, cached,
+                                     etag=fetched.etag, last_modified=fetched.last_modified)
+        # Fall back to the last good copy rather than an empty report
+        return cached if cached is not None else self._load_snapshot(class_name)
+    
+    def _open_sheet_stream(self, class_name):
+        """Byte chunks of a class sheet straight from its source, or None if it cannot be streamed"""
+        deadline = current_deadline()
+        if deadline is None:
+            return self.source.open_stream(class_name)
+        if deadline.expired():
+            return None
+        return self.source.open_stream(class_name, timeout=min(self.fetch_timeout, deadline.remaining()))
+    
+    def _stream_student_list(self, class_name):
+        """Student list of a class that is not cached, read from the top of the sheet only
+
+        Returns None if the sheet could not be streamed, so the caller falls
+        back to a full download.
+        """
+        try:
+            if self.breaker.state(class_name) != CircuitBreaker.CLOSED:
+                return None
+            chunks = self._open_sheet_stream(class_name)
+            if chunks is None:
+                return None
+            try:
+                with metrics.span('student_scan'):
+                    students = scan_student_list(csv.reader(iter_csv_lines(chunks)))
+            finally:
+                chunks.close()
+            logger.debug("📋 Streamed %d students for class %s", len(students), class_name)
+            return students
+        except Exception as e:
+            metrics.inc('sheet_fetch_failures_total', reason=type(e).__name__)
+            logger.error("Error streaming students for class %s: %s", class_name, e)
+            return None
+    
+    def _store_sheet(self, class_name, data, version, cached=None, etag=None, last_modified=None):
+        """Put freshly parsed sheet rows in the cache, reusing the cached copy if nothing changed"""
+        if cached is not None and cached.version == version:
+            # Server ignored our validators but the content is identical - skip the re-parse
+            cached.etag = etag
+            cached.last_modified = last_modified
+            cached.touch()
+            self.sheet_cache.put(class_name, cached)
+            self.sheet_cache.record('revalidated')
+            return cached
+        
+        entry = CachedSheet(data, etag=etag, last_modified=last_modified, version=version, previous=cached)
+        self.sheet_cache.put(class_name, entry)
+        logger.info("✅ Retrieved %d rows for class %s", len(data), class_name)
+        self._notify_sheet_listeners(class_name, entry, cached)
+        return entry
+    
+    def _refresh_in_background(self, class_name):
+        """Revalidate a stale class sheet on a daemon thread (at most one per class)"""
+        with self._refresh_lock:
+            if class_name in self._refreshing:
+                return
+            self._refreshing.add(class_name)
+        
+        def refresh():
+            try:
+                self._fetch_sheet(class_name, self.sheet_cache.get(class_name))
+            except Exception as e:
+                logger.error("Error refreshing data for class %s: %s", class_name, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(class_name)
+        
+        threading.Thread(target=refresh, name=f"sheet-refresh-{class_name}", daemon=True).start()
+    
+    def prefetch_all_classes(self, max_workers=8):
+        """Fetch (or revalidate) every registered class sheet in parallel
+
+        Returns {class_name: True/False} depending on whether data is now cached.
+        """
+        class_names = list(self.class_sheet_urls.keys())
+        if not class_names:
+            return {}
+        if self.source.batched:
+            return self._prefetch_batched(class_names)
+        
+        def fetch(class_name):
+            try:
+                return self._fetch_sheet(class_name, self.sheet_cache.get(class_name)) is not None
+            except Exception as e:
+                logger.error("Error prefetching data for class %s: %s", class_name, e)
+                return False
+        
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(class_names)), thread_name_prefix='sheet-prefetch') as pool:
+            results = dict(zip(class_names, pool.map(fetch, class_names)))
+        
+        loaded = sum(1 for ok in results.values() if ok)
+        logger.info("🔥 Prefetched %d/%d class sheets in %.2fs", loaded, len(class_names), time.time() - started)
+        return results
+    
+    def _prefetch_batched(self, class_names):
+        """Refresh many classes with one source call (one request per spreadsheet)"""
+        started = time.time()
+        cached = {class_name: self.sheet_cache.get(class_name) for class_name in class_names}
+        wanted = [class_name for class_name in class_names if self.source.has_sheet(class_name)]
+        try:
+            fetched = self.source.fetch_many(wanted, cached)
+        except Exception as e:
+            logger.error("Error prefetching class sheets: %s", e)
+            fetched = {}
+        
+        results = {}
+        for class_name in class_names:
+            try:
+                if class_name in fetched:
+                    entry = self._apply_fetch(class_name, fetched[class_name], cached[class_name])
+                else:
+                    entry = self._download_sheet(class_name, cached[class_name])
+                results[class_name] = entry is not None
+            except Exception as e:
+                logger.error("Error prefetching data for class %s: %s", class_name, e)
+                results[class_name] = False
+        
+        loaded = sum(1 for ok in results.values() if ok)
+        logger.info("🔥 Prefetched %d/%d class sheets in %.2fs (%s batch)", loaded, len(class_names),
+                    time.time() - started, self.source.name)
+        return results
+    
+    def start_background_refresher(self, interval, max_workers=8):
+        """Re-pull every class sheet on a daemon thread every ``interval`` seconds"""
+        if self._refresher_thread is not None and self._refresher_thread.is_alive():
+            return self._refresher_thread
+        
+        self._refresher_stop.clear()
+        
+        def run():
+            while not self._refresher_stop.wait(interval):
+                try:
+                    self.prefetch_all_classes(max_workers=max_workers)
+                except Exception as e:
+                    logger.error("Error in background sheet refresh: %s", e)
+        
+        self._refresher_thread = threading.Thread(target=run, name='sheet-refresher', daemon=True)
+        self._refresher_thread.start()
+        logger.info("⏱️  Background sheet refresh every %ss", interval)
+        return self._refresher_thread
+    
+    def stop_background_refresher(self):
+        """Stop the background refresher started by start_background_refresher"""
+        self._refresher_stop.set()
+        if self._refresher_thread is not None:
+            self._refresher_thread.join(timeout=5)
+            self._refresher_thread = None
+    
+    def get_cache_stats(self):
+        """Hit/miss counters and size of the sheet cache"""
+        return self.sheet_cache.get_stats()
+    
+    def get_upstream_stats(self):
+        """Retry, hedging and latency counters of sheet downloads plus every class's circuit state"""
+        return {
+            'fetch': self.fetch_policy.get_stats(),
+            'breaker': self.breaker.get_stats(),
+            'fetch_timeout': self.fetch_timeout
+        }
+    
+    def unavailable_retry_after(self, class_name):
+        """Seconds to suggest retrying after when a configured class has no data to serve, else None"""
+        if class_name not in self.class_sheet_urls or self.sheet_cache.get(class_name) is not None:
+            return None
+        return self.breaker.retry_in(class_name) or int(self.fetch_timeout)
     
     def get_classes(self):
         """Get list of available classes"""
         classes = list(self.class_sheet_urls.keys())
-        print(f"📚 Available classes: {classes}")
-        return sorted(classes, key=lambda x: (int(x[:-1]), x[-1]) if len(x) > 1 else (0, x))
+        logger.debug("📚 Available classes: %s", classes)
+        return sorted(classes, key=class_sort_key)
     
     def get_students_by_class(self, class_name):
-        """Get students from a specific class sheet"""
+        """Get students from a specific class sheet
+
+        A class that is not cached yet is not downloaded in full for this: only
+        the roll number and name columns of its first section are read.
+        """
         try:
-            data = self.get_sheet_data_for_class(class_name)
+            entry, cached = self._lookup_cached(class_name)
+            if entry is None and class_name in self.class_sheet_urls:
+                if cached is None and self.stream_student_list:
+                    students = self._stream_student_list(class_name)
+                    if students is not None:
+                        return students
+                entry = self._fetch_sheet(class_name, cached, current_deadline())
+            model = entry.model if entry is not None else None
             
-            if len(data) < 4:  # Need at least: class row, header row, sub-header row, and data
-                print(f"⚠️  Insufficient data rows for class {class_name}")
+            if model is None or model.row_count < 4:  # Need at least: class row, header row, sub-header row, and data
+                logger.warning("⚠️  Insufficient data rows for class %s", class_name)
                 return []
             
-            students = []
+            # The student list always comes from the first subject section
+            students = [dict(student) for student in model.students]
             
-            # All classes now use multi-subject detection for consistency
-            # For single-subject sheets, we'll create a single "Subject" tab
-            subject_sections = []
-            for i, row in enumerate(data):
-                if len(row) > 0 and str(row[0]).strip() == 'Class':
-                    subject_sections.append(i)
-            
-            if len(subject_sections) >= 1:
-                # Use the first section (Maths) to get the student list
-                first_section_start = subject_sections[0]
-                
-                # Find header row for this section
-                header_row_idx = None
-                for i in range(first_section_start, min(first_section_start + 5, len(data))):
-                    if i < len(data) and len(data[i]) > 0 and 'Roll No.' in str(data[i][0]):
-                        header_row_idx = i
-                        break
-                
-                if header_row_idx is not None:
-                    data_start_row = header_row_idx + 2
-                    # Extract students only from first section
-                    for row_idx in range(data_start_row, len(data)):
-                        if row_idx < len(data) and len(data[row_idx]) >= 2:
-                            # Stop if we hit another subject section
-                            if str(data[row_idx][0]).strip() == 'Class':
-                                break
-                            
-                            roll_no = str(data[row_idx][0]).strip()
-                            if roll_no and roll_no.isdigit():
-                                students.append({
-                                    'Roll Number': roll_no,
-                                    'Name': str(data[row_idx][1]).strip() if len(data[row_idx]) > 1 else ''
-                                })
-            else:
-                # Single subject data - treat as one subject for consistency
-                # Find the row that contains "Roll No." - should be row 2 (index 1)
-                header_row_idx = 1
-                for i, row in enumerate(data[:4]):
-                    if len(row) > 0 and 'Roll No.' in str(row[0]):
-                        header_row_idx = i
-                        break
-                
-                # Data starts after the sub-header row
-                data_start_row = header_row_idx + 2
-                
-                # Extract student data
-                for row in data[data_start_row:]:
-                    if len(row) >= 2 and str(row[0]).strip():
-                        roll_no = str(row[0]).strip()
-                        if roll_no and roll_no.isdigit():
-                            students.append({
-                                'Roll Number': roll_no,
-                                'Name': str(row[1]).strip() if len(row) > 1 else ''
-                            })
-            
-            print(f"📋 Found {len(students)} students in class {class_name}")
-            return sorted(students, key=lambda x: int(x.get('Roll Number', 0)))
+            logger.debug("📋 Found %d students in class %s", len(students), class_name)
+            return students
             
         except Exception as e:
-            print(f"Error getting students for class {class_name}: {e}")
+            logger.error("Error getting students for class %s: %s", class_name, e)
             return []
     
     def calculate_topic_ranks(self, class_name):
-        """Calculate ranks for all topics in a class"""
+        """Calculate ranks for all topics in a class (first subject section)"""
         try:
-            data = self.get_sheet_data_for_class(class_name)
+            model = self.get_class_model(class_name)
             
-            if len(data) < 4:
+            if model is None or model.row_count < 4 or not model.sections:
                 return {}
             
-            # Find header and data rows
-            header_row_idx = 1
-            for i, row in enumerate(data[:4]):
-                if len(row) > 0 and 'Roll No.' in str(row[0]):
-                    header_row_idx = i
-                    break
-            
-            headers = data[header_row_idx]
-            data_start_row = header_row_idx + 2
-            
-            # Collect all student marks for each topic
-            topic_marks = {}  # {topic_name: [(roll_no, marks), ...]}
-            
-            # Process each topic from headers
-            i = 2
-            while i < len(headers):
-                topic_header = headers[i].strip() if i < len(headers) else ''
-                
-                if topic_header and topic_header.startswith('Topic'):
-                    topic_name = topic_header
-                    topic_marks[topic_name] = []
-                    
-                    # Collect marks for this topic from all students
-                    for row in data[data_start_row:]:
-                        if len(row) > 0 and str(row[0]).strip():
-                            roll_no = str(row[0]).strip()
-                            marks_val = str(row[i + 1]).strip() if i + 1 < len(row) and row[i + 1] else '0'
-                            
-                            # Only include if marks is numeric
-                            if marks_val and marks_val.replace('.','').isdigit():
-                                topic_marks[topic_name].append((roll_no, float(marks_val)))
-                    
-                    i += 2
-                else:
-                    i += 1
-            
-            # Calculate ranks for each topic
-            topic_ranks = {}  # {topic_name: {roll_no: rank}}
-            
-            for topic_name, marks_list in topic_marks.items():
-                if not marks_list:
-                    continue
-                
-                # Sort by marks in descending order (highest first)
-                sorted_marks = sorted(marks_list, key=lambda x: x[1], reverse=True)
-                
-                # Calculate ranks with ties
-                ranks = {}
-                current_rank = 1
-                
-                for i, (roll_no, marks) in enumerate(sorted_marks):
-                    if i > 0 and marks < sorted_marks[i-1][1]:
-                        # Different marks, update rank
-                        current_rank = i + 1
-                    ranks[roll_no] = current_rank
-                
-                topic_ranks[topic_name] = ranks
-            
-            return topic_ranks
+            return model.sections[0].ranks
             
         except Exception as e:
-            print(f"Error calculating topic ranks: {e}")
+            logger.error("Error calculating topic ranks: %s", e)
             return {}
     
     def calculate_subject_topic_ranks(self, data, subject_name, subject_start_row):
         """Calculate ranks for topics within a specific subject"""
         try:
-            # Find header row for this subject
-            header_row_idx = None
-            for i in range(subject_start_row, min(subject_start_row + 5, len(data))):
-                if i < len(data) and len(data[i]) > 0 and 'Roll No.' in str(data[i][0]):
-                    header_row_idx = i
-                    break
+            section = self._model_for_data(data).section_at(subject_start_row)
             
-            if header_row_idx is None:
+            if section is None:
                 return {}
             
-            headers = data[header_row_idx]
-            data_start_row = header_row_idx + 2
-            
-            # Collect all student marks for each topic in this subject
-            topic_marks = {}  # {topic_name: [(roll_no, marks), ...]}
-            
-            # Process each topic from headers
-            i = 2
-            while i < len(headers):
-                topic_header = headers[i].strip() if i < len(headers) else ''
-                
-                if topic_header and topic_header.startswith('Topic'):
-                    topic_name = topic_header
-                    topic_marks[topic_name] = []
-                    
-                    # Collect marks for this topic from all students
-                    for row_idx in range(data_start_row, len(data)):
-                        if row_idx < len(data) and len(data[row_idx]) > 0:
-                            # Stop if we hit another subject
-                            if str(data[row_idx][0]).strip() and 'Class' in str(data[row_idx][0]):
-                                break
-                            
-                            roll_no = str(data[row_idx][0]).strip()
-                            if roll_no and roll_no.isdigit():
-                                marks_val = str(data[row_idx][i + 1]).strip() if i + 1 < len(data[row_idx]) and data[row_idx][i + 1] else '0'
-                                
-                                # Only include if marks is numeric
-                                if marks_val and marks_val.replace('.','').isdigit():
-                                    topic_marks[topic_name].append((roll_no, float(marks_val)))
-                    
-                    i += 2
-                else:
-                    i += 1
-            
-            # Calculate ranks for each topic
-            topic_ranks = {}  # {topic_name: {roll_no: rank}}
-            
-            for topic_name, marks_list in topic_marks.items():
-                if not marks_list:
-                    continue
-                
-                # Sort by marks in descending order (highest first)
-                sorted_marks = sorted(marks_list, key=lambda x: x[1], reverse=True)
-                
-                # Calculate ranks with ties
-                ranks = {}
-                current_rank = 1
-                
-                for i, (roll_no, marks) in enumerate(sorted_marks):
-                    if i > 0 and marks < sorted_marks[i-1][1]:
-                        # Different marks, update rank
-                        current_rank = i + 1
-                    ranks[roll_no] = current_rank
-                
-                topic_ranks[topic_name] = ranks
-            
-            return topic_ranks
+            return section.ranks
             
         except Exception as e:
-            print(f"Error calculating subject topic ranks for {subject_name}: {e}")
+            logger.error("Error calculating subject topic ranks for %s: %s", subject_name, e)
             return {}
     
+    def get_rank_tables(self, class_name):
+        """Precomputed rank tables for every subject and topic in a class"""
+        entry = self._get_sheet_entry(class_name)
+        if entry is None:
+            return None
+        return {
+            'version': entry.version,
+            'ranks': entry.model.rank_tables()
+        }
+    
     def get_student_report(self, class_name, roll_number):
         """Get detailed report for a specific student in a class"""
         try:
-            data = self.get_sheet_data_for_class(class_name)
+            model = self.get_class_model(class_name)
             
-            if len(data) < 4:
-                print(f"⚠️  Insufficient data for generating report")
+            if model is None or model.row_count < 4:
+                logger.warning("⚠️  Insufficient data for generating report")
                 return None
             
             # All classes now use multi-subject layout for consistency
-            return self.get_multi_subject_report(data, class_name, roll_number)
+            return self.get_multi_subject_report(model, class_name, roll_number)
                 
         except Exception as e:
-            print(f"Error generating student report: {e}")
+            logger.error("Error generating student report: %s", e)
             return None
     
+    def iter_class_reports(self, class_name):
+        """Yield the report of every student in a class from a single fetch and parse"""
+        model = self.get_class_model(class_name)
+        
+        if model is None or model.row_count < 4:
+            logger.warning("⚠️  Insufficient data for generating class reports for %s", class_name)
+            return
+        
+        for student in model.students:
+            report = self.get_multi_subject_report(model, class_name, student['Roll Number'])
+            if report is not None:
+                yield report
+    
+    def get_sheet_version(self, class_name):
+        """Content hash of the sheet version currently served for a class, or None"""
+        entry = self._get_sheet_entry(class_name)
+        return entry.version if entry is not None else None
+    
+    def get_chart_data(self, class_name, roll_number):
+        """Chart series for a student and the revision they belong to, or None if unavailable"""
+        entry = self._get_sheet_entry(class_name)
+        if entry is None:
+            return None
+        series = entry.model.chart_series(roll_number)
+        if series is None:
+            return None
+        revision = entry.model.revision(roll_number) or (entry.version, entry.downloaded_at)
+        return {'version': revision[0], 'updated_at': revision[1], 'subjects': series}
+    
+    def get_class_analytics(self, class_name):
+        """Topic averages, quartiles, histograms and performance shares for a class, or None"""
+        entry = self._get_sheet_entry(class_name)
+        if entry is None:
+            return None
+        return {'version': entry.version, 'analytics': entry.model.analytics()}
+    
+    def get_school_analytics(self):
+        """Per-class and per-subject summaries across every class, reusing each class's cached analytics"""
+        classes = {}
+        subjects = {}
+        class_names = self.get_classes()
+        # Classes that are not cached yet are fetched in parallel
+        results = self._get_fetch_executor().map(self.get_class_analytics, class_names)
+        for class_name, class_analytics in zip(class_names, results):
+            if class_analytics is None:
+                continue
+            analytics = class_analytics['analytics']
+            classes[class_name] = {
+                'version': class_analytics['version'],
+                'students': analytics['students'],
+                'subjects': {name: subject['summary'] for name, subject in analytics['subjects'].items()}
+            }
+            for name, subject in analytics['subjects'].items():
+                totals = subjects.setdefault(name, {'classes': 0, 'students': 0, 'marks_reported': 0, 'percentage_sum': 0.0,
+                                                    'performance': {text: 0 for _, text, _ in PERFORMANCE_BUCKETS}})
+                summary = subject['summary']
+                totals['classes'] += 1
+                totals['students'] += subject['students']
+                totals['marks_reported'] += summary['marks_reported']
+                totals['percentage_sum'] += (summary['average_percentage'] or 0) * summary['marks_reported']
+                for text, bucket in summary['performance'].items():
+                    totals['performance'][text] += bucket['count']
+        
+        for totals in subjects.values():
+            reported = totals['marks_reported']
+            totals['average_percentage'] = _round(totals.pop('percentage_sum') / reported if reported else np.nan)
+            totals['performance'] = {
+                text: {'count': count, 'share': _round(count / reported if reported else np.nan, 4)}
+                for text, count in totals['performance'].items()
+            }
+        return {
+            'students': sum(c['students'] for c in classes.values()),
+            'classes': classes,
+            'subjects': subjects
+        }
+    
+    def get_report_revision(self, class_name, roll_number):
+        """(version, timestamp) a student's report last changed in, or None if the sheet is unavailable
+
+        Students outside the sheet (or models without revisions) fall back to
+        the whole sheet's version and download time.
+        """
+        entry = self._get_sheet_entry(class_name)
+        if entry is None:
+            return None
+        revision = entry.model.revision(roll_number) if hasattr(entry.model, 'revision') else None
+        return revision or (entry.version, entry.downloaded_at)
+    
+    def get_changes(self, since=0, class_name=None, limit=100):
+        """Change feed records newer than ``since`` and the latest sequence number"""
+        return self.change_feed.since(since, class_name, limit)
+    
+    def describe_sheet(self, class_name):
+        """Version metadata of the sheet currently served for a class, or None"""
+        entry = self._get_sheet_entry(class_name)
+        if entry is None:
+            return None
+        return {
+            'version': entry.version,
+            'downloaded_at': entry.downloaded_at,
+            'fetched_at': entry.fetched_at,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified
+        }
+    
     def get_multi_subject_report(self, data, class_name, roll_number):
-        """Handle multi-subject report for all classes - creates tabs for better organization"""
+        """Handle multi-subject report for all classes - creates tabs for better organization
+
+        ``data`` may be the raw sheet rows or an already compiled ClassSheetModel.
+        Returns a StudentReport (``to_dict()`` gives the JSON shape) or None.
+        """
+        with metrics.span('report_build'):
+            return self._build_multi_subject_report(data, class_name, roll_number)
+    
+    def _build_multi_subject_report(self, data, class_name, roll_number):
         try:
-            subjects = {}
-            
-            print(f"🔍 Parsing multi-subject data for student {roll_number} in class {class_name}")
-            
-            # Parse subjects from the data by detecting the pattern
-            # Find subject sections by detecting "Class" headers
-            subject_sections = []
-            for i, row in enumerate(data):
-                if len(row) > 0 and str(row[0]).strip() == 'Class':
-                    subject_sections.append(i)
-            
-            print(f"📊 Found {len(subject_sections)} subject sections: {subject_sections}")
-            
-            # Assign subjects based on position
-            if len(subject_sections) >= 2:
-                subjects['Maths'] = {'start_row': subject_sections[0]}
-                subjects['Science'] = {'start_row': subject_sections[1]}
-                print(f"✅ Assigned Maths to row {subject_sections[0]}, Science to row {subject_sections[1]}")
-            elif len(subject_sections) == 1:
-                # Single subject sheet with Class header
-                subjects['Subject'] = {'start_row': subject_sections[0]}
-                print(f"✅ Assigned Subject to row {subject_sections[0]}")
-            else:
-                # No Class headers found - treat entire sheet as one subject
-                subjects['Subject'] = {'start_row': 0}
-                print(f"✅ No Class headers found - treating as single subject starting at row 0")
+            model = self._model_for_data(data)
             
-            print(f"📊 Found subjects: {list(subjects.keys())}")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("🔍 Building multi-subject report for student %s in class %s", roll_number, class_name)
+                logger.debug("📊 Found subjects: %s", [section.name for section in model.sections])
             
             # Process each subject
-            report = {
-                'Class': class_name,
-                'Roll Number': roll_number,
-                'Name': '',
-                'subjects': {}
-            }
+            report = StudentReport(class_name, roll_number)
             
-            for subject_name, subject_info in subjects.items():
-                print(f"🔄 Processing {subject_name} section...")
-                start_row = subject_info['start_row']
-                
-                # Find header row for this subject
-                header_row_idx = None
-                for i in range(start_row, min(start_row + 5, len(data))):
-                    if i < len(data) and len(data[i]) > 0 and 'Roll No.' in str(data[i][0]):
-                        header_row_idx = i
-                        break
-                
-                if header_row_idx is None:
-                    print(f"⚠️  No header row found for {subject_name}")
-                    continue
-                
-                headers = data[header_row_idx]
-                data_start_row = header_row_idx + 2
+            for section in model.sections:
+                subject_name = section.name
                 
                 # Find the student row for this subject
-                student_row = None
-                for row_idx in range(data_start_row, len(data)):
-                    if row_idx < len(data) and len(data[row_idx]) > 0:
-                        # Stop if we hit another subject
-                        if str(data[row_idx][0]).strip() and str(data[row_idx][0]).strip() == 'Class':
-                            break
-                        if str(data[row_idx][0]).strip() == str(roll_number):
-                            student_row = data[row_idx]
-                            if not report['Name'] and len(student_row) > 1:
-                                report['Name'] = student_row[1]
-                            break
-                
-                if student_row is None:
-                    print(f"⚠️  Student {roll_number} not found in {subject_name} section")
+                pos = section.find_student(roll_number)
+                if pos is None:
+                    if debug:
+                        logger.debug("⚠️  Student %s not found in %s section", roll_number, subject_name)
                     continue
                 
-                # Get topic ranks for this subject
-                subject_topic_ranks = self.calculate_subject_topic_ranks(data, subject_name, start_row)
+                if not report.name:
+                    report.name = section.names[pos]
+                
+                # Ranks were precomputed for the whole class when the sheet was parsed
+                subject_topic_ranks = section.ranks
                 
-                # Process topics for this subject
+                # Slice this student's row out of the precomputed class-wide scores
                 subject_topics = []
-                i = 2
-                while i < len(headers):
-                    topic_header = headers[i].strip() if i < len(headers) else ''
+                times = section.times[pos]
+                marks_row = section.marks[pos]
+                reported = section.reported[pos]
+                percentages = section.scores.percentage[pos]
+                buckets = section.scores.buckets[pos]
+                for topic_idx, topic_header in enumerate(section.topics):
+                    # Only include topics that have actual marks data (not empty, not zero, and numeric)
+                    if not reported[topic_idx]:
+                        continue
                     
-                    if topic_header and topic_header.startswith('Topic'):
-                        time_val = str(student_row[i]).strip() if i < len(student_row) and student_row[i] else ''
-                        marks_val = str(student_row[i + 1]).strip() if i + 1 < len(student_row) and student_row[i + 1] else '0'
-                        
-                        # Only include topics that have actual marks data (not empty, not zero, and numeric)
-                        if (marks_val and marks_val != '0' and marks_val != '' and marks_val.replace('.','').isdigit()):
-                            marks = float(marks_val)
-                            
-                            # Get rank for this topic
-                            rank = subject_topic_ranks.get(topic_header, {}).get(str(roll_number), 'N/A')
-                            
-                            # Calculate score percentage (assuming marks out of 12)
-                            score_percentage = (marks / 12) * 100
-                            
-                            # Determine time category
-                            time_category = 'below_avg' if 'below' in time_val.lower() else 'above_avg' if 'above' in time_val.lower() else 'unknown'
-                            
-                            # New performance categorization logic:
-                            # Strong: below average time AND marks > 75% (9/12)
-                            # Need Attention: above average time AND marks > 75% 
-                            # Weak: marks <= 75% (regardless of time)
-                            if score_percentage > 75:  # marks > 9/12
-                                if time_category == 'below_avg':
-                                    color = 'green'  # Strong - efficient learner
-                                    performance_text = 'Strong'
-                                    performance_class = 'bg-success'
-                                else:
-                                    color = 'orange'  # Need attention - good score but slow
-                                    performance_text = 'Need Attention'
-                                    performance_class = 'bg-warning text-dark'
-                            else:
-                                color = 'red'  # Weak - low score
-                                performance_text = 'Weak'
-                                performance_class = 'bg-danger'
-                            
-                            subject_topics.append({
-                                'name': topic_header,
-                                'time_category': time_val if time_val else 'Not Available',
-                                'marks': marks,
-                                'score_percentage': score_percentage,
-                                'color': color,
-                                'performance_class': performance_class,
-                                'performance_text': performance_text,
-                                'rank': rank
-                            })
-                        
-                        i += 2
-                    else:
-                        i += 1
+                    time_val = times[topic_idx]
+                    subject_topics.append(Topic(
+                        topic_header,
+                        time_val if time_val else 'Not Available',
+                        marks_row[topic_idx],
+                        float(percentages[topic_idx]),
+                        int(buckets[topic_idx]),
+                        subject_topic_ranks.get(topic_header, {}).get(str(roll_number), 'N/A')
+                    ))
                 
-                print(f"✅ Found {len(subject_topics)} topics for {subject_name}")
+                if debug:
+                    logger.debug("✅ Found %d topics for %s", len(subject_topics), subject_name)
                 
-                report['subjects'][subject_name] = {
-                    'topics': subject_topics,
-                    'total_topics': len(subject_topics),
-                    'excellent_topics': len([t for t in subject_topics if t['marks'] >= 7.5]),
-                    'growth_topics': len([t for t in subject_topics if t['marks'] < 7.5])
-                }
-            
-            # Add overall performance analysis for multi-subject report
-            all_topics = []
-            for subject_data in report['subjects'].values():
-                all_topics.extend(subject_data['topics'])
-            
-            # Count performance categories
-            strong_count = len([t for t in all_topics if t['color'] == 'green'])
-            need_attention_count = len([t for t in all_topics if t['color'] == 'orange'])
-            weak_count = len([t for t in all_topics if t['color'] == 'red'])
-            
-            # Determine overall performance message and color
-            if strong_count > need_attention_count and strong_count > weak_count:
-                overall_performance = 'Good Going'
-                overall_color = 'green'
-            elif need_attention_count > strong_count and need_attention_count > weak_count:
-                overall_performance = 'Need Attention'
-                overall_color = 'yellow'
-            elif weak_count > 0:
-                overall_performance = 'Need Immediate Attention'
-                overall_color = 'red'
-            else:
-                overall_performance = 'Good Going'
-                overall_color = 'green'
-            
-            # Add analysis to report
-            report['performance_analysis'] = {
-                'strong_count': strong_count,
-                'need_attention_count': need_attention_count,
-                'weak_count': weak_count,
-                'overall_performance': overall_performance,
-                'overall_color': overall_color,
-                'strong_topics': [t for t in all_topics if t['color'] == 'green'],
-                'need_attention_topics': [t for t in all_topics if t['color'] == 'orange'],
-                'weak_topics': [t for t in all_topics if t['color'] == 'red']
-            }
+                report.subjects[subject_name] = SubjectReport(subject_topics)
             
-            print(f"📊 Generated multi-subject report for {report['Name']} with {len(report['subjects'])} subjects")
+            if debug:
+                logger.debug("📊 Generated multi-subject report for %s with %d subjects", report.name, len(report.subjects))
             return report
             
         except Exception as e:
-            print(f"Error generating multi-subject report: {e}")
+            logger.error("Error generating multi-subject report: %s", e)
             return None
     
     def get_single_subject_report(self, data, class_name, roll_number):
@@ -497,8 +1070,9 @@ class GoogleSheetsConnector:
                         'topics': []
                     }
                     
-                    # Get topic ranks for the entire class
-                    topic_ranks = self.calculate_topic_ranks(class_name)
+                    # Topic ranks for the entire class were precomputed with the sheet
+                    model = self._model_for_data(data)
+                    topic_ranks = model.sections[0].ranks if model.sections else {}
                     
                     # Process topics starting from column 2
                     i = 2
@@ -574,7 +1148,7 @@ class GoogleSheetsConnector:
                                 topic['performance_text'] = 'Efficient' if color == 'green' else 'Good' if color == 'orange' else 'Needs Focus'
                                 
                             except Exception as e:
-                                print(f"Error processing topic {topic.get('name', 'Unknown')}: {e}")
+                                logger.error("Error processing topic %s: %s", topic.get('name', 'Unknown'), e)
                                 # Set defaults
                                 topic['score_percentage'] = 0
                                 topic['time_category'] = 'below_avg'
@@ -596,26 +1170,223 @@ class GoogleSheetsConnector:
             return None
             
         except Exception as e:
-            print(f"Error generating single subject report: {e}")
+            logger.error("Error generating single subject report: %s", e)
             return None
 
-# Initialize the connector
-sheets_connector = GoogleSheetsConnector()
-
-# Add all class sheet URLs (converted from pubhtml to CSV format)
-sheets_connector.add_class_sheet_url('1B', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vTaKQHoSE52Y10HCKgwygRq_-qrr4WnfKK2i8we4mPULUH-Kjf0iRL_3iceAGhMR5issbBJLJtDPWoF/pub?output=csv')
-sheets_connector.add_class_sheet_url('1C', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vTfkeAV8g62nZCsKI_fZ2aG0hHPaYaTnPd_YSXX1jk1K0Xx_8uvYyuOEGKibmtldj5H3D1It5JbZpHq/pub?output=csv')
-sheets_connector.add_class_sheet_url('2A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQkRPm_zqNAvqIdS6-Wd1SoS5Tmka7L5wZzQZoDEzFEJ_wXsjQRPeihEwbBXtz8GYzT6dJ626tMtK4V/pub?output=csv')
-sheets_connector.add_class_sheet_url('2B', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vSXU5WrP9nzibanbfjsjOoMpUdhQhxgynNLOuqzIUuw9VOo6QMnFYzaFY1jkjVP_JgZJtWZ3v5wsRNY/pub?output=csv')
-sheets_connector.add_class_sheet_url('3A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQP0diP0IhdQZSirT1oZutI25UMQHfa8XY4DTgBPupOUh7cLBOnFnAmLN6YzKXMHXvbcqxPptJemuxb/pub?output=csv')
-sheets_connector.add_class_sheet_url('3B', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQFOwOqtnZlmgac6jNlDFjSheuFzbdUMcgIW32IiPyxDOdUalUe9eL3NuN3qR72xPztaQXDQz3x4TqK/pub?output=csv')
-sheets_connector.add_class_sheet_url('4A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQ7d75CWqTm93BH_4pj9KdWterqOG4cixwzHr0POggL3yDwSwgfxjfrPhCQKY06Bg62tQc-V7-Ny607/pub?output=csv')
-sheets_connector.add_class_sheet_url('5A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQzwxDvgMvk-0uGiharp6fRV0J6rg0Nnf1d5u_ND3kdcPskxNz_0iemf-bO87nyfiemZHf0QMbwZ-3-/pub?output=csv')
-sheets_connector.add_class_sheet_url('6A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vTNwiuUq48nzDvaxyeg5Cqa_rYE_coZ5pz4ss03ALj8SAy6mnVQxAp1wFfeAYSPPTXTydps3X-qhJXw/pub?output=csv')
-sheets_connector.add_class_sheet_url('6B', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vR_SCZQ8_CMaaGqASlGqWD4oc8bCOazFe4VUm-Rzo1O4br3dZu4RbdliSONTD_2QRypKupbri59aG-L/pub?output=csv')
-sheets_connector.add_class_sheet_url('7A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vRgyXOQGIHl4-86bCncg55yjNheiuiE6d6VFF5psYvyGdCovPnxT4A6d4Qo1NjawUHJfAQctkUig2GO/pub?output=csv')
-sheets_connector.add_class_sheet_url('7B', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vTWXk09C63Cdt9Dk2v_UjusqVeesO6_-3GJmFlOgOj8YGHc8_qZghiI66XHRNu3WJfDz-578pmhGNRJ/pub?output=csv')
-sheets_connector.add_class_sheet_url('8A', 'https://docs.google.com/spreadsheets/d/e/2PACX-1vRs6QnT5Us9BTFdmDW4dXCZ2DXN487tWXfyAuVtuBZXOADm-7wNt139LcNHfpznHenwfLUsPLiKi4Yv/pub?output=csv')
+# Rendered report pages, invalidated whenever their class sheet changes
+rendered_reports = RenderedReportCache(max_entries=int(os.environ.get('RENDERED_REPORT_CACHE_MAX_ENTRIES', 512)))
+
+
+def _invalidate_rendered_reports(class_name, entry, previous):
+    """Drop only the pages of students whose report changed, unless the sheet layout changed"""
+    changes = getattr(entry.model, 'changes', None)
+    if changes is None or changes.structural:
+        rendered_reports.invalidate(class_name)
+    elif changes.rolls:
+        rendered_reports.invalidate(class_name, rolls=changes.rolls)
+
+
+# Class sheet URLs (converted from pubhtml to CSV format) live in this file
+SHEETS_CONFIG_PATH = os.environ.get('SHEETS_CONFIG') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sheets.json')
+
+
+def create_sheets_connector(config_path=None):
+    """Build the app's connector with every class listed in the sheets config file
+
+    The config is {"classes": {"1B": "<published CSV URL>", ...}}. With a
+    base URL (SHEETS_BASE_URL, or "base_url" in the config) every class is
+    read from <base URL>/<class>.csv instead, e.g. from fake_sheets_server.py.
+    """
+    connector = GoogleSheetsConnector()
+    config_path = config_path or SHEETS_CONFIG_PATH
+    try:
+        with open(config_path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error("❌ Could not read sheet config %s: %s", config_path, e)
+        config = {}
+    base_url = os.environ.get('SHEETS_BASE_URL') or config.get('base_url')
+    for class_name, sheet_url in config.get('classes', {}).items():
+        if base_url:
+            sheet_url = f"{base_url.rstrip('/')}/{quote(class_name)}.csv"
+        connector.add_class_sheet_url(class_name, sheet_url)
+    if base_url:
+        logger.info("🧪 Reading class sheets from %s", base_url)
+    connector.add_sheet_listener(_invalidate_rendered_reports)
+    
+    # Optional warm-up: fetch every class in parallel now, then keep them fresh in the background
+    # so user-facing requests never wait on Google
+    prefetch_workers = int(os.environ.get('SHEET_PREFETCH_WORKERS', 8))
+    if _env_flag('SHEET_PREFETCH_ON_STARTUP'):
+        connector.prefetch_all_classes(max_workers=prefetch_workers)
+    refresh_interval = int(os.environ.get('SHEET_REFRESH_INTERVAL', 0))
+    if refresh_interval > 0:
+        connector.start_background_refresher(refresh_interval, max_workers=prefetch_workers)
+    return connector
+
+
+class _DeferredConnector:
+    """Stands in for the app's connector and builds it on first use instead of at import time"""
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_connector', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+    
+    def get(self):
+        if self._connector is None:
+            with self._lock:
+                if self._connector is None:
+                    object.__setattr__(self, '_connector', self._factory())
+        return self._connector
+    
+    def is_ready(self):
+        return self._connector is not None
+    
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+
+sheets_connector = _DeferredConnector(create_sheets_connector)
+# Long-running servers that warm up at boot build the connector right away, on a thread
+# so importing the app never waits on Google
+if _env_flag('SHEET_PREFETCH_ON_STARTUP') or int(os.environ.get('SHEET_REFRESH_INTERVAL', 0)) > 0:
+    threading.Thread(target=sheets_connector.get, name='sheet-warmup', daemon=True).start()
+
+# Browsers and the edge revalidate every view; unchanged reports come back as 304
+REPORT_CACHE_CONTROL = os.environ.get('REPORT_CACHE_CONTROL', 'public, max-age=0, s-maxage=60, must-revalidate')
+
+def _collect_cache_metrics():
+    if not sheets_connector.is_ready():
+        return []
+    cache = sheets_connector.get_cache_stats()
+    rendered = rendered_reports.get_stats()
+    return [
+        ('sheet_cache_events_total', 'counter', 'Sheet cache lookups and maintenance events',
+         [({'event': event}, cache[event]) for event in
+          ('hits', 'stale_hits', 'misses', 'revalidated', 'coalesced', 'snapshot_loads', 'evictions')]),
+        ('sheet_cache_entries', 'gauge', 'Class sheets currently cached', [({}, cache['size'])]),
+        ('rendered_report_cache_events_total', 'counter', 'Rendered report cache lookups and invalidations',
+         [({'event': event}, rendered[event]) for event in ('hits', 'misses', 'invalidations')]),
+        ('rendered_report_cache_entries', 'gauge', 'Rendered report pages currently cached', [({}, rendered['size'])]),
+    ]
+
+
+metrics.add_collector(_collect_cache_metrics)
+
+
+def _collect_upstream_metrics():
+    if not sheets_connector.is_ready():
+        return []
+    fetch = sheets_connector.fetch_policy.get_stats()
+    breaker = sheets_connector.breaker.get_stats()
+    return [
+        ('sheet_fetch_attempt_events_total', 'counter', 'Sheet download attempts, retries, hedges and deadline cut-offs',
+         [({'event': event}, fetch[event]) for event in
+          ('attempts', 'retries', 'failures', 'hedges', 'hedge_wins', 'deadline_exceeded')]),
+        ('sheet_breaker_events_total', 'counter', 'Sheet circuits opened and downloads skipped while open',
+         [({'event': event}, breaker[event]) for event in ('opened', 'short_circuited')]),
+        ('sheet_breaker_state', 'gauge', 'Sheet circuit per class (0 closed, 1 half open, 2 open)',
+         [({'class': class_name}, CircuitBreaker.STATE_VALUES[circuit['state']])
+          for class_name, circuit in breaker['circuits'].items()]),
+    ]
+
+
+metrics.add_collector(_collect_upstream_metrics)
+
+# Longest a request may wait on Google before it is answered from whatever is cached
+REQUEST_DEADLINE = float(os.environ.get('SHEET_REQUEST_DEADLINE', 8))
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    set_request_deadline(REQUEST_DEADLINE)
+
+
+@app.teardown_request
+def _clear_request_deadline(exc=None):
+    set_request_deadline(None)
+
+
+@app.after_request
+def _record_response(response):
+    endpoint = request.endpoint or 'unknown'
+    metrics.inc('http_responses_total', endpoint=endpoint, status=response.status_code)
+    started = g.get('request_started')
+    if started is not None:
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started, endpoint=endpoint)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Fingerprinted assets written by build_assets.py; a new build means new file names
+ASSET_MANIFEST_PATH = os.path.join(app.static_folder, 'dist', 'manifest.json')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+FINGERPRINTED_ASSET = re.compile(r'\.[0-9a-f]{10}\.(css|js)$')
+_asset_manifest = None
+
+
+def _load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@app.template_global()
+def asset_url(filename):
+    """URL of a static asset: its minified, fingerprinted build when there is one, else the file itself"""
+    global _asset_manifest
+    if _asset_manifest is None or app.debug:
+        _asset_manifest = _load_asset_manifest()
+    return url_for('static', filename=_asset_manifest.get(filename, filename))
+
+
+_render_fingerprint = None
+
+
+def render_fingerprint():
+    """Hash of the report template and the asset manifest, part of every cached page's key and ETag
+
+    A deploy that changes either one must not keep serving pages (or 304s)
+    rendered by the previous version.
+    """
+    global _render_fingerprint
+    if _render_fingerprint is None or app.debug:
+        source = app.jinja_env.loader.get_source(app.jinja_env, 'topic_report.html')[0]
+        manifest = json.dumps(_load_asset_manifest(), sort_keys=True)
+        _render_fingerprint = sheet_version(source + '\n' + manifest)[:12]
+    return _render_fingerprint
+
+
+@app.route('/static/dist/<path:filename>')
+def built_asset(filename):
+    """Serve a fingerprinted asset, cached for good and precompressed when the browser accepts it"""
+    path = safe_join(app.static_folder, 'dist', filename)
+    # Only content-hashed names may be cached for good; the manifest is read by the app, not served
+    if path is None or not FINGERPRINTED_ASSET.search(filename) or not os.path.isfile(path):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[name] and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, name
+            break
+    response = send_file(path, mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
 
 @app.route('/')
 def index():
@@ -624,7 +1395,7 @@ def index():
         classes = sheets_connector.get_classes()
         return render_template('index.html', classes=classes)
     except Exception as e:
-        print(f"Error loading classes for index page: {e}")
+        logger.error("Error loading classes for index page: %s", e)
         return render_template('index.html', classes=[])
 
 @app.route('/api/classes')
@@ -642,6 +1413,180 @@ def get_classes_api():
             'error': str(e)
         })
 
+@app.route('/api/cache-stats')
+def get_cache_stats_api():
+    """API endpoint to inspect the sheet cache counters"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': sheets_connector.get_cache_stats(),
+            'rendered_reports': rendered_reports.get_stats(),
+            'search_index': sheets_connector.search_index.get_stats(),
+            'upstream': sheets_connector.get_upstream_stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/ranks/<class_name>')
+def get_ranks_api(class_name):
+    """API endpoint to get the precomputed topic rank tables for a class"""
+    try:
+        rank_tables = sheets_connector.get_rank_tables(class_name)
+        if rank_tables is None:
+            return jsonify({
+                'success': False,
+                'error': f'No data found for class {class_name}'
+            })
+        return jsonify({
+            'success': True,
+            'class': class_name,
+            'version': rank_tables['version'],
+            'ranks': rank_tables['ranks']
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+def chart_data_payload(class_name, roll_number, chart_data):
+    """JSON body of /api/chart-data (also written as-is by the static export)"""
+    return {
+        'success': True,
+        'class': class_name,
+        'roll': str(roll_number),
+        'version': chart_data['version'],
+        'palette': list(CHART_POINT_COLORS),
+        'buckets': [text for _, text, _ in PERFORMANCE_BUCKETS],
+        'subjects': chart_data['subjects']
+    }
+
+@app.route('/api/chart-data/<class_name>/<roll_number>')
+def get_chart_data_api(class_name, roll_number):
+    """API endpoint to get a student's chart series in columnar form
+
+    Validated with an ETag for the student's report revision, so browsers and
+    the edge revalidate with a 304 until that student's marks change.
+    """
+    try:
+        chart_data = sheets_connector.get_chart_data(class_name, roll_number)
+        if chart_data is None:
+            return jsonify({
+                'success': False,
+                'error': f'No data found for Roll Number {roll_number} in Class {class_name}'
+            })
+        response = jsonify(chart_data_payload(class_name, roll_number, chart_data))
+        response.set_etag(sheet_version(f"chart/{class_name}/{roll_number}/{chart_data['version']}"))
+        response.last_modified = datetime.fromtimestamp(chart_data['updated_at'], tz=timezone.utc)
+        response.headers['Cache-Control'] = REPORT_CACHE_CONTROL
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/class-analytics/<class_name>')
+def get_class_analytics_api(class_name):
+    """API endpoint to get per-topic averages, quartiles, histograms and performance shares for a class"""
+    try:
+        analytics = sheets_connector.get_class_analytics(class_name)
+        if analytics is None:
+            return jsonify({
+                'success': False,
+                'error': f'No data found for class {class_name}'
+            })
+        return jsonify({
+            'success': True,
+            'class': class_name,
+            'version': analytics['version'],
+            'analytics': analytics['analytics']
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/school-analytics')
+def get_school_analytics_api():
+    """API endpoint to get class and subject summaries for the whole school"""
+    try:
+        return jsonify({
+            'success': True,
+            'analytics': sheets_connector.get_school_analytics()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/search')
+def search_api():
+    """API endpoint for type-ahead search across every class (?q=name or class and roll, e.g. 7B 12)"""
+    try:
+        query = request.args.get('q', '')
+        limit = min(int(request.args.get('limit', 10)), 50)
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': sheets_connector.search_students(query, limit)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/changes')
+def get_changes_api():
+    """API endpoint for the sheet change feed
+
+    Poll with ``?since=<seq>`` (the ``latest`` value of the previous call) and
+    optionally ``&class=<class>`` to receive only the changes made since.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        changes, latest = sheets_connector.get_changes(since, request.args.get('class') or None, limit)
+        return jsonify({
+            'success': True,
+            'latest': latest,
+            'changes': changes
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/history/<class_name>/<roll_number>')
+def get_history_api(class_name, roll_number):
+    """API endpoint for a student's marks over time (``?since=<unix time>`` trims older points)"""
+    try:
+        since = request.args.get('since')
+        history = sheets_connector.get_student_history(class_name, roll_number, float(since) if since else None)
+        if history is None:
+            return jsonify({
+                'success': False,
+                'error': f'No history recorded for class {class_name}'
+            })
+        return jsonify({
+            'success': True,
+            'class': class_name,
+            'roll_number': roll_number,
+            **history
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
 @app.route('/api/students/<class_name>')
 def get_students_api(class_name):
     """API endpoint to get students in a class"""
@@ -659,30 +1604,177 @@ def get_students_api(class_name):
 
 @app.route('/report/<class_name>/<roll_number>')
 def student_report(class_name, roll_number):
-    """Display student report page"""
+    """Display student report page (served from the rendered-report cache when the sheet is unchanged)"""
     try:
+        revision = sheets_connector.get_report_revision(class_name, roll_number)
+        page_version = f"{revision[0]}/{render_fingerprint()}" if revision is not None else None
+        
+        if revision is not None:
+            rendered = rendered_reports.get(class_name, roll_number, page_version)
+            if rendered is not None:
+                return rendered.to_response(request, REPORT_CACHE_CONTROL)
+        
         student_data = sheets_connector.get_student_report(class_name, roll_number)
         
         if not student_data:
+            retry_after = sheets_connector.unavailable_retry_after(class_name)
+            if retry_after is not None:
+                # Google did not answer in time and there is no earlier copy: say so instead of "no data"
+                return render_template('error.html',
+                                       message=f"The marks sheet for Class {class_name} could not be loaded right now. "
+                                               f"Please try again in a minute."), 503, {'Retry-After': str(retry_after)}
+        if not student_data or not student_data.subjects:
+            # Unknown roll number: nothing to render, and nothing worth caching
             return render_template('error.html', 
-                                 message=f"No data found for Roll Number {roll_number} in Class {class_name}")
+                                 message=f"No data found for Roll Number {roll_number} in Class {class_name}"), 404
+        
+        if revision is None:
+            with metrics.span('render'):
+                return render_template('topic_report.html', student=student_data, report_time=datetime.now())
         
-        # Get current datetime for report generation timestamp
-        current_time = datetime.now()
+        # Cached pages stay byte-identical: the browser fills in the time the report is viewed at
+        with metrics.span('render'):
+            html = render_template('topic_report.html', student=student_data, report_time=datetime.now(),
+                                   stamp_in_browser=True)
         
-        return render_template('topic_report.html', student=student_data, report_time=current_time)
+        rendered = rendered_reports.put(class_name, roll_number, page_version, html, revision[1])
+        return rendered.to_response(request, REPORT_CACHE_CONTROL)
         
     except Exception as e:
         return render_template('error.html', message=f"Error: {str(e)}")
 
+# Combining report pages into one print document: every page keeps its body (without
+# scripts), all subject tabs are shown, interactive parts are hidden and each report
+# starts on a new sheet of paper
+_PAGE_HEAD = re.compile(r'<head[^>]*>(.*?)</head>', re.S)
+_PAGE_BODY = re.compile(r'<body[^>]*>(.*)</body>', re.S)
+_PAGE_SCRIPT = re.compile(r'<script\b[^>]*>.*?</script>', re.S)
+_PAGE_TITLE = re.compile(r'<title>.*?</title>', re.S)
+_STATIC_STYLESHEET = re.compile(r'<link href="/static/([^"]+\.css)" rel="stylesheet">')
+PRINT_STYLES = """<style>
+        .print-page { break-after: page; page-break-after: always; }
+        .print-page:last-child { break-after: auto; page-break-after: auto; }
+        .print-page .tab-pane { display: block !important; opacity: 1 !important; visibility: visible !important; }
+        .print-page .nav-tabs, .print-page .no-print, .print-page .chart-container, .print-page .chart-legend,
+        .print-page .card:has(> .card-body > .chart-container) { display: none !important; }
+    </style>"""
+
+
+def split_report_page(html):
+    """(head, body) of a rendered report page, without scripts or title"""
+    head = _PAGE_HEAD.search(html)
+    body = _PAGE_BODY.search(html)
+    head = _PAGE_SCRIPT.sub('', _PAGE_TITLE.sub('', head.group(1))) if head else ''
+    body = _PAGE_SCRIPT.sub('', body.group(1)) if body else html
+    return head, body
+
+
+def print_document_start(head, title, inline_static=False):
+    """Opening of a multi-page print document built from a report page's head
+
+    ``inline_static`` embeds the app's own stylesheets so the document also
+    renders as a standalone file.
+    """
+    if inline_static:
+        def inline(match):
+            try:
+                with open(os.path.join(app.static_folder, match.group(1)), encoding='utf-8') as f:
+                    return f"<style>\n{f.read()}\n</style>"
+            except OSError:
+                return match.group(0)
+        head = _STATIC_STYLESHEET.sub(inline, head)
+    return f'<!DOCTYPE html>\n<html lang="en">\n<head>{head}    <title>{title}</title>\n    {PRINT_STYLES}\n</head>\n<body>\n'
+
+
+PRINT_DOCUMENT_END = '</body>\n</html>\n'
+
+
+def iter_print_pages(connector, class_name):
+    """Yield (head, body) for every student's report in a class, one page at a time
+
+    Needs an application or request context for render_template.
+    """
+    for student in connector.get_students_by_class(class_name):
+        roll_number = student['Roll Number']
+        report = connector.get_student_report(class_name, roll_number)
+        if not report:
+            continue
+        with metrics.span('render'):
+            html = render_template('topic_report.html', student=report, report_time=datetime.now())
+        head, body = split_report_page(html)
+        yield head, f'<div class="print-page">{body}</div>\n'
+
+
+@app.route('/print/<class_name>')
+def print_class_reports(class_name):
+    """Every report of a class as one print-ready document, streamed page by page"""
+    pages = iter_print_pages(sheets_connector, class_name)
+    # The first page is rendered before streaming starts, so a class without reports still gets a 404
+    first = next(pages, None)
+    if first is None:
+        return render_template('error.html', message=f"No reports found for Class {class_name}"), 404
+    
+    def generate():
+        head, body = first
+        yield print_document_start(head, f"Student Reports - Class {class_name}")
+        yield body
+        for _, body in pages:
+            yield body
+        yield PRINT_DOCUMENT_END
+    
+    return Response(stream_with_context(generate()), mimetype='text/html')
+
 @app.route('/api/student-report/<class_name>/<roll_number>')
 def get_student_report_api(class_name, roll_number):
     """API endpoint to get student report data"""
     try:
         student_data = sheets_connector.get_student_report(class_name, roll_number)
+        if student_data is None:
+            retry_after = sheets_connector.unavailable_retry_after(class_name)
+            if retry_after is not None:
+                return jsonify({
+                    'success': False,
+                    'error': f"Sheet for class {class_name} is temporarily unavailable",
+                    'retry_after': retry_after
+                })
+        return jsonify({
+            'success': True,
+            'student': student_data.to_dict() if student_data is not None else None
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/class-report/<class_name>')
+def get_class_report_api(class_name):
+    """API endpoint to get every student's report in a class
+
+    Pass ``?stream=1`` (or ``Accept: application/x-ndjson``) to receive one
+    report per line as NDJSON while the class is still being processed.
+    """
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'yes') or \
+        request.accept_mimetypes.best == 'application/x-ndjson'
+    
+    if stream:
+        def generate():
+            try:
+                for report in sheets_connector.iter_class_reports(class_name):
+                    yield json.dumps(report.to_dict()) + '\n'
+            except Exception as e:
+                yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    try:
+        reports = list(sheets_connector.iter_class_reports(class_name))
         return jsonify({
             'success': True,
-            'student': student_data
+            'class': class_name,
+            'version': sheets_connector.get_sheet_version(class_name),
+            'count': len(reports),
+            'students': [report.to_dict() for report in reports]
         })
     except Exception as e:
         return jsonify({
@@ -691,9 +1783,9 @@ def get_student_report_api(class_name, roll_number):
         })
 
 if __name__ == '__main__':
-    print("🚀 Starting Student Report Application...")
-    print("📋 Ready to accept individual sheet URLs for each class")
-    print("💡 Use sheets_connector.add_class_sheet_url('1B', 'your_url_here') to add sheets")
+    logger.info("🚀 Starting Student Report Application...")
+    logger.info("📋 Ready to accept individual sheet URLs for each class")
+    logger.info("💡 Add class sheet URLs to %s (or call sheets_connector.add_class_sheet_url)", SHEETS_CONFIG_PATH)
     
     # For Render.com deployment, use the PORT environment variable
     import os
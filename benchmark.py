@@ -0,0 +1,208 @@
+"""Benchmark the report pipeline on synthetic school-scale sheets.
+
+For every combination of class size, topic count and number of subject
+sections, a synthetic sheet (see synthetic_sheets.py) is pushed through each
+stage of the pipeline:
+
+    csv_parse           read_csv_stream over the downloaded bytes
+    student_scan        scan_student_list (first section, columns 0-1 only)
+    model_compile       ClassSheetModel.from_rows (sections, scores, rank tables)
+    model_update        from_rows diffed against the previous version after a one-cell edit
+    students            get_students_by_class
+    subject_ranks       calculate_subject_topic_ranks for every section
+    student_report      get_multi_subject_report for one student
+    class_report        every student's report for the class
+    class_analytics     per-topic class aggregates (section_analytics for every section)
+
+Each stage is timed over several repeats (min and median are kept) and run
+once more under tracemalloc to record its peak memory. Results are written
+as JSON so runs from different versions can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+    python benchmark.py --quick
+"""
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import app_simple
+from sheet_model import ClassSheetModel, scan_student_list, section_analytics
+from sources import CSV_CHUNK_SIZE, iter_csv_lines, read_csv_stream
+from synthetic_sheets import generate_class_csv
+
+DEFAULT_STUDENTS = [40, 200, 1000, 5000]
+DEFAULT_TOPICS = [10, 50, 150, 300]
+DEFAULT_SECTIONS = [1, 2]
+QUICK = {'students': [40, 200], 'topics': [10, 50], 'sections': [2]}
+
+CLASS_NAME = 'BENCH'
+
+
+def _chunks(body):
+    """The body in the chunk sizes a download is read in"""
+    return (body[i:i + CSV_CHUNK_SIZE] for i in range(0, len(body), CSV_CHUNK_SIZE))
+
+
+def _stages(connector, text):
+    """The pipeline stages for one sheet, as (name, callable) pairs in pipeline order"""
+    body = text.encode('utf-8')
+    rows, _ = read_csv_stream(_chunks(body))
+    connector.load_class_sheet(CLASS_NAME, rows)
+    model = connector.get_class_model(CLASS_NAME)
+    middle_roll = model.students[len(model.students) // 2]['Roll Number'] if model.students else '1'
+    
+    # The same sheet with one student's marks edited in one topic
+    edited = [list(row) for row in rows]
+    for row in edited:
+        if row and row[0] == middle_roll and len(row) > 3:
+            row[3] = '0' if row[3] != '0' else '12'
+            break
+
+    return [
+        ('csv_parse', lambda: read_csv_stream(_chunks(body))),
+        ('student_scan', lambda: scan_student_list(csv.reader(iter_csv_lines(_chunks(body))))),
+        ('model_compile', lambda: ClassSheetModel.from_rows(rows)),
+        ('model_update', lambda: ClassSheetModel.from_rows(edited, previous=model, previous_data=rows)),
+        ('students', lambda: connector.get_students_by_class(CLASS_NAME)),
+        ('subject_ranks', lambda: [
+            connector.calculate_subject_topic_ranks(rows, section.name, section.start_row)
+            for section in model.sections
+        ]),
+        ('student_report', lambda: connector.get_multi_subject_report(model, CLASS_NAME, middle_roll)),
+        ('class_report', lambda: list(connector.iter_class_reports(CLASS_NAME))),
+        ('class_analytics', lambda: [section_analytics(section) for section in model.sections]),
+    ]
+
+
+def _time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(students_list, topics_list, sections_list, repeats=3, stages=None):
+    """Run the grid and return the result records"""
+    connector = app_simple.GoogleSheetsConnector(snapshot_path='off', history_path='off', local_dir='')
+    results = []
+    devnull = open(os.devnull, 'w')
+    try:
+        for students, topics, sections in itertools.product(students_list, topics_list, sections_list):
+            text = generate_class_csv(CLASS_NAME, students, topics, sections)
+            with contextlib.redirect_stdout(devnull):
+                stage_fns = _stages(connector, text)
+            for stage, fn in stage_fns:
+                if stages and stage not in stages:
+                    continue
+                # The whole-class report is far slower than the rest; fewer repeats keep runs practical
+                stage_repeats = 1 if stage == 'class_report' and students * topics > 100_000 else repeats
+                with contextlib.redirect_stdout(devnull):
+                    timings = _time(fn, stage_repeats)
+                    peak = _peak_memory(fn)
+                record = {
+                    'students': students,
+                    'topics': topics,
+                    'sections': sections,
+                    'csv_bytes': len(text),
+                    'stage': stage,
+                    'repeats': stage_repeats,
+                    'seconds_min': min(timings),
+                    'seconds_median': statistics.median(timings),
+                    'peak_memory_kib': round(peak / 1024, 1)
+                }
+                results.append(record)
+                print(f"⏱️  {students:>5} students x {topics:>3} topics x {sections} sections  "
+                      f"{stage:<15} {record['seconds_median'] * 1000:>10.2f} ms  {record['peak_memory_kib']:>10.1f} KiB")
+    finally:
+        devnull.close()
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current, baseline):
+    """Print median-time and peak-memory ratios against an earlier results file"""
+    key = lambda r: (r['students'], r['topics'], r['sections'], r['stage'])
+    before = {key(r): r for r in baseline['results']}
+    print(f"\n📊 Compared with {baseline['meta'].get('revision') or 'baseline'} ({baseline['meta'].get('timestamp')})")
+    for record in current['results']:
+        old = before.get(key(record))
+        if old is None:
+            continue
+        time_ratio = record['seconds_median'] / old['seconds_median'] if old['seconds_median'] else float('inf')
+        mem_ratio = record['peak_memory_kib'] / old['peak_memory_kib'] if old['peak_memory_kib'] else float('inf')
+        flag = '🔺' if time_ratio > 1.10 else '🔻' if time_ratio < 0.90 else '  '
+        print(f"{flag} {record['students']:>5} x {record['topics']:>3} x {record['sections']}  {record['stage']:<15} "
+              f"time x{time_ratio:.2f}  memory x{mem_ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the report pipeline on synthetic sheets')
+    parser.add_argument('--students', type=int, nargs='+', default=DEFAULT_STUDENTS)
+    parser.add_argument('--topics', type=int, nargs='+', default=DEFAULT_TOPICS)
+    parser.add_argument('--sections', type=int, nargs='+', default=DEFAULT_SECTIONS)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--stages', nargs='+', help='only run these stages')
+    parser.add_argument('--quick', action='store_true', help='small grid for a fast smoke run')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON results')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.students, args.topics, args.sections = QUICK['students'], QUICK['topics'], QUICK['sections']
+
+    results = run(args.students, args.topics, args.sections, repeats=args.repeats, stages=args.stages)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Build fingerprinted, precompressed static assets.
+
+Minifies the app's CSS and JavaScript, names each output after a hash of its
+content and writes gzip and brotli variants next to it:
+
+    static/dist/css/style.3f9a1c2b7d.css
+    static/dist/css/style.3f9a1c2b7d.css.gz
+    static/dist/css/style.3f9a1c2b7d.css.br
+    static/dist/manifest.json           {"css/style.css": "dist/css/style.3f9a1c2b7d.css", ...}
+
+Templates reference assets through asset_url('css/style.css'), which reads the
+manifest, and the app serves static/dist/ with Cache-Control: immutable and
+the precompressed variant the browser accepts. A changed file gets a new
+name, so repeat views never revalidate assets. Without a build the templates
+fall back to the plain files.
+
+Minification uses csscompressor and rjsmin (pinned in requirements-dev.txt,
+so a rebuild produces the same files); both only drop comments and
+whitespace. The build output is committed, so every deployment ships it.
+
+Usage:
+    pip install -r requirements-dev.txt
+    python build_assets.py
+    python build_assets.py --check      # exit 1 if the manifest is missing or out of date
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+import csscompressor
+import rjsmin
+
+try:
+    import brotli
+except ImportError:  # brotli is optional - only .gz variants are written without it
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, 'static')
+DIST = 'dist'
+MANIFEST = 'manifest.json'
+ASSETS = ('css/style.css', 'js/main.js', 'js/charts.js')
+HASH_LENGTH = 10
+
+
+# Comments and quoted strings in CSS, matched together so quotes inside comments are skipped
+_CSS_COMMENT_OR_STRING = re.compile(r'/\*.*?\*/|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'', re.S)
+
+
+def minify_css(text):
+    """Minified CSS (csscompressor, a port of the YUI compressor)
+
+    Raises ValueError instead of writing a file when a quoted string (e.g. a
+    url() value) did not survive unchanged: csscompressor collapses whitespace
+    inside some data URIs, and a broken build would be cached for a year.
+    """
+    minified = csscompressor.compress(text)
+    for match in _CSS_COMMENT_OR_STRING.finditer(text):
+        string = match.group()
+        if not string.startswith('/*') and string not in minified:
+            raise ValueError(f"Minifying CSS changed the string {string}")
+    return minified
+
+
+def minify_js(text):
+    """Minified JavaScript (rjsmin: comments and whitespace only, no renaming)"""
+    return rjsmin.jsmin(text)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def fingerprint(content):
+    return hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+
+
+def build(static_dir=STATIC_DIR, assets=ASSETS):
+    """Write the minified, hashed and compressed assets and their manifest; returns the manifest"""
+    dist_dir = os.path.join(static_dir, DIST)
+    manifest = {}
+    for asset in assets:
+        stem, ext = os.path.splitext(asset)
+        with open(os.path.join(static_dir, asset), encoding='utf-8') as f:
+            source = f.read()
+        content = MINIFIERS[ext](source).encode('utf-8')
+        hashed = f"{stem}.{fingerprint(content)}{ext}"
+        path = os.path.join(dist_dir, hashed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Earlier builds of this asset are no longer referenced
+        prefix = os.path.basename(stem) + '.'
+        for name in os.listdir(os.path.dirname(path)):
+            if name.startswith(prefix) and not name.startswith(os.path.basename(hashed)):
+                os.remove(os.path.join(os.path.dirname(path), name))
+
+        with open(path, 'wb') as f:
+            f.write(content)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[asset] = f"{DIST}/{hashed}"
+        print(f"📦 {asset:<16} {len(source.encode('utf-8')):>7} B -> {len(content):>7} B minified, "
+              f"{len(gzip.compress(content, compresslevel=9)):>6} B gzip  {manifest[asset]}")
+
+    with open(os.path.join(dist_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def check(static_dir=STATIC_DIR, assets=ASSETS):
+    """Whether the manifest points at builds of the current sources"""
+    try:
+        with open(os.path.join(static_dir, DIST, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    for asset in assets:
+        stem, ext = os.path.splitext(asset)
+        with open(os.path.join(static_dir, asset), encoding='utf-8') as f:
+            content = MINIFIERS[ext](f.read()).encode('utf-8')
+        if manifest.get(asset) != f"{DIST}/{stem}.{fingerprint(content)}{ext}":
+            return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Minify, fingerprint and precompress static assets')
+    parser.add_argument('--check', action='store_true', help='only verify that the build is up to date')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if check():
+            print("✅ Static assets are up to date")
+            return 0
+        print("❌ Static assets are out of date: run python build_assets.py")
+        return 1
+    build()
+    if brotli is None:
+        print("⚠️  brotli is not installed: only gzip variants were written")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
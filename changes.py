@@ -0,0 +1,91 @@
+"""What changed between two versions of a class sheet, and the feed downstream caches follow"""
+import threading
+from collections import deque
+
+
+class SheetChanges:
+    """What changed in a class sheet since the previously parsed version
+
+    ``structural`` means the layout changed (subjects, topics or roll numbers),
+    so everything was recomputed and every report of the class is affected.
+    Otherwise ``topics`` lists the re-ranked topics per subject and ``rolls``
+    the students whose reports differ: edited cells, renamed students and
+    students whose rank moved in an edited topic.
+    """
+    MAX_CELLS = 500
+    
+    def __init__(self, version=None, previous_version=None):
+        self.version = version
+        self.previous_version = previous_version
+        self.structural = False
+        self.topics = {}            # {subject: [topic names recomputed]}
+        self.rolls = set()          # roll numbers whose report changed
+        self.cells = []             # individual edits, capped at MAX_CELLS
+        self.truncated = False
+    
+    def _add_cell(self, subject, topic, roll_no, field, old, new):
+        if len(self.cells) >= self.MAX_CELLS:
+            self.truncated = True
+            return
+        self.cells.append({'subject': subject, 'topic': topic, 'roll': roll_no, 'field': field, 'old': old, 'new': new})
+    
+    def record_section(self, section, previous, changed_topics, cells, renamed):
+        """Record one section's edits (see SubjectSection.diff) after its scores were updated"""
+        if changed_topics:
+            self.topics[section.name] = [section.topics[topic_idx] for topic_idx in sorted(changed_topics)]
+        for pos, topic_idx, field in cells:
+            roll_no = section.rolls[pos]
+            self.rolls.add(roll_no)
+            values = (previous.marks, section.marks) if field == 'marks' else (previous.times, section.times)
+            self._add_cell(section.name, section.topics[topic_idx], roll_no, field,
+                           values[0][pos][topic_idx], values[1][pos][topic_idx])
+        for pos in renamed:
+            roll_no = section.rolls[pos]
+            self.rolls.add(roll_no)
+            self._add_cell(section.name, None, roll_no, 'name', previous.names[pos], section.names[pos])
+        # A changed score can move every other student's rank in that topic
+        for topic_idx in changed_topics:
+            topic_name = section.topics[topic_idx]
+            old_ranks = previous.ranks.get(topic_name, {})
+            new_ranks = section.ranks.get(topic_name, {})
+            self.rolls.update(roll_no for roll_no in old_ranks.keys() | new_ranks.keys()
+                              if old_ranks.get(roll_no) != new_ranks.get(roll_no))
+    
+    def is_empty(self):
+        return not self.structural and not self.rolls and not self.topics
+    
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'previous_version': self.previous_version,
+            'structural': self.structural,
+            'topics': self.topics,
+            'rolls': sorted(self.rolls, key=lambda r: (not r.isdigit(), int(r) if r.isdigit() else 0, r)),
+            'cells': self.cells,
+            'truncated': self.truncated
+        }
+
+
+class ChangeFeed:
+    """Bounded, sequence-numbered log of sheet changes for downstream caches to follow
+
+    Every new sheet version appends one record (see SheetChanges.to_dict) with
+    an increasing ``seq``; consumers poll with the last ``seq`` they saw.
+    """
+    def __init__(self, max_entries=1000):
+        self._records = deque(maxlen=max_entries)
+        self._seq = 0
+        self._lock = threading.Lock()
+    
+    def record(self, class_name, changes, at):
+        with self._lock:
+            self._seq += 1
+            record = dict(changes.to_dict(), seq=self._seq, **{'class': class_name, 'at': at})
+            self._records.append(record)
+            return record
+    
+    def since(self, seq=0, class_name=None, limit=100):
+        """Records newer than ``seq`` (oldest first), optionally for a single class"""
+        with self._lock:
+            records = [r for r in self._records if r['seq'] > seq and (class_name is None or r['class'] == class_name)]
+            return records[:limit], self._seq
@@ -0,0 +1,182 @@
+"""Cold-start tooling: precompile the app for deployment and measure startup.
+
+A serverless cold start pays for importing the app and for everything the
+first requests compile. Two commands:
+
+    build      precompile every Jinja template into template_cache/ (committed, so
+               every deployment ships it; the app loads templates from it while
+               their checksums match) and byte-compile the Python sources
+    profile    start fresh interpreters, time the import and the first index and
+               report responses, and list the packages that dominate import time
+
+profile exits with status 1 when the median cold start is over the budget
+(--budget-ms or STARTUP_BUDGET_MS), so it can gate a deploy.
+
+Usage:
+    python cold_start.py build
+    python cold_start.py build --check      # exit 1 if template_cache/ is out of date
+    python cold_start.py profile --runs 5 --budget-ms 1000
+"""
+import argparse
+import compileall
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET_MS = 1000
+
+# Runs in a fresh interpreter (under -X importtime) for every profile run
+CHILD = r'''
+import json, time
+started = time.perf_counter()
+import app_simple
+imported = time.perf_counter()
+client = app_simple.app.test_client()
+client.get('/')
+index_done = time.perf_counter()
+from synthetic_sheets import generate_class_rows
+app_simple.sheets_connector.load_class_sheet('9Z', generate_class_rows('9Z', 40, 10, 2))
+status = client.get('/report/9Z/1').status_code
+report_done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_index_ms': (index_done - imported) * 1000,
+    'first_report_ms': (report_done - index_done) * 1000,
+    'report_status': status
+}))
+'''
+
+STAGES = ('import_ms', 'first_index_ms', 'first_report_ms')
+
+
+def build_templates(template_dir=None, check=False):
+    """Write the Python source of every template into template_cache/ (or only check it is current)
+
+    Returns the names of the templates whose precompiled copy was missing or out of date.
+    """
+    import app_simple
+    template_dir = template_dir or app_simple.PRECOMPILED_TEMPLATES_DIR
+    cache = app_simple.TemplateBytecodeCache
+    env = app_simple.app.jinja_env
+    stale = []
+    for name in env.list_templates():
+        source, filename, _ = env.loader.get_source(env, name)
+        header = cache.precompiled_header(name, env.bytecode_cache.get_source_checksum(source))
+        path = cache.precompiled_path(template_dir, name)
+        try:
+            with open(path, encoding='utf-8') as f:
+                current = f.readline() == header
+        except OSError:
+            current = False
+        if current:
+            continue
+        stale.append(name)
+        if not check:
+            os.makedirs(template_dir, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(header + env.compile(source, name, filename, raw=True))
+    if not check:
+        # Templates that no longer exist
+        wanted = {os.path.basename(cache.precompiled_path(template_dir, name)) for name in env.list_templates()}
+        for entry in os.listdir(template_dir):
+            if entry.startswith('tmpl_') and entry.endswith('.py') and entry not in wanted:
+                os.remove(os.path.join(template_dir, entry))
+    return stale
+
+
+def build(template_dir=None):
+    """Byte-compile the app's modules and precompile its templates; returns (modules, rewritten templates)"""
+    modules = compileall.compile_dir(ROOT, maxlevels=0, quiet=1,
+                                     invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+    if not modules:
+        raise RuntimeError('Byte-compiling the app failed')
+    return len([name for name in os.listdir(ROOT) if name.endswith('.py')]), build_templates(template_dir)
+
+
+def _import_profile(stderr):
+    """Self import time in ms per top-level package, from -X importtime output"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us) / 1000
+    return totals
+
+
+def profile(runs=5, top=12):
+    """Median stage timings over ``runs`` fresh processes plus the slowest packages to import"""
+    env = dict(os.environ, SHEET_SNAPSHOT_PATH='off', SHEET_HISTORY_PATH='off', SHEET_PREFETCH_ON_STARTUP='false',
+               SHEET_REFRESH_INTERVAL='0', LOG_LEVEL='WARNING')
+    samples = defaultdict(list)
+    packages = defaultdict(list)
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            raise RuntimeError(f"Profile run failed:\n{result.stderr[-2000:]}")
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        for stage in STAGES:
+            samples[stage].append(timings[stage])
+        for package, ms in _import_profile(result.stderr).items():
+            packages[package].append(ms)
+
+    medians = {stage: statistics.median(values) for stage, values in samples.items()}
+    medians['cold_start_ms'] = sum(medians[stage] for stage in STAGES)
+    slowest = sorted(((statistics.median(values), package) for package, values in packages.items()), reverse=True)[:top]
+    return medians, slowest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompile the app and measure its cold start')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='byte-compile modules and templates for deployment')
+    build_parser.add_argument('--templates', help='precompiled template directory (default: template_cache/)')
+    build_parser.add_argument('--check', action='store_true', help='only verify that template_cache/ is up to date')
+    profile_parser = commands.add_parser('profile', help='time cold starts in fresh interpreters')
+    profile_parser.add_argument('--runs', type=int, default=5)
+    profile_parser.add_argument('--top', type=int, default=12, help='packages to list by import time')
+    profile_parser.add_argument('--budget-ms', type=float,
+                                default=float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    profile_parser.add_argument('--output', help='also write the profile as JSON')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if args.check:
+            stale = build_templates(args.templates, check=True)
+            if stale:
+                print(f"❌ Precompiled templates are out of date ({', '.join(stale)}): run python cold_start.py build")
+                return 1
+            print("✅ Precompiled templates are up to date")
+            return 0
+        modules, templates = build(args.templates)
+        print(f"📦 Byte-compiled {modules} modules, precompiled {len(templates)} changed templates "
+              f"({', '.join(templates) or 'none'})")
+        return 0
+
+    medians, slowest = profile(args.runs, args.top)
+    print(f"⏱️  Cold start over {args.runs} fresh processes (median):")
+    for stage, ms in medians.items():
+        print(f"   {stage:<16} {ms:>8.1f} ms")
+    print("📚 Import time by package (self time, median):")
+    for ms, package in slowest:
+        print(f"   {package:<24} {ms:>8.1f} ms")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': args.budget_ms, 'medians': medians,
+                       'imports': {package: ms for ms, package in slowest}}, f, indent=2)
+
+    if medians['cold_start_ms'] > args.budget_ms:
+        print(f"❌ Cold start {medians['cold_start_ms']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        return 1
+    print(f"✅ Cold start {medians['cold_start_ms']:.0f} ms is within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Static export of every report card.
+
+Walks get_classes() -> get_students_by_class() -> get_student_report() and
+renders topic_report.html for every student into a directory tree that
+mirrors the app's URLs, so Vercel, nginx or any static host can serve the
+reports with no Python on the request path:
+
+    <out>/index.html                    class/student lookup page
+    <out>/index.json                    export index (classes, versions, render fingerprints, students)
+    <out>/api/students/<class>          student list used by the lookup page
+    <out>/api/chart-data/<class>/<roll> chart series fetched by each report page
+    <out>/report/<class>/<roll>/index.html
+    <out>/static/...                    copied CSS/JS
+
+Each class is rendered in its own worker process. Re-running the export only
+regenerates classes whose sheet content hash changed since the last run, or
+every class when the report template or the asset build changed (use --force
+to rebuild everything).
+
+Usage:
+    python export_reports.py --out static_export
+    python export_reports.py --out static_export --classes 1B 2A --workers 4
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import app_simple
+from flask import render_template
+
+INDEX_FILE = 'index.json'
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+
+
+def export_class(class_name, data, version, out_dir):
+    """Render every report of one class (runs in a worker process)
+
+    The parent passes the sheet rows it already downloaded, so workers never
+    hit Google and every page matches the version recorded in the index.
+    """
+    connector = app_simple.sheets_connector
+    connector.load_class_sheet(class_name, data, version=version)
+    report_time = datetime.now()
+
+    class_dir = os.path.join(out_dir, 'report', class_name)
+    shutil.rmtree(class_dir, ignore_errors=True)
+
+    students = connector.get_students_by_class(class_name)
+    exported = []
+    with app_simple.app.test_request_context():
+        for student in students:
+            roll_number = student['Roll Number']
+            report = connector.get_student_report(class_name, roll_number)
+            if not report:
+                continue
+            html = render_template('topic_report.html', student=report, report_time=report_time)
+            path = os.path.join('report', class_name, roll_number, 'index.html')
+            _write(os.path.join(out_dir, path), html)
+            chart_data = connector.get_chart_data(class_name, roll_number)
+            if chart_data is not None:
+                _write(os.path.join(out_dir, 'api', 'chart-data', class_name, roll_number),
+                       json.dumps(app_simple.chart_data_payload(class_name, roll_number, chart_data)))
+            exported.append({
+                'Roll Number': roll_number,
+                'Name': student['Name'],
+                'path': '/' + os.path.dirname(path).replace(os.sep, '/')
+            })
+
+    _write(os.path.join(out_dir, 'api', 'students', class_name),
+           json.dumps({'success': True, 'students': students}))
+    return class_name, exported
+
+
+def load_index(out_dir):
+    """The index written by the previous export, or an empty one"""
+    try:
+        with open(os.path.join(out_dir, INDEX_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'classes': {}}
+
+
+def export_all(out_dir, class_names=None, workers=None, force=False):
+    """Export every (changed) class and rewrite the index; returns the index"""
+    connector = app_simple.sheets_connector
+    class_names = class_names or connector.get_classes()
+    previous = load_index(out_dir)
+    # Pages rendered by another template or asset build are stale even when the sheet is not
+    fingerprint = app_simple.render_fingerprint()
+    index = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'classes': dict(previous.get('classes', {}))
+    }
+
+    # Download every sheet once in the parent (in parallel) and work out what changed
+    connector.prefetch_all_classes()
+    jobs = []
+    for class_name in class_names:
+        sheet = connector.describe_sheet(class_name)
+        if sheet is None:
+            print(f"⚠️  Skipping class {class_name}: sheet unavailable")
+            continue
+        old = previous.get('classes', {}).get(class_name)
+        if not force and old and (old.get('version'), old.get('fingerprint')) == (sheet['version'], fingerprint):
+            print(f"⏭️  Class {class_name} unchanged ({sheet['version']})")
+            continue
+        jobs.append((class_name, connector.get_sheet_data_for_class(class_name), sheet['version']))
+
+    started = time.time()
+    if jobs:
+        print(f"🖨️  Exporting {len(jobs)} classes with {workers or os.cpu_count()} workers...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(export_class, class_name, data, version, out_dir): (class_name, version)
+                for class_name, data, version in jobs
+            }
+            for future in as_completed(futures):
+                class_name, version = futures[future]
+                try:
+                    _, students = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to export class {class_name}: {e}")
+                    continue
+                index['classes'][class_name] = {'version': version, 'fingerprint': fingerprint, 'students': students}
+                print(f"✅ Exported {len(students)} reports for class {class_name}")
+
+    # Lookup page and assets so the export works on its own
+    with app_simple.app.test_request_context():
+        _write(os.path.join(out_dir, 'index.html'),
+               render_template('index.html', classes=sorted(index['classes'], key=app_simple.class_sort_key)))
+    shutil.copytree(os.path.join(app_simple.app.root_path, 'static'), os.path.join(out_dir, 'static'), dirs_exist_ok=True)
+    _write(os.path.join(out_dir, INDEX_FILE), json.dumps(index, indent=2))
+
+    total = sum(len(c['students']) for c in index['classes'].values())
+    print(f"📦 Export complete: {total} reports in {len(index['classes'])} classes ({time.time() - started:.1f}s)")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-generate every report card as static HTML')
+    parser.add_argument('--out', default='static_export', help='output directory (default: static_export)')
+    parser.add_argument('--classes', nargs='*', help='only export these classes')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='re-export classes even if their sheet is unchanged')
+    args = parser.parse_args(argv)
+
+    export_all(args.out, class_names=args.classes, workers=args.workers, force=args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Stand-in for Google Sheets' published-CSV endpoint, for load tests and offline runs.
+
+Serves a synthetic sheet (see synthetic_sheets.py) for every class at
+/<class>.csv, with the knobs a load test needs:
+
+    --latency-ms / --jitter-ms   delay before each response (uniform jitter)
+    --error-rate                 share of requests answered with a 500 or 503
+    --change-every               seconds between sheet edits (a few marks change each time)
+
+Responses carry an ETag and If-None-Match is answered with 304, like the real
+endpoint. /_stats returns request counters as JSON.
+
+Usage:
+    python fake_sheets_server.py --port 8765 --latency-ms 150 --jitter-ms 50 --error-rate 0.02
+    SHEETS_BASE_URL=http://127.0.0.1:8765 gunicorn app:app
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import unquote
+
+from synthetic_sheets import generate_class_rows
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_classes():
+    """Class names from sheets.json, so the fake serves the same school as the real config"""
+    try:
+        with open(os.path.join(ROOT, 'sheets.json'), encoding='utf-8') as f:
+            return list(json.load(f).get('classes', {}))
+    except (OSError, ValueError):
+        return ['1B', '2A', '3A']
+
+
+class FakeSheets:
+    """Synthetic class sheets and the failure behaviour to serve them with"""
+    def __init__(self, classes=None, students=40, topics=10, sections=2, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, change_every=0, seed=0):
+        self.classes = set(classes or default_classes())
+        self.students = students
+        self.topics = topics
+        self.sections = sections
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.change_every = change_every
+        self.seed = seed
+        self.started = time.time()
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'ok': 0, 'not_modified': 0, 'errors': 0, 'not_found': 0}
+
+    def count(self, key):
+        with self._lock:
+            self.stats['requests' if key is None else key] += 1
+
+    def generation(self):
+        return int((time.time() - self.started) // self.change_every) if self.change_every > 0 else 0
+
+    def sheet(self, class_name):
+        """(body, etag) of the current version of a class sheet"""
+        key = (class_name, self.generation())
+        cached = self._bodies.get(key)
+        if cached is not None:
+            return cached
+        rows = generate_class_rows(class_name, self.students, self.topics, self.sections, self.seed)
+        if key[1]:
+            # Each generation edits a handful of marks, like teachers updating a live sheet
+            rnd = random.Random(f"{class_name}/{key[1]}")
+            marks_rows = [row for row in rows if row and row[0].isdigit()]
+            for _ in range(5):
+                row = rnd.choice(marks_rows)
+                row[3 + 2 * rnd.randrange(self.topics)] = str(rnd.randint(0, 12))
+        out = StringIO()
+        csv.writer(out, lineterminator='\n').writerows(rows)
+        body = out.getvalue().encode('utf-8')
+        cached = (body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+        with self._lock:
+            # Only the current generation is worth keeping
+            self._bodies = {k: v for k, v in self._bodies.items() if k[1] == key[1]}
+            self._bodies[key] = cached
+        return cached
+
+    def delay(self):
+        latency = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+
+def make_handler(sheets):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b'', headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out and hung up - expected when testing deadlines
+                    self.close_connection = True
+
+        def do_GET(self):
+            path = unquote(self.path.split('?', 1)[0]).strip('/')
+            if path == '_stats':
+                stats = dict(sheets.stats, generation=sheets.generation())
+                return self._send(200, json.dumps(stats).encode('utf-8'), {'Content-Type': 'application/json'})
+
+            sheets.count(None)
+            sheets.delay()
+            class_name = path[:-4] if path.endswith('.csv') else path
+            if class_name not in sheets.classes:
+                sheets.count('not_found')
+                return self._send(404, b'Not found')
+            if sheets.error_rate and random.random() < sheets.error_rate:
+                sheets.count('errors')
+                return self._send(random.choice((500, 503)), b'Upstream error')
+
+            body, etag = sheets.sheet(class_name)
+            if self.headers.get('If-None-Match') == etag:
+                sheets.count('not_modified')
+                return self._send(304, headers={'ETag': etag})
+            sheets.count('ok')
+            self._send(200, body, {'Content-Type': 'text/csv; charset=utf-8', 'ETag': etag})
+
+    return Handler
+
+
+def serve(port=8765, host='127.0.0.1', **config):
+    """Start the fake on a daemon thread; returns (server, FakeSheets)"""
+    sheets = FakeSheets(**config)
+    server = ThreadingHTTPServer((host, port), make_handler(sheets))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-sheets', daemon=True).start()
+    return server, sheets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve synthetic class sheets like the published-CSV endpoint')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--classes', nargs='*', help='class names (default: the classes in sheets.json)')
+    parser.add_argument('--students', type=int, default=40)
+    parser.add_argument('--topics', type=int, default=10)
+    parser.add_argument('--sections', type=int, default=2)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 500/503')
+    parser.add_argument('--change-every', type=float, default=0, help='seconds between sheet edits (0: never)')
+    args = parser.parse_args(argv)
+
+    server, _ = serve(args.port, args.host, classes=args.classes, students=args.students, topics=args.topics,
+                      sections=args.sections, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      error_rate=args.error_rate, change_every=args.change_every)
+    print(f"🧪 Fake sheets on http://{args.host}:{args.port} (latency {args.latency_ms:g}±{args.jitter_ms:g} ms, "
+          f"errors {args.error_rate:.0%})", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
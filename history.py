@@ -0,0 +1,187 @@
+"""Every recorded marks cell across sheet versions, for progress over time"""
+import bisect
+import sqlite3
+import threading
+
+from sheet_model import _round
+
+
+class HistoryStore:
+    """Append-only SQLite history of every marks cell across sheet versions
+
+    Topic names are stored once per class and referenced by id, and a cell is
+    only written when its marks or time category differ from the last recorded
+    version, so weekly snapshots over years stay small. Cells are clustered by
+    (class, roll) for per-student trends, with a second index on (class, topic).
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._topic_ids = {}    # (class, subject, topic) -> topic_id
+        self._state = {}        # class -> (last version_id, {(roll, topic_id): (marks, time category)})
+        with self._connect() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS history_versions (
+                    version_id INTEGER PRIMARY KEY,
+                    class_name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    UNIQUE (class_name, version)
+                );
+                CREATE TABLE IF NOT EXISTS history_topics (
+                    topic_id INTEGER PRIMARY KEY,
+                    class_name TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    UNIQUE (class_name, subject, topic)
+                );
+                CREATE TABLE IF NOT EXISTS history_cells (
+                    class_name TEXT NOT NULL,
+                    roll TEXT NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    version_id INTEGER NOT NULL,
+                    marks REAL,
+                    time_category TEXT NOT NULL,
+                    PRIMARY KEY (class_name, roll, topic_id, version_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS history_cells_topic ON history_cells (class_name, topic_id, version_id);
+            ''')
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+    
+    def _topic_id(self, conn, class_name, subject, topic):
+        key = (class_name, subject, topic)
+        topic_id = self._topic_ids.get(key)
+        if topic_id is None:
+            conn.execute('INSERT OR IGNORE INTO history_topics (class_name, subject, topic) VALUES (?, ?, ?)', key)
+            topic_id = self._topic_ids[key] = conn.execute(
+                'SELECT topic_id FROM history_topics WHERE class_name = ? AND subject = ? AND topic = ?', key
+            ).fetchone()[0]
+        return topic_id
+    
+    def _last_state(self, conn, class_name):
+        """Cells as of the newest recorded version of a class (cached between appends)"""
+        last_version = conn.execute(
+            'SELECT MAX(version_id) FROM history_versions WHERE class_name = ?', (class_name,)
+        ).fetchone()[0]
+        cached = self._state.get(class_name)
+        if cached is not None and cached[0] == last_version:
+            return cached[1]
+        # Another process appended since (or first use): replay the deltas
+        state = {}
+        for roll, topic_id, marks, time_category in conn.execute(
+                'SELECT roll, topic_id, marks, time_category FROM history_cells WHERE class_name = ? ORDER BY version_id',
+                (class_name,)):
+            state[(roll, topic_id)] = (marks, time_category)
+        return {key: value for key, value in state.items() if value != (None, '')}
+    
+    def append(self, class_name, model, version, recorded_at):
+        """Record one sheet version; returns the number of cells written (0 if already recorded)"""
+        with self._lock:
+            conn = self._connect()
+            conn.isolation_level = None
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                previous = self._last_state(conn, class_name)
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO history_versions (class_name, version, recorded_at) VALUES (?, ?, ?)',
+                    (class_name, version, recorded_at)
+                )
+                if cursor.rowcount == 0:
+                    conn.execute('ROLLBACK')
+                    return 0
+                version_id = cursor.lastrowid
+                
+                current = {}
+                for section in model.sections:
+                    topic_ids = [self._topic_id(conn, class_name, section.name, topic) for topic in section.topics]
+                    for roll, marks_row, times_row in zip(section.rolls, section.marks, section.times):
+                        for topic_id, marks, time_category in zip(topic_ids, marks_row, times_row):
+                            if marks is not None or time_category:
+                                current[(roll, topic_id)] = (marks, time_category)
+                
+                cells = [(class_name, roll, topic_id, version_id, marks, time_category)
+                         for (roll, topic_id), (marks, time_category) in current.items()
+                         if previous.get((roll, topic_id)) != (marks, time_category)]
+                # Cells that were cleared (or students who left) are closed with an empty value
+                cells.extend((class_name, roll, topic_id, version_id, None, '')
+                             for roll, topic_id in previous.keys() - current.keys())
+                conn.executemany('INSERT INTO history_cells VALUES (?, ?, ?, ?, ?, ?)', cells)
+                conn.execute('COMMIT')
+                self._state[class_name] = (version_id, current)
+                return len(cells)
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                # The topic ids looked up in this transaction may have been rolled back
+                self._topic_ids.clear()
+                raise
+            finally:
+                conn.close()
+    
+    def student_history(self, class_name, roll_number, since=None):
+        """Trend series of one student, or None if the class has no history
+
+        Returns {'versions': n, 'first_recorded': ts, 'last_recorded': ts,
+        'subjects': {subject: {'topics': {topic: [[ts, marks, time], ...]},
+        'average': [[ts, average percentage], ...]}}}. Topic points are only
+        emitted when a value changed.
+        """
+        with self._connect() as conn:
+            versions = conn.execute(
+                'SELECT COUNT(*), MIN(recorded_at), MAX(recorded_at) FROM history_versions WHERE class_name = ?',
+                (class_name,)
+            ).fetchone()
+            if not versions[0]:
+                return None
+            cells = conn.execute('''
+                SELECT t.subject, t.topic, v.recorded_at, c.marks, c.time_category
+                FROM history_cells c
+                JOIN history_versions v ON v.version_id = c.version_id
+                JOIN history_topics t ON t.topic_id = c.topic_id
+                WHERE c.class_name = ? AND c.roll = ?
+                ORDER BY c.topic_id, c.version_id
+            ''', (class_name, str(roll_number))).fetchall()
+        
+        subjects = {}
+        for subject, topic, recorded_at, marks, time_category in cells:
+            topics = subjects.setdefault(subject, {'topics': {}, 'average': []})['topics']
+            topics.setdefault(topic, []).append([recorded_at, marks, time_category])
+        
+        for subject in subjects.values():
+            # Subject average after every change, carrying unchanged topics forward
+            latest = {}
+            events = sorted((point[0], topic, point[1]) for topic, points in subject['topics'].items() for point in points)
+            for recorded_at, topic, marks in events:
+                latest[topic] = marks
+                marked = [value for value in latest.values() if value is not None]
+                average = _round(sum(marked) / len(marked) / 12 * 100) if marked else None
+                if subject['average'] and subject['average'][-1][0] == recorded_at:
+                    subject['average'][-1][1] = average
+                else:
+                    subject['average'].append([recorded_at, average])
+            if since is not None:
+                for topic, points in subject['topics'].items():
+                    subject['topics'][topic] = _points_since(points, since)
+                subject['average'] = _points_since(subject['average'], since)
+        
+        return {
+            'versions': versions[0],
+            'first_recorded': versions[1],
+            'last_recorded': versions[2],
+            'subjects': subjects
+        }
+    
+    def classes(self):
+        """Classes that have recorded history"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT DISTINCT class_name FROM history_versions')]
+
+
+def _points_since(points, since):
+    """[ts, ...] points from ``since`` on, keeping the value in effect at ``since`` as the first point"""
+    start = bisect.bisect_right([point[0] for point in points], since)
+    return points[start - 1:] if start else points
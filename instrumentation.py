@@ -0,0 +1,111 @@
+"""In-process metrics for the report pipeline, exported at /metrics in Prometheus text format"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('student_report')
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms, rendered in Prometheus text format"""
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}     # (name, labels) -> value
+        self._histograms = {}   # (name, labels) -> [count per bucket..., sum, count]
+        self._help = {}
+        self._collectors = []
+    
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+    
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+    
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time a block of work as one observation of report_stage_duration_seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('report_stage_duration_seconds', time.perf_counter() - started, stage=stage, **labels)
+    
+    def add_collector(self, collector):
+        """Register fn() -> [(name, type, help, [(labels, value), ...]), ...] evaluated at scrape time"""
+        self._collectors.append(collector)
+    
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ''
+        escaped = (
+            '%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in labels
+        )
+        return '{' + ','.join(escaped) + '}'
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{self._labels(labels)} {value}")
+        
+        for (name, labels), state in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+            for bound, count in zip(self.buckets, state):
+                lines.append(f"{name}_bucket{self._labels(labels + (('le', repr(float(bound))),))} {count}")
+            lines.append(f"{name}_bucket{self._labels(labels + (('le', '+Inf'),))} {state[-1]}")
+            lines.append(f"{name}_sum{self._labels(labels)} {state[-2]}")
+            lines.append(f"{name}_count{self._labels(labels)} {state[-1]}")
+        
+        for collector in self._collectors:
+            try:
+                collected = collector()
+            except Exception as e:
+                logger.error("Error collecting metrics: %s", e)
+                continue
+            for name, metric_type, help_text, samples in collected:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{self._labels(tuple(sorted(labels.items())))} {value}")
+        
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+metrics.describe('report_stage_duration_seconds', 'Time spent in each stage of the report pipeline')
+metrics.describe('sheet_fetch_responses_total', 'Upstream sheet responses by HTTP status')
+metrics.describe('sheet_fetch_failures_total', 'Sheet fetches that produced no new data, by reason')
+metrics.describe('http_responses_total', 'Responses served by this app by endpoint and status')
+metrics.describe('http_request_duration_seconds', 'Time to produce each response, by endpoint')
@@ -0,0 +1,27 @@
+"""Heavy modules imported on first use, so importing the app stays cheap"""
+import importlib
+
+
+class _LazyModule:
+    """A heavy module that is only imported on first attribute access
+
+    pandas, numpy, requests and asyncio account for most of the import time of
+    this file; deferring them keeps a cold start (e.g. a serverless function
+    that only serves the index page) from paying for them before a request
+    needs them.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+
+np = _LazyModule('numpy')
+pd = _LazyModule('pandas')
+requests = _LazyModule('requests')
+asyncio = _LazyModule('asyncio')
@@ -0,0 +1,262 @@
+"""Concurrent load driver for the report app, end to end.
+
+Sends a weighted mix of requests from many threads for a fixed duration and
+reports throughput and p50/p95/p99 latency per endpoint:
+
+    index           /
+    students        /api/students/<class>
+    report          /report/<class>/<roll>
+    student_report  /api/student-report/<class>/<roll>
+
+With --spawn it first starts fake_sheets_server.py and the app under
+gunicorn (or the threaded Werkzeug server with --server werkzeug) pointed at
+the fake through SHEETS_BASE_URL, so capacity can be measured without
+touching Google. Otherwise it drives an app that is already running (--url).
+
+Usage:
+    python load_test.py --spawn --workers 4 --threads 8 --concurrency 32 --duration 30
+    python load_test.py --spawn --fake-latency-ms 300 --fake-error-rate 0.05 --output load.json
+    python load_test.py --url http://127.0.0.1:8000 --mix report=8,index=1
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import requests
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MIX = {'index': 1, 'students': 2, 'report': 5, 'student_report': 2}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url, process, log_path, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode} (see {log_path})")
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s (see {log_path})")
+
+
+@contextmanager
+def spawned_stack(args):
+    """Run the fake sheets server and the app in subprocesses; yields (app URL, fake URL)"""
+    fake_port, app_port = _free_port(), _free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    data_dir = tempfile.mkdtemp(prefix='load-test-')
+    env = dict(os.environ,
+               SHEETS_BASE_URL=fake_url,
+               SHEET_SNAPSHOT_PATH=os.path.join(data_dir, 'snapshots.sqlite3'),
+               SHEET_HISTORY_PATH=os.path.join(data_dir, 'history.sqlite3'),
+               LOG_LEVEL=os.environ.get('LOG_LEVEL', 'WARNING'))
+    fake_cmd = [sys.executable, os.path.join(ROOT, 'fake_sheets_server.py'), '--port', str(fake_port),
+                '--students', str(args.students), '--topics', str(args.topics),
+                '--latency-ms', str(args.fake_latency_ms), '--jitter-ms', str(args.fake_jitter_ms),
+                '--error-rate', str(args.fake_error_rate), '--change-every', str(args.fake_change_every)]
+    if args.server == 'gunicorn':
+        app_cmd = [sys.executable, '-m', 'gunicorn', '--bind', f"127.0.0.1:{app_port}", '--workers', str(args.workers),
+                   '--worker-class', 'gthread', '--threads', str(args.threads), '--log-level', 'warning', 'app:app']
+    else:
+        app_cmd = [sys.executable, '-c',
+                   f"import app_simple; app_simple.app.run(host='127.0.0.1', port={app_port}, threaded=True)"]
+
+    log_path = os.path.join(data_dir, 'server.log')
+    processes = []
+    with open(log_path, 'ab') as log:
+        try:
+            processes.append(subprocess.Popen(fake_cmd, cwd=ROOT, env=env, stdout=log, stderr=log))
+            _wait_until_up(f"{fake_url}/_stats", processes[0], log_path)
+            processes.append(subprocess.Popen(app_cmd, cwd=ROOT, env=env, stdout=log, stderr=log))
+            _wait_until_up(f"{app_url}/api/classes", processes[1], log_path)
+            print(f"🧪 Fake sheets at {fake_url}, app ({args.server}) at {app_url} (logs in {log_path})")
+            yield app_url, fake_url
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def discover(base_url):
+    """{class: [roll numbers]} as the app lists them"""
+    session = requests.Session()
+    classes = session.get(f"{base_url}/api/classes", timeout=30).json().get('classes', [])
+    rolls = {}
+    for class_name in classes:
+        students = session.get(f"{base_url}/api/students/{quote(class_name)}", timeout=60).json().get('students', [])
+        if students:
+            rolls[class_name] = [student['Roll Number'] for student in students]
+    return rolls
+
+
+def _paths(kind, rolls, rnd):
+    class_name = rnd.choice(list(rolls))
+    roll = rnd.choice(rolls[class_name])
+    return {
+        'index': '/',
+        'students': f"/api/students/{quote(class_name)}",
+        'report': f"/report/{quote(class_name)}/{quote(roll)}",
+        'student_report': f"/api/student-report/{quote(class_name)}/{quote(roll)}",
+    }[kind]
+
+
+def drive(base_url, rolls, mix, concurrency=16, duration=30, timeout=30, seed=0):
+    """Run the load; returns {endpoint: [(seconds, ok)]} and the wall time it took"""
+    kinds, weights = zip(*mix.items())
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(index):
+        rnd = random.Random(f"{seed}/{index}")
+        session = requests.Session()
+        local = defaultdict(list)
+        while time.perf_counter() < stop_at:
+            kind = rnd.choices(kinds, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + _paths(kind, rolls, rnd), timeout=timeout)
+                ok = response.status_code < 500
+            except requests.RequestException:
+                ok = False
+            local[kind].append((time.perf_counter() - started, ok))
+        with lock:
+            for kind, values in local.items():
+                samples[kind].extend(values)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarise(samples, elapsed):
+    """Throughput, error count and latency percentiles (ms) per endpoint and overall"""
+    summary = {}
+    everything = []
+    for kind, values in sorted(samples.items()):
+        everything.extend(values)
+        summary[kind] = _summary(values, elapsed)
+    summary['total'] = _summary(everything, elapsed)
+    return summary
+
+
+def _summary(values, elapsed):
+    latencies = sorted(seconds * 1000 for seconds, _ in values)
+    return {
+        'requests': len(values),
+        'errors': sum(1 for _, ok in values if not ok),
+        'rps': round(len(values) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(_percentile(latencies, 50), 1),
+        'p95_ms': round(_percentile(latencies, 95), 1),
+        'p99_ms': round(_percentile(latencies, 99), 1),
+        'max_ms': round(latencies[-1], 1) if latencies else 0.0,
+    }
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {kind!r} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def run(args, base_url, fake_url=None):
+    rolls = discover(base_url)
+    if not rolls:
+        raise RuntimeError(f"{base_url} lists no classes with students")
+    print(f"🔥 {args.concurrency} clients for {args.duration:g}s against {len(rolls)} classes "
+          f"({sum(len(r) for r in rolls.values())} students)")
+    samples, elapsed = drive(base_url, rolls, args.mix, args.concurrency, args.duration, seed=args.seed)
+    summary = summarise(samples, elapsed)
+
+    print(f"\n{'endpoint':<16} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for kind, row in summary.items():
+        print(f"{kind:<16} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8} {row['p50_ms']:>8} "
+              f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}")
+
+    upstream = None
+    if fake_url:
+        upstream = requests.get(f"{fake_url}/_stats", timeout=5).json()
+        print(f"\n📡 Upstream: {upstream['requests']} sheet requests ({upstream['ok']} full, "
+              f"{upstream['not_modified']} not modified, {upstream['errors']} failed)")
+    return {'config': {key: value for key, value in vars(args).items() if key != 'func'},
+            'summary': summary, 'upstream': upstream}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the report app and report latency percentiles')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='app to drive (ignored with --spawn)')
+    parser.add_argument('--spawn', action='store_true', help='start the fake sheets server and the app first')
+    parser.add_argument('--server', choices=('gunicorn', 'werkzeug'), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads per gunicorn worker')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load')
+    parser.add_argument('--mix', type=_parse_mix, default=dict(DEFAULT_MIX),
+                        help='endpoint weights, e.g. report=5,students=2,index=1,student_report=2')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--students', type=int, default=40, help='students per class in the fake sheets')
+    parser.add_argument('--topics', type=int, default=10, help='topics per subject in the fake sheets')
+    parser.add_argument('--fake-latency-ms', type=float, default=100)
+    parser.add_argument('--fake-jitter-ms', type=float, default=50)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--fake-change-every', type=float, default=0, help='seconds between fake sheet edits')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.spawn:
+            with spawned_stack(args) as (base_url, fake_url):
+                result = run(args, base_url, fake_url)
+        else:
+            result = run(args, args.url.rstrip('/'))
+    except Exception as e:
+        print(f"❌ Load test failed: {e}")
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Rendered report pages kept compressed, with the validators for 304 responses"""
+import gzip
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import Response
+
+from sheet_model import sheet_version
+
+try:
+    import brotli
+except ImportError:  # brotli is optional - reports are still served gzip-compressed
+    brotli = None
+
+
+class RenderedReport:
+    """A rendered report page with precompressed variants and its HTTP validators
+
+    The bytes are the same for every reader (the page shows the time it is
+    viewed at in the browser), so every variant is compressed once.
+    """
+    def __init__(self, html, etag, last_modified):
+        self.identity = html.encode('utf-8')
+        self.gzip = gzip.compress(self.identity, compresslevel=6)
+        self.brotli = brotli.compress(self.identity) if brotli is not None else None
+        self.etag = etag
+        self.last_modified = last_modified
+    
+    def to_response(self, req, cache_control):
+        """Build the response for a request, answering 304 when its validators still match"""
+        response = Response(mimetype='text/html')
+        response.set_etag(self.etag, weak=True)
+        response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        
+        not_modified = req.if_none_match.contains_weak(self.etag) if req.if_none_match else \
+            (req.if_modified_since is not None and req.if_modified_since >= self.last_modified.replace(microsecond=0))
+        if not_modified:
+            response.status_code = 304
+            return response
+        
+        if self.brotli is not None and req.accept_encodings['br']:
+            response.set_data(self.brotli)
+            response.headers['Content-Encoding'] = 'br'
+        elif req.accept_encodings['gzip']:
+            response.set_data(self.gzip)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response.set_data(self.identity)
+        return response
+
+
+class RenderedReportCache:
+    """LRU cache of rendered report pages keyed by (class, roll number, report revision)
+
+    The revision is the sheet version the student's report last changed in,
+    so editing one student's marks only invalidates the pages that changed.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+    
+    def get(self, class_name, roll_number, version):
+        with self._lock:
+            rendered = self._entries.get((class_name, str(roll_number), version))
+            if rendered is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end((class_name, str(roll_number), version))
+            self._stats['hits'] += 1
+            return rendered
+    
+    def put(self, class_name, roll_number, version, html, downloaded_at):
+        """Compress and store a freshly rendered page"""
+        rendered = RenderedReport(
+            html,
+            etag=sheet_version(f"{class_name}/{roll_number}/{version}"),
+            last_modified=datetime.fromtimestamp(downloaded_at, tz=timezone.utc)
+        )
+        with self._lock:
+            self._entries[(class_name, str(roll_number), version)] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+    
+    def invalidate(self, class_name=None, rolls=None):
+        """Drop the cached pages of some students of a class, every page of a class, or everything"""
+        with self._lock:
+            stale = [key for key in self._entries
+                     if (class_name is None or key[0] == class_name) and (rolls is None or key[1] in rolls)]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
@@ -0,0 +1,162 @@
+"""Batch print export of report cards.
+
+Renders topic_report.html for every student of the chosen classes (or the
+whole school) into one print-ready artifact: a multi-page HTML document with
+one report per sheet of paper, optionally converted to PDF with a renderer
+installed on this machine (WeasyPrint, wkhtmltopdf or headless Chromium).
+
+Each class is rendered in its own worker process and streamed to a part file,
+so memory stays bounded by one class per worker; the parts are then joined in
+class order. A single class is also available from the running app at
+/print/<class>.
+
+Usage:
+    python print_export.py --out reports.html
+    python print_export.py --grade 7 --out grade7.html --pdf grade7.pdf
+    python print_export.py --classes 1B 2A --workers 4
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import app_simple
+
+try:
+    import weasyprint
+except ImportError:
+    weasyprint = None
+
+PDF_BROWSERS = ('chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable')
+
+
+def render_class_part(class_name, data, version, part_path):
+    """Write the print pages of one class to ``part_path`` (runs in a worker process)
+
+    Returns (page head, number of reports). The parent passes the rows it
+    already downloaded, so every worker renders the same sheet version.
+    """
+    connector = app_simple.sheets_connector
+    connector.load_class_sheet(class_name, data, version=version)
+    head, count = None, 0
+    with app_simple.app.test_request_context(), open(part_path, 'w', encoding='utf-8') as part:
+        for page_head, body in app_simple.iter_print_pages(connector, class_name):
+            head = head or page_head
+            part.write(body)
+            count += 1
+    return head, count
+
+
+def write_pdf(html_path, pdf_path):
+    """Convert the print document with the first local renderer available; returns its name"""
+    if weasyprint is not None:
+        weasyprint.HTML(filename=html_path).write_pdf(pdf_path)
+        return 'weasyprint'
+    wkhtmltopdf = shutil.which('wkhtmltopdf')
+    if wkhtmltopdf:
+        subprocess.run([wkhtmltopdf, '--quiet', '--print-media-type', html_path, pdf_path], check=True)
+        return 'wkhtmltopdf'
+    for name in PDF_BROWSERS:
+        browser = shutil.which(name)
+        if browser:
+            subprocess.run([browser, '--headless', '--disable-gpu', '--no-pdf-header-footer',
+                            f'--print-to-pdf={os.path.abspath(pdf_path)}',
+                            'file://' + os.path.abspath(html_path)], check=True, capture_output=True)
+            return name
+    raise RuntimeError('No local PDF renderer found: install weasyprint, wkhtmltopdf or Chromium')
+
+
+def select_classes(connector, classes=None, grade=None):
+    """Requested classes in school order (all of them by default)"""
+    selected = classes or connector.get_classes()
+    if grade is not None:
+        selected = [c for c in selected if app_simple.class_sort_key(c)[0] == grade]
+    return sorted(selected, key=app_simple.class_sort_key)
+
+
+def export_print(out_path, class_names, workers=None, pdf_path=None, progress=print):
+    """Render every report of ``class_names`` into one document at ``out_path``
+
+    ``progress`` is called with a message as each class finishes. Returns
+    {class_name: number of reports}.
+    """
+    connector = app_simple.sheets_connector
+    connector.prefetch_all_classes()
+    jobs = []
+    for class_name in class_names:
+        sheet = connector.describe_sheet(class_name)
+        if sheet is None:
+            progress(f"⚠️  Skipping class {class_name}: sheet unavailable")
+            continue
+        jobs.append((class_name, connector.get_sheet_data_for_class(class_name), sheet['version']))
+
+    started = time.time()
+    counts, heads = {}, {}
+    with tempfile.TemporaryDirectory(prefix='print-export-') as parts_dir:
+        parts = {class_name: os.path.join(parts_dir, f"{index:03d}.html") for index, (class_name, _, _) in enumerate(jobs)}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_class_part, class_name, data, version, parts[class_name]): class_name
+                for class_name, data, version in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                class_name = futures[future]
+                try:
+                    heads[class_name], counts[class_name] = future.result()
+                except Exception as e:
+                    progress(f"❌ [{done}/{len(jobs)}] Failed to render class {class_name}: {e}")
+                    continue
+                progress(f"🖨️  [{done}/{len(jobs)}] Class {class_name}: {counts[class_name]} reports "
+                         f"({sum(counts.values())} so far, {time.time() - started:.1f}s)")
+
+        head = next((heads[c] for c, _, _ in jobs if heads.get(c)), None)
+        if head is None:
+            raise RuntimeError('No reports were rendered')
+
+        # Join the parts in class order without loading them into memory
+        title = f"Student Reports - {datetime.now().strftime('%B %d, %Y')}"
+        with open(out_path, 'w', encoding='utf-8') as out:
+            with app_simple.app.test_request_context():
+                out.write(app_simple.print_document_start(head, title, inline_static=True))
+            for class_name, _, _ in jobs:
+                if counts.get(class_name):
+                    with open(parts[class_name], encoding='utf-8') as part:
+                        shutil.copyfileobj(part, out)
+            out.write(app_simple.PRINT_DOCUMENT_END)
+
+    total = sum(counts.values())
+    progress(f"📄 Wrote {total} reports from {len(counts)} classes to {out_path} ({time.time() - started:.1f}s)")
+    if pdf_path:
+        renderer = write_pdf(out_path, pdf_path)
+        progress(f"📄 Wrote {pdf_path} with {renderer}")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render report cards into one print-ready document')
+    parser.add_argument('--out', default='report_cards.html', help='multi-page HTML output (default: report_cards.html)')
+    parser.add_argument('--pdf', help='also convert the document to this PDF with a local renderer')
+    parser.add_argument('--classes', nargs='*', help='only these classes (default: every class)')
+    parser.add_argument('--grade', type=int, help='only the classes of this grade, e.g. 7 for 7A and 7B')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    class_names = select_classes(app_simple.sheets_connector, args.classes, args.grade)
+    if not class_names:
+        print("⚠️  No classes selected")
+        return 1
+    try:
+        export_print(args.out, class_names, workers=args.workers, pdf_path=args.pdf)
+    except Exception as e:
+        print(f"❌ Print export failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Keeping slow or failing sheet downloads inside a request's deadline: retries, hedging, circuit breaking"""
+import contextvars
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+logger = logging.getLogger('student_report')
+
+
+# Returned by a source when the sheet cannot be read and asking again will not help
+# (e.g. HTTP 404 or 403): not retried, and not held against the circuit breaker
+PERMANENT_FAILURE = object()
+
+# Deadline of the request being served on this thread (None outside requests)
+_current_deadline = contextvars.ContextVar('sheet_deadline', default=None)
+
+
+class Deadline:
+    """The point in time by which a request needs its sheet data"""
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def current_deadline():
+    """Deadline of the current request, or None when there is no time limit"""
+    return _current_deadline.get()
+
+
+def set_request_deadline(seconds):
+    """Bound every sheet fetch made from now on (on this thread) to ``seconds`` in total; 0 lifts it"""
+    _current_deadline.set(Deadline(seconds) if seconds and seconds > 0 else None)
+
+
+class FetchPolicy:
+    """How one sheet download is attempted: bounded retries with jitter and optional hedging
+
+    A failed attempt is retried up to ``retries`` times after a "full jitter"
+    pause (uniform between 0 and ``backoff * 2**attempt``, capped at
+    ``max_backoff``), as long as the deadline leaves time for it. With
+    ``hedge_percentile`` set, an attempt still running after that percentile
+    of recent successful attempts is raced by a second one and the first
+    answer wins, which trims the tail when Google stalls a single connection.
+    """
+    MIN_ATTEMPT = 0.05   # Seconds of deadline worth starting an attempt with
+    
+    def __init__(self, retries=2, backoff=0.25, max_backoff=2.0, hedge_percentile=None,
+                 hedge_min_samples=20, window=200):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._stats = {'attempts': 0, 'retries': 0, 'failures': 0, 'hedges': 0, 'hedge_wins': 0,
+                       'deadline_exceeded': 0}
+    
+    @classmethod
+    def from_env(cls):
+        return cls(
+            retries=int(os.environ.get('SHEET_FETCH_RETRIES', 2)),
+            backoff=float(os.environ.get('SHEET_RETRY_BACKOFF', 0.25)),
+            max_backoff=float(os.environ.get('SHEET_RETRY_MAX_BACKOFF', 2.0)),
+            hedge_percentile=float(os.environ.get('SHEET_HEDGE_PERCENTILE', 0)) or None
+        )
+    
+    def record(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+    
+    def budget(self, timeout):
+        """Longest a run without a deadline can take"""
+        return (self.retries + 1) * timeout + self.retries * self.max_backoff
+    
+    def latency_percentile(self, pct):
+        """Seconds under which ``pct`` percent of recent successful attempts finished, or None"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+    
+    def hedge_delay(self):
+        """Seconds after which a slow attempt is hedged, or None while hedging is off or uncalibrated"""
+        if not self.hedge_percentile:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+        return self.latency_percentile(self.hedge_percentile)
+    
+    def run(self, attempt, deadline=None, timeout=10, executor=None):
+        """Call ``attempt(timeout)`` until it returns something other than None
+
+        Returns (result, attempts made); no attempt is made once the deadline
+        has (nearly) passed. PERMANENT_FAILURE ends the run straight away.
+        """
+        for number in range(self.retries + 1):
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None and remaining < self.MIN_ATTEMPT:
+                self.record('deadline_exceeded')
+                return None, number
+            if number:
+                self.record('retries')
+            result = self._attempt(attempt, timeout if remaining is None else min(timeout, remaining), executor)
+            if result is not None:
+                return result, number + 1
+            self.record('failures')
+            if number < self.retries:
+                pause = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** number))
+                if deadline is not None:
+                    pause = min(pause, deadline.remaining())
+                time.sleep(pause)
+        return None, self.retries + 1
+    
+    def _timed(self, attempt, timeout):
+        self.record('attempts')
+        started = time.perf_counter()
+        try:
+            result = attempt(timeout)
+        except Exception as e:
+            logger.error("Error in sheet fetch attempt: %s", e)
+            return None
+        if result is not None and result is not PERMANENT_FAILURE:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+        return result
+    
+    def _attempt(self, attempt, timeout, executor):
+        hedge_after = self.hedge_delay()
+        if hedge_after is None or executor is None or hedge_after >= timeout:
+            return self._timed(attempt, timeout)
+        
+        expires_at = time.monotonic() + timeout
+        first = executor.submit(self._timed, attempt, timeout)
+        done, _ = wait([first], timeout=hedge_after)
+        if done:
+            return first.result()
+        
+        self.record('hedges')
+        hedge = executor.submit(self._timed, attempt, max(self.MIN_ATTEMPT, expires_at - time.monotonic()))
+        pending = {first, hedge}
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, expires_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    if future is hedge:
+                        self.record('hedge_wins')
+                    return result
+        return None
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['latency_samples'] = len(self._latencies)
+        for pct in (50, 95, 99):
+            latency = self.latency_percentile(pct)
+            stats[f"latency_p{pct}_ms"] = round(latency * 1000, 1) if latency is not None else None
+        hedge_after = self.hedge_delay()
+        stats['retries_allowed'] = self.retries
+        stats['hedge_percentile'] = self.hedge_percentile
+        stats['hedge_after_ms'] = round(hedge_after * 1000, 1) if hedge_after is not None else None
+        return stats
+
+
+class CircuitBreaker:
+    """Per-class circuit breaker around sheet downloads
+
+    After ``failure_threshold`` failed downloads in a row a class is "open":
+    requests stop waiting on Google and serve the last good copy straight
+    away. After ``reset_timeout`` seconds one trial download is let through
+    ("half open"); success closes the circuit, failure opens it again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}   # class -> {'state', 'failures', 'opened_at', 'trial'}
+        self._lock = threading.Lock()
+        self._stats = {'opened': 0, 'short_circuited': 0}
+    
+    @classmethod
+    def from_env(cls):
+        return cls(failure_threshold=int(os.environ.get('SHEET_BREAKER_FAILURES', 5)),
+                   reset_timeout=float(os.environ.get('SHEET_BREAKER_RESET', 30)))
+    
+    def _circuit(self, class_name):
+        circuit = self._circuits.get(class_name)
+        if circuit is None:
+            circuit = self._circuits[class_name] = {'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0,
+                                                    'trial': False}
+        return circuit
+    
+    def acquire(self, class_name):
+        """CLOSED to download, HALF_OPEN to download as the single trial, OPEN to fail fast"""
+        with self._lock:
+            circuit = self._circuit(class_name)
+            if circuit['state'] == self.CLOSED:
+                return self.CLOSED
+            if circuit['state'] == self.OPEN and time.time() - circuit['opened_at'] >= self.reset_timeout:
+                circuit['state'] = self.HALF_OPEN
+            if circuit['state'] == self.HALF_OPEN and not circuit['trial']:
+                circuit['trial'] = True
+                return self.HALF_OPEN
+            self._stats['short_circuited'] += 1
+            return self.OPEN
+    
+    def release(self, class_name):
+        """Give up a trial without a verdict (e.g. the request ran out of time before trying)"""
+        with self._lock:
+            self._circuit(class_name)['trial'] = False
+    
+    def record_success(self, class_name):
+        with self._lock:
+            circuit = self._circuit(class_name)
+            if circuit['state'] != self.CLOSED:
+                logger.info("🟢 Sheet circuit for class %s closed again", class_name)
+            circuit.update(state=self.CLOSED, failures=0, trial=False)
+    
+    def record_failure(self, class_name):
+        with self._lock:
+            circuit = self._circuit(class_name)
+            circuit['failures'] += 1
+            circuit['trial'] = False
+            if circuit['state'] == self.HALF_OPEN or circuit['failures'] >= self.failure_threshold:
+                if circuit['state'] != self.OPEN:
+                    self._stats['opened'] += 1
+                    logger.warning("🔴 Sheet circuit for class %s open after %d failed downloads, serving last good data",
+                                   class_name, circuit['failures'])
+                circuit.update(state=self.OPEN, opened_at=time.time())
+    
+    def state(self, class_name):
+        """Current state of a class's circuit (an open one reads as half open once a trial is due)"""
+        with self._lock:
+            circuit = self._circuits.get(class_name)
+            if circuit is None:
+                return self.CLOSED
+            if circuit['state'] == self.OPEN and time.time() - circuit['opened_at'] >= self.reset_timeout:
+                return self.HALF_OPEN
+            return circuit['state']
+    
+    def retry_in(self, class_name):
+        """Seconds until an open circuit lets a trial through (0 when closed)"""
+        with self._lock:
+            circuit = self._circuits.get(class_name)
+            if circuit is None or circuit['state'] == self.CLOSED:
+                return 0
+            return max(0, math.ceil(circuit['opened_at'] + self.reset_timeout - time.time()))
+    
+    def get_stats(self):
+        with self._lock:
+            circuits = {
+                class_name: {'failures': circuit['failures']}
+                for class_name, circuit in self._circuits.items()
+                if circuit['state'] != self.CLOSED or circuit['failures']
+            }
+            stats = dict(self._stats)
+        for class_name, circuit in circuits.items():
+            circuit['state'] = self.state(class_name)
+            circuit['retry_in'] = self.retry_in(class_name)
+        stats.update(circuits=circuits, failure_threshold=self.failure_threshold, reset_timeout=self.reset_timeout,
+                     open=sum(1 for circuit in circuits.values() if circuit['state'] != self.CLOSED))
+        return stats
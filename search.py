@@ -0,0 +1,148 @@
+"""School-wide student search by name or by class and roll number"""
+import bisect
+import heapq
+import math
+import re
+import threading
+
+from sheet_model import class_sort_key
+
+
+def _normalise_name(text):
+    """Case-folded name with collapsed whitespace, as indexed and searched"""
+    return ' '.join(str(text).casefold().split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class StudentSearchIndex:
+    """School-wide student lookup: name prefixes, name trigrams and exact class + roll number
+
+    Every class is indexed on its own, so a changed sheet only re-indexes that
+    class; the merged, sorted name-token list that prefix lookups bisect into
+    is then rebuilt from the per-class lists. Readers use an immutable state
+    that updates swap in whole, so searches never take a lock.
+    """
+    CLASS_ROLL = re.compile(r'(\d+[a-z])\s*[\s/#:-]?\s*(\d+)')
+    MIN_TRIGRAM_SCORE = 0.3
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (classes, sorted token keys, [(class_name, position)] aligned with the keys, {(class, roll): student}),
+        # where classes maps class_name -> (students, sorted [(token, position)], {trigram: {position}},
+        # [trigrams of each student]). Postings positions index into the class lists of the same state.
+        self._state = ({}, [], [], {})
+    
+    def has_class(self, class_name):
+        return class_name in self._state[0]
+    
+    def update_class(self, class_name, students):
+        """(Re)index the students of one class; a no-op if its list is unchanged"""
+        entries = [
+            {'class': class_name, 'roll': student['Roll Number'], 'name': student['Name'],
+             'key': _normalise_name(student['Name'])}
+            for student in students
+        ]
+        with self._lock:
+            current = self._state[0].get(class_name)
+            if current is not None and current[0] == entries:
+                return False
+            tokens = sorted((token, pos) for pos, entry in enumerate(entries) for token in set(entry['key'].split()))
+            grams = [frozenset(_trigrams(entry['key'])) for entry in entries]
+            trigrams = {}
+            for pos, entry_grams in enumerate(grams):
+                for gram in entry_grams:
+                    trigrams.setdefault(gram, set()).add(pos)
+            classes = dict(self._state[0])
+            classes[class_name] = (entries, tokens, trigrams, grams)
+            self._rebuild(classes)
+        return True
+    
+    def remove_class(self, class_name):
+        with self._lock:
+            if class_name in self._state[0]:
+                classes = dict(self._state[0])
+                del classes[class_name]
+                self._rebuild(classes)
+    
+    def _rebuild(self, classes):
+        merged = list(heapq.merge(*[
+            [(token, class_name, pos) for token, pos in tokens]
+            for class_name, (_, tokens, _, _) in classes.items()
+        ]))
+        exact = {
+            (class_name.casefold(), entry['roll']): entry
+            for class_name, (entries, _, _, _) in classes.items() for entry in entries
+        }
+        self._state = (classes, [token for token, _, _ in merged], [(c, pos) for _, c, pos in merged], exact)
+    
+    def search(self, query, limit=10):
+        """Best matches for a query: exact class + roll, then name prefixes, then similar names"""
+        classes, keys, postings, exact = self._state
+        q = _normalise_name(query)
+        results = []
+        seen = set()
+        
+        def add(entry, match):
+            if (entry['class'], entry['roll']) not in seen and len(results) < limit:
+                seen.add((entry['class'], entry['roll']))
+                results.append({'class': entry['class'], 'roll': entry['roll'], 'name': entry['name'], 'match': match})
+        
+        if not q:
+            return results
+        
+        # "7B 12", "7b/12" or a bare roll number
+        class_roll = self.CLASS_ROLL.fullmatch(q)
+        if class_roll and (class_roll[1], class_roll[2]) in exact:
+            add(exact[(class_roll[1], class_roll[2])], 'exact')
+        elif q.isdigit():
+            for class_name in sorted(classes, key=class_sort_key):
+                if (class_name.casefold(), q) in exact:
+                    add(exact[(class_name.casefold(), q)], 'roll')
+        
+        # Every query word has to start one of the name's words; the most selective one drives the scan
+        words = q.split()
+        start, end = min(
+            ((bisect.bisect_left(keys, word), bisect.bisect_left(keys, word + '\uffff')) for word in words),
+            key=lambda bounds: bounds[1] - bounds[0]
+        )
+        matches = {}
+        wanted = limit - len(results)
+        for class_name, pos in postings[start:end]:
+            # Postings are in token order, so the first matches found are the alphabetically closest
+            if len(matches) >= wanted:
+                break
+            entry = classes[class_name][0][pos]
+            name_words = entry['key'].split()
+            if all(any(w.startswith(word) for w in name_words) for word in words):
+                matches[(class_name, pos)] = entry
+        for entry in sorted(matches.values(), key=lambda e: (e['key'], class_sort_key(e['class']), e['roll'])):
+            add(entry, 'prefix')
+        
+        # Misspellings: rank by shared trigrams (Jaccard similarity). A name can only
+        # reach the threshold by sharing at least ``needed`` trigrams with the query,
+        # so candidates only come from the rarest grams and common ones are skipped.
+        if len(results) < limit and len(q) >= 3:
+            query_grams = _trigrams(q)
+            needed = max(1, math.ceil(self.MIN_TRIGRAM_SCORE * len(query_grams)))
+            scores = {}
+            for class_name, (entries, _, trigrams, grams) in classes.items():
+                rarest = sorted(query_grams, key=lambda gram: len(trigrams.get(gram, ())))
+                candidates = set()
+                for gram in rarest[:len(rarest) - needed + 1]:
+                    candidates.update(trigrams.get(gram, ()))
+                for pos in candidates:
+                    count = len(query_grams & grams[pos])
+                    score = count / (len(query_grams) + len(grams[pos]) - count)
+                    if score >= self.MIN_TRIGRAM_SCORE:
+                        scores[(class_name, pos)] = (score, entries[pos])
+            for score, entry in sorted(scores.values(), key=lambda item: (-item[0], item[1]['key'])):
+                add(entry, 'similar')
+        return results
+    
+    def get_stats(self):
+        classes, keys, _, exact = self._state
+        return {'classes': len(classes), 'students': len(exact), 'tokens': len(keys)}
@@ -0,0 +1,110 @@
+"""In-memory cache of downloaded class sheets and their parsed models"""
+import threading
+import time
+from collections import OrderedDict
+
+from sheet_model import ClassSheetModel, sheet_version
+
+
+class CachedSheet:
+    """A downloaded class sheet together with the HTTP validators it was served with"""
+    def __init__(self, data, etag=None, last_modified=None, version=None, model=None, downloaded_at=None,
+                 previous=None):
+        self.data = data
+        self.version = version or sheet_version(repr(data))
+        self.downloaded_at = downloaded_at or time.time()
+        if model is None:
+            # Diff against the version this one replaces so only changed topics are recomputed
+            model = ClassSheetModel.from_rows(data, previous=previous.model if previous is not None else None,
+                                              version=self.version, timestamp=self.downloaded_at,
+                                              previous_data=previous.data if previous is not None else None)
+        self.model = model
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time()
+    
+    def touch(self):
+        """Mark the sheet as freshly validated without changing its contents"""
+        self.fetched_at = time.time()
+    
+    def age(self):
+        """Seconds since the sheet was last downloaded or revalidated"""
+        return time.time() - self.fetched_at
+
+
+class SheetCache:
+    """Thread-safe per-class LRU cache of sheet data with a TTL and hit/miss counters
+    
+    Entries younger than ``ttl`` seconds are served directly. Entries older than
+    that but within ``stale_ttl`` further seconds are served stale while the
+    connector revalidates them in the background (set ``stale_ttl`` to 0 to
+    always revalidate synchronously). Anything older is treated as a miss.
+    """
+    def __init__(self, ttl=300, stale_ttl=3600, max_entries=64):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'coalesced': 0,
+            'snapshot_loads': 0,
+            'evictions': 0
+        }
+    
+    def get(self, class_name):
+        """Return the cached entry for a class (fresh or not) and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(class_name)
+            if entry is not None:
+                self._entries.move_to_end(class_name)
+            return entry
+    
+    def put(self, class_name, entry):
+        """Store an entry, evicting the least recently used classes beyond max_entries"""
+        with self._lock:
+            self._entries[class_name] = entry
+            self._entries.move_to_end(class_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def entries(self):
+        """Currently cached entries, most recently used last"""
+        with self._lock:
+            return list(self._entries.values())
+    
+    def invalidate(self, class_name=None):
+        """Drop one class (or everything) from the cache"""
+        with self._lock:
+            if class_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(class_name, None)
+    
+    def is_fresh(self, entry):
+        return entry.age() < self.ttl
+    
+    def is_servable_stale(self, entry):
+        return self.stale_ttl > 0 and entry.age() < self.ttl + self.stale_ttl
+    
+    def record(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+    
+    def get_stats(self):
+        """Snapshot of the cache counters plus its current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['classes'] = list(self._entries.keys())
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['stale_hits']) / lookups, 4) if lookups else 0.0
+        stats['ttl'] = self.ttl
+        stats['stale_ttl'] = self.stale_ttl
+        stats['max_entries'] = self.max_entries
+        return stats
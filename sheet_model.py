@@ -0,0 +1,674 @@
+"""Parsed class sheets: subject sections, vectorized scores and ranks, and the report objects built from them"""
+import hashlib
+import time
+import warnings
+
+from changes import SheetChanges
+from instrumentation import metrics
+from lazy_imports import np, pd
+
+
+def _parse_marks(cell):
+    """Parse a marks cell the way the sheet has always been read (blank counts as 0)
+
+    Returns None for values that are not plain numbers.
+    """
+    value = str(cell).strip() if cell else '0'
+    if not value.replace('.', '').isdigit():
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class SubjectSection:
+    """One subject block of a class sheet, parsed into topic columns and student rows"""
+    def __init__(self, name, start_row, header_row):
+        self.name = name
+        self.start_row = start_row
+        self.header_row = header_row
+        self.topics = []            # topic names in sheet order
+        self.topic_columns = []     # (time column, marks column) for each topic
+        self.rolls = []             # roll numbers in sheet order
+        self.names = []             # names exactly as they appear in the sheet
+        self.times = []             # per student: time category text for each topic
+        self.marks = []             # per student: float marks for each topic (None if not numeric)
+        self.reported = []          # per student: whether each topic has marks worth reporting
+        self.row_index = {}         # roll number -> position in the lists above
+        self.sheet_rows = []        # sheet row each student was parsed from
+        self.scores = None          # SectionScores, filled once per sheet version
+        self.ranks = {}             # {topic_name: {roll_no: rank}}, filled once per sheet version
+    
+    def find_student(self, roll_number):
+        """Position of a student in this section, or None"""
+        return self.row_index.get(str(roll_number))
+    
+    def compute_scores(self, previous=None, changed_topics=None):
+        """Score and rank the whole section in one vectorized pass
+
+        With ``previous`` (the same section of the prior sheet version) and the
+        topic positions that changed since, only those topic columns are
+        re-categorised and re-ranked; everything else is carried over.
+        """
+        if previous is None or changed_topics is None:
+            self.scores = SectionScores(self)
+            self.ranks = self.scores.rank_tables()
+        else:
+            self.scores = SectionScores(self, previous.scores, changed_topics)
+            self.ranks = self.scores.rank_tables(changed_topics, previous.ranks)
+        return self.scores
+    
+    def diff(self, previous):
+        """Cells that changed since ``previous``, or None if the layout itself changed
+
+        Sections are only comparable cell by cell when they have the same topics
+        and the same roll numbers in the same order. Returns (changed topic
+        positions, [(student position, topic position, field)], renamed student
+        positions).
+        """
+        if previous is None or previous.scores is None or \
+                previous.topics != self.topics or previous.rolls != self.rolls or \
+                len(set(self.topics)) != len(self.topics) or \
+                getattr(previous.scores, 'rank_values', None) is None:
+            return None
+        shape = (len(self.rolls), len(self.topics))
+        new_marks = np.array(self.marks, dtype=float).reshape(shape)
+        old_marks = previous.scores.marks.to_numpy()
+        marks_changed = ~((new_marks == old_marks) | (np.isnan(new_marks) & np.isnan(old_marks)))
+        times_changed = np.array(self.times, dtype=object).reshape(shape) != \
+            np.array(previous.times, dtype=object).reshape(shape)
+        reported_changed = np.array(self.reported, dtype=bool).reshape(shape) != \
+            np.array(previous.reported, dtype=bool).reshape(shape)
+        
+        changed = marks_changed | times_changed | reported_changed
+        changed_topics = set(np.flatnonzero(changed.any(axis=0)).tolist())
+        cells = [
+            (pos, topic_idx, 'marks' if marks_changed[pos, topic_idx] or reported_changed[pos, topic_idx] else 'time')
+            for pos, topic_idx in np.argwhere(changed).tolist()
+        ]
+        renamed = [pos for pos, (new, old) in enumerate(zip(self.names, previous.names)) if new != old]
+        return changed_topics, cells, renamed
+
+
+# Performance buckets, indexed by the codes in SectionScores.buckets:
+# Strong: below average time AND marks > 75% (9/12)
+# Need Attention: above average time AND marks > 75%
+# Weak: marks <= 75% (regardless of time)
+STRONG, NEED_ATTENTION, WEAK = 0, 1, 2
+PERFORMANCE_BUCKETS = (
+    ('green', 'Strong', 'bg-success'),
+    ('orange', 'Need Attention', 'bg-warning text-dark'),
+    ('red', 'Weak', 'bg-danger'),
+)
+TIME_CATEGORIES = ('below_avg', 'above_avg', 'unknown')
+# Chart point colours by marks: 9 and above, 6 and above, below 6
+CHART_POINT_COLORS = ('#28a745', '#ffc107', '#dc3545')
+
+
+class Topic:
+    """One topic of a student's report
+
+    Colour, CSS class and label are looked up from the shared
+    PERFORMANCE_BUCKETS by bucket code instead of being stored per topic.
+    Item access (``topic['color']``) mirrors the JSON keys.
+    """
+    __slots__ = ('name', 'time_category', 'marks', 'score_percentage', 'bucket', 'rank')
+    FIELDS = ('name', 'time_category', 'marks', 'score_percentage', 'color', 'performance_class',
+              'performance_text', 'rank')
+    
+    def __init__(self, name, time_category, marks, score_percentage, bucket, rank):
+        self.name = name
+        self.time_category = time_category
+        self.marks = marks
+        self.score_percentage = score_percentage
+        self.bucket = bucket
+        self.rank = rank
+    
+    @property
+    def color(self):
+        return PERFORMANCE_BUCKETS[self.bucket][0]
+    
+    @property
+    def performance_text(self):
+        return PERFORMANCE_BUCKETS[self.bucket][1]
+    
+    @property
+    def performance_class(self):
+        return PERFORMANCE_BUCKETS[self.bucket][2]
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class SubjectReport:
+    """The topics a student has marks for in one subject, with counts derived on demand"""
+    __slots__ = ('topics',)
+    FIELDS = ('topics', 'total_topics', 'excellent_topics', 'growth_topics')
+    
+    def __init__(self, topics):
+        self.topics = topics
+    
+    @property
+    def total_topics(self):
+        return len(self.topics)
+    
+    @property
+    def excellent_topics(self):
+        return sum(1 for topic in self.topics if topic.marks >= 7.5)
+    
+    @property
+    def growth_topics(self):
+        return sum(1 for topic in self.topics if topic.marks < 7.5)
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self, topic_dicts=None):
+        topics = [topic_dicts[id(topic)] if topic_dicts else topic.to_dict() for topic in self.topics]
+        return {
+            'topics': topics,
+            'total_topics': self.total_topics,
+            'excellent_topics': self.excellent_topics,
+            'growth_topics': self.growth_topics
+        }
+
+
+class StudentReport:
+    """A student's multi-subject report
+
+    The Strong / Need Attention / Weak lists in ``performance_analysis`` refer
+    to the same Topic objects as the subjects instead of copying them.
+    ``to_dict()`` gives the JSON shape served by /api/student-report, and item
+    access with the JSON keys (``report['Roll Number']``) keeps templates working.
+    """
+    __slots__ = ('class_name', 'roll_number', 'name', 'subjects')
+    KEYS = {'Class': 'class_name', 'Roll Number': 'roll_number', 'Name': 'name',
+            'subjects': 'subjects', 'performance_analysis': 'performance_analysis'}
+    
+    def __init__(self, class_name, roll_number, name='', subjects=None):
+        self.class_name = class_name
+        self.roll_number = roll_number
+        self.name = name
+        self.subjects = subjects if subjects is not None else {}
+    
+    @property
+    def performance_analysis(self):
+        """Performance counts, the overall verdict and the topics in each bucket"""
+        by_bucket = {STRONG: [], NEED_ATTENTION: [], WEAK: []}
+        for subject in self.subjects.values():
+            for topic in subject.topics:
+                by_bucket[topic.bucket].append(topic)
+        strong_count = len(by_bucket[STRONG])
+        need_attention_count = len(by_bucket[NEED_ATTENTION])
+        weak_count = len(by_bucket[WEAK])
+        
+        # Determine overall performance message and color
+        if strong_count > need_attention_count and strong_count > weak_count:
+            overall_performance, overall_color = 'Good Going', 'green'
+        elif need_attention_count > strong_count and need_attention_count > weak_count:
+            overall_performance, overall_color = 'Need Attention', 'yellow'
+        elif weak_count > 0:
+            overall_performance, overall_color = 'Need Immediate Attention', 'red'
+        else:
+            overall_performance, overall_color = 'Good Going', 'green'
+        
+        return {
+            'strong_count': strong_count,
+            'need_attention_count': need_attention_count,
+            'weak_count': weak_count,
+            'overall_performance': overall_performance,
+            'overall_color': overall_color,
+            'strong_topics': by_bucket[STRONG],
+            'need_attention_topics': by_bucket[NEED_ATTENTION],
+            'weak_topics': by_bucket[WEAK]
+        }
+    
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, self.KEYS[key])
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def to_dict(self):
+        """The report in its JSON shape (each topic is serialised once and shared between lists)"""
+        topic_dicts = {
+            id(topic): topic.to_dict()
+            for subject in self.subjects.values() for topic in subject.topics
+        }
+        analysis = self.performance_analysis
+        for key in ('strong_topics', 'need_attention_topics', 'weak_topics'):
+            analysis[key] = [topic_dicts[id(topic)] for topic in analysis[key]]
+        return {
+            'Class': self.class_name,
+            'Roll Number': self.roll_number,
+            'Name': self.name,
+            'subjects': {name: subject.to_dict(topic_dicts) for name, subject in self.subjects.items()},
+            'performance_analysis': analysis
+        }
+
+
+class SectionScores:
+    """Columnar scores for every student and topic of a subject section
+
+    Rows follow ``section.rolls`` and columns follow ``section.topics``. Score
+    percentages (marks out of 12), time categories, performance buckets and
+    per-topic ranks are all computed for the whole class with pandas/NumPy, so
+    a single report only has to slice out one row.
+    """
+    def __init__(self, section, previous=None, changed_topics=None):
+        n_students = len(section.rolls)
+        n_topics = len(section.topics)
+        # Columns to (re)compute: all of them, or only the changed ones when a
+        # previous version's scores for an identically shaped section are given
+        if previous is None or changed_topics is None:
+            columns = list(range(n_topics))
+        else:
+            columns = sorted(changed_topics)
+        
+        with metrics.span('categorisation'):
+            self.marks = pd.DataFrame(section.marks, dtype=float).reindex(columns=range(n_topics))
+            self.percentage = self.marks.to_numpy() / 12 * 100
+            
+            if previous is None or changed_topics is None:
+                self.time_categories = np.empty((n_students, n_topics), dtype=np.int8)
+                self.buckets = np.empty((n_students, n_topics), dtype=np.int8)
+            else:
+                self.time_categories = previous.time_categories.copy()
+                self.buckets = previous.buckets.copy()
+            
+            if columns:
+                times = np.array([[row[c] for c in columns] for row in section.times], dtype=str)
+                times = np.char.lower(times.reshape(n_students, len(columns)))
+                below = np.char.find(times, 'below') >= 0
+                above = np.char.find(times, 'above') >= 0
+                self.time_categories[:, columns] = np.where(below, 0, np.where(above, 1, 2))
+                
+                with np.errstate(invalid='ignore'):
+                    high_score = self.percentage[:, columns] > 75
+                self.buckets[:, columns] = np.where(high_score, np.where(below, STRONG, NEED_ATTENTION), WEAK)
+        
+        with metrics.span('ranking'):
+            # Only numeric roll numbers with numeric marks take part in ranking;
+            # 'min' gives competition ranking where ties share the best rank
+            rankable = np.array([roll_no.isdigit() for roll_no in section.rolls], dtype=bool)
+            if previous is None or changed_topics is None:
+                self.rank_values = np.full((int(rankable.sum()), n_topics), np.nan)
+            else:
+                self.rank_values = previous.rank_values.copy()
+            if columns:
+                self.rank_values[:, columns] = self.marks[rankable][columns] \
+                    .rank(method='min', ascending=False).to_numpy()
+        self._rolls = [roll_no for roll_no, ok in zip(section.rolls, rankable) if ok]
+        self._topics = section.topics
+    
+    def rank_tables(self, topic_positions=None, previous=None):
+        """Ranks as {topic_name: {roll_no: rank}}, skipping topics nobody has marks for
+
+        Given ``topic_positions`` and the previous rank tables, only those
+        topics are rebuilt and the rest are shared with ``previous``.
+        """
+        topic_ranks = dict(previous) if previous is not None else {}
+        if topic_positions is None:
+            topic_positions = range(len(self._topics))
+        for topic_idx in sorted(topic_positions):
+            topic_name = self._topics[topic_idx]
+            column = self.rank_values[:, topic_idx]
+            ranks = {}
+            for roll_no, rank in zip(self._rolls, column):
+                if not np.isnan(rank):
+                    # A roll number listed twice keeps its lowest placing, as the original
+                    # rank lists (built best-first, later entries overwriting) did
+                    ranks[roll_no] = max(int(rank), ranks.get(roll_no, 0))
+            if ranks:
+                topic_ranks[topic_name] = ranks
+            else:
+                topic_ranks.pop(topic_name, None)
+        if previous is not None:
+            # Keep sheet order so incremental and full rebuilds serialise identically
+            topic_ranks = {name: topic_ranks[name] for name in self._topics if name in topic_ranks}
+        return topic_ranks
+
+
+# Mark histogram bins (marks are out of 12); the last bin also takes anything above 12
+MARK_BINS = (0, 2, 4, 6, 8, 10, 12)
+
+
+def _round(value, digits=2):
+    """Round for JSON output, mapping NaN to None"""
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def section_analytics(section):
+    """Class-wide aggregates for every topic of a section, computed column-wise in one pass
+
+    Only students with a numeric roll number and marks worth reporting for a
+    topic (the cells a report would show) count towards that topic.
+    """
+    n_students, n_topics = len(section.rolls), len(section.topics)
+    students = np.array([roll_no.isdigit() for roll_no in section.rolls], dtype=bool)
+    reported = np.array(section.reported, dtype=bool).reshape(n_students, n_topics) & students[:, None]
+    marks = np.where(reported, section.scores.marks.to_numpy(), np.nan)
+    buckets = section.scores.buckets
+    
+    counts = reported.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        # Topics nobody has marks for give all-NaN columns; their statistics stay None
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(marks, axis=0) if n_students else np.full(n_topics, np.nan)
+        q1, median, q3 = np.nanpercentile(marks, [25, 50, 75], axis=0) if n_students else np.full((3, n_topics), np.nan)
+        lowest = np.nanmin(marks, axis=0) if n_students else np.full(n_topics, np.nan)
+        highest = np.nanmax(marks, axis=0) if n_students else np.full(n_topics, np.nan)
+    bins = np.clip(np.digitize(marks, MARK_BINS[1:-1]), 0, len(MARK_BINS) - 2)
+    histogram = np.stack([((bins == b) & reported).sum(axis=0) for b in range(len(MARK_BINS) - 1)])
+    performance = np.stack([((buckets == code) & reported).sum(axis=0) for code in range(len(PERFORMANCE_BUCKETS))])
+    bin_labels = [f"{low}-{high}" for low, high in zip(MARK_BINS, MARK_BINS[1:])]
+    
+    def shares(bucket_counts, total):
+        return {
+            text: {'count': int(count), 'share': _round(count / total if total else np.nan, 4)}
+            for (_, text, _), count in zip(PERFORMANCE_BUCKETS, bucket_counts)
+        }
+    
+    topics = []
+    for topic_idx, topic_name in enumerate(section.topics):
+        topics.append({
+            'name': topic_name,
+            'students': int(counts[topic_idx]),
+            'average': _round(means[topic_idx]),
+            'average_percentage': _round(means[topic_idx] / 12 * 100),
+            'median': _round(median[topic_idx]),
+            'q1': _round(q1[topic_idx]),
+            'q3': _round(q3[topic_idx]),
+            'min': _round(lowest[topic_idx]),
+            'max': _round(highest[topic_idx]),
+            'histogram': dict(zip(bin_labels, histogram[:, topic_idx].tolist())),
+            'performance': shares(performance[:, topic_idx], counts[topic_idx])
+        })
+    
+    total = int(counts.sum())
+    return {
+        'students': int(students.sum()),
+        'topics': topics,
+        'summary': {
+            'marks_reported': total,
+            'average_percentage': _round(np.nansum(marks) / total / 12 * 100 if total else np.nan),
+            'performance': shares(performance.sum(axis=1), total)
+        }
+    }
+
+
+class ClassSheetModel:
+    """Parse-once representation of a class sheet
+
+    Holds the subject sections, their topic column offsets, a roll number index
+    and the parsed marks, so report, ranking and student list lookups never
+    have to rescan the raw CSV rows.
+    """
+    def __init__(self, sections, students, row_count, version=None, revisions=None, changes=None):
+        self.sections = sections
+        self.students = students
+        self.row_count = row_count
+        self.version = version
+        self.revisions = revisions if revisions is not None else {}    # roll_no -> (version, timestamp) it last changed in
+        self.changes = changes      # SheetChanges against the previous version, or None
+    
+    @classmethod
+    def from_rows(cls, data, previous=None, version=None, timestamp=None, previous_data=None):
+        """Compile the raw CSV rows of a class sheet
+
+        Pass the model of the previous sheet version (and its rows) to diff
+        against it: unchanged rows reuse their parsed cells, only topics whose
+        cells changed are re-categorised and re-ranked, and the result records
+        which topics and students changed (``changes``) and the version each
+        student's report last changed in (``revisions``).
+        """
+        with metrics.span('section_detection'):
+            markers = [i for i, row in enumerate(data) if len(row) > 0 and str(row[0]).strip() == 'Class']
+            
+            # Assign subjects based on position
+            if len(markers) >= 2:
+                layout = [('Maths', markers[0]), ('Science', markers[1])]
+            elif len(markers) == 1:
+                layout = [('Subject', markers[0])]
+            else:
+                layout = [('Subject', 0)]
+            
+            sections = []
+            for subject_name, start_row in layout:
+                header_row_idx = None
+                for i in range(start_row, min(start_row + 5, len(data))):
+                    if len(data[i]) > 0 and 'Roll No.' in str(data[i][0]):
+                        header_row_idx = i
+                        break
+                if header_row_idx is None and not markers and len(data) > 1:
+                    # Sheets without Class markers have always defaulted to the second row
+                    header_row_idx = 1
+                if header_row_idx is None:
+                    continue
+                prior = None
+                if previous is not None and previous_data is not None:
+                    prior = next((section for section in previous.sections if section.name == subject_name), None)
+                sections.append(cls._parse_section(data, subject_name, start_row, header_row_idx, prior, previous_data))
+        
+        # Scores and rank tables are computed once here and reused by every report on this sheet version
+        timestamp = timestamp or time.time()
+        changes = None
+        if previous is not None:
+            changes = SheetChanges(version, getattr(previous, 'version', None))
+            previous_sections = {section.name: section for section in previous.sections}
+            changes.structural = [section.name for section in sections] != list(previous_sections)
+        for section in sections:
+            delta = section.diff(previous_sections.get(section.name)) if changes is not None else None
+            if delta is None:
+                section.compute_scores()
+                if changes is not None:
+                    changes.structural = True
+                continue
+            changed_topics, cells, renamed = delta
+            prior = previous_sections[section.name]
+            section.compute_scores(prior, changed_topics)
+            changes.record_section(section, prior, changed_topics, cells, renamed)
+        
+        # Each student's report keeps the revision it last changed in, so caches
+        # keyed by it survive edits to other students' rows
+        all_rolls = {roll_no for section in sections for roll_no in section.rolls}
+        previous_revisions = getattr(previous, 'revisions', None)
+        if changes is None or changes.structural or not previous_revisions:
+            revisions = {roll_no: (version, timestamp) for roll_no in all_rolls}
+        else:
+            revisions = {
+                roll_no: previous_revisions.get(roll_no, (version, timestamp))
+                if roll_no not in changes.rolls else (version, timestamp)
+                for roll_no in all_rolls
+            }
+        
+        students = []
+        if sections:
+            first = sections[0]
+            for pos, roll_no in enumerate(first.rolls):
+                # A row needs a name cell (even an empty one) to be listed as a student
+                if roll_no.isdigit() and len(data[first.sheet_rows[pos]]) >= 2:
+                    students.append({
+                        'Roll Number': roll_no,
+                        'Name': str(first.names[pos]).strip()
+                    })
+            students.sort(key=lambda x: int(x.get('Roll Number', 0)))
+        
+        return cls(sections, students, len(data), version=version, revisions=revisions, changes=changes)
+    
+    @staticmethod
+    def _parse_section(data, subject_name, start_row, header_row_idx, previous=None, previous_data=None):
+        section = SubjectSection(subject_name, start_row, header_row_idx)
+        headers = data[header_row_idx]
+        
+        i = 2
+        while i < len(headers):
+            topic_header = headers[i].strip()
+            if topic_header and topic_header.startswith('Topic'):
+                section.topics.append(topic_header)
+                section.topic_columns.append((i, i + 1))
+                i += 2
+            else:
+                i += 1
+        
+        # Rows identical to the same row of the previous sheet version keep their parsed cells
+        previous_positions = {}
+        if previous is not None and previous.topic_columns == section.topic_columns:
+            previous_positions = {row_idx: pos for pos, row_idx in enumerate(getattr(previous, 'sheet_rows', ()))}
+        
+        for row_idx in range(header_row_idx + 2, len(data)):
+            row = data[row_idx]
+            if len(row) == 0:
+                continue
+            roll_no = str(row[0]).strip()
+            # Stop if we hit another subject section
+            if roll_no == 'Class':
+                break
+            if not roll_no:
+                continue
+            
+            prior = previous_positions.get(row_idx)
+            if prior is not None and row_idx < len(previous_data) and previous_data[row_idx] == row:
+                times = previous.times[prior]
+                marks = previous.marks[prior]
+                reported = previous.reported[prior]
+            else:
+                times = []
+                marks = []
+                reported = []
+                for time_col, marks_col in section.topic_columns:
+                    times.append(str(row[time_col]).strip() if time_col < len(row) and row[time_col] else '')
+                    cell = row[marks_col] if marks_col < len(row) else ''
+                    value = _parse_marks(cell)
+                    marks.append(value)
+                    reported.append(value is not None and str(cell).strip() not in ('', '0'))
+            
+            if roll_no not in section.row_index:
+                section.row_index[roll_no] = len(section.rolls)
+            section.rolls.append(roll_no)
+            section.sheet_rows.append(row_idx)
+            section.names.append(row[1] if len(row) > 1 else '')
+            section.times.append(times)
+            section.marks.append(marks)
+            section.reported.append(reported)
+        
+        return section
+    
+    def rank_tables(self):
+        """Precomputed ranks for the whole class: {subject: {topic: {roll_no: rank}}}"""
+        return {section.name: section.ranks for section in self.sections}
+    
+    def analytics(self):
+        """Per-topic class aggregates for every subject, computed once per sheet version"""
+        analytics = getattr(self, '_analytics', None)
+        if analytics is None:
+            with metrics.span('analytics'):
+                analytics = {
+                    'students': len(self.students),
+                    'subjects': {section.name: section_analytics(section) for section in self.sections}
+                }
+            self._analytics = analytics
+        return analytics
+    
+    def chart_series(self, roll_number):
+        """Compact chart-ready series for one student, or None if the student is not in the sheet
+
+        Per subject, parallel columns for the topics a report shows: labels,
+        marks, score percentages, performance bucket codes (see
+        PERFORMANCE_BUCKETS), ranks and the chart point colour (an index into
+        CHART_POINT_COLORS). Built once per student and sheet version.
+        """
+        charts = self.__dict__.setdefault('_charts', {})
+        roll_number = str(roll_number)
+        if roll_number in charts:
+            return charts[roll_number]
+        
+        subjects = {}
+        for section in self.sections:
+            pos = section.find_student(roll_number)
+            if pos is None:
+                continue
+            columns = [topic_idx for topic_idx, reported in enumerate(section.reported[pos]) if reported]
+            marks = [section.marks[pos][topic_idx] for topic_idx in columns]
+            ranks = [section.ranks.get(section.topics[topic_idx], {}).get(roll_number) for topic_idx in columns]
+            subjects[section.name] = {
+                'labels': [section.topics[topic_idx] for topic_idx in columns],
+                'marks': marks,
+                'percentages': [round(float(section.scores.percentage[pos][topic_idx]), 1) for topic_idx in columns],
+                'buckets': section.scores.buckets[pos][columns].tolist(),
+                'ranks': ranks,
+                'points': [0 if value >= 9 else 1 if value >= 6 else 2 for value in marks]
+            }
+        if not subjects:
+            return None
+        charts[roll_number] = subjects
+        return subjects
+    
+    def __getstate__(self):
+        # Analytics and chart series are cheap to rebuild and not worth storing in snapshots
+        state = self.__dict__.copy()
+        state.pop('_analytics', None)
+        state.pop('_charts', None)
+        return state
+    
+    def revision(self, roll_number):
+        """(version, timestamp) of the sheet version this student's report last changed in"""
+        return getattr(self, 'revisions', {}).get(str(roll_number))
+    
+    def section_at(self, start_row):
+        """The section that starts at a given sheet row, or None"""
+        for section in self.sections:
+            if section.start_row == start_row:
+                return section
+        return None
+
+
+def class_sort_key(class_name):
+    """Sort classes by grade then section, e.g. 2A before 10B"""
+    return (int(class_name[:-1]), class_name[-1]) if len(class_name) > 1 else (0, class_name)
+
+
+def sheet_version(content):
+    """Short content hash identifying one version of a sheet"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()[:16]
+
+
+def scan_student_list(rows):
+    """The student list of a sheet, reading rows only as far as the end of the first section
+
+    Only columns 0-1 of each row are kept, and iteration stops at the 'Class'
+    marker that follows the first section's header, so the topic grid is never
+    materialised. The kept columns go through ClassSheetModel.from_rows, so the
+    result is exactly what the full model would list.
+    """
+    narrow = []
+    marker = header = None
+    for row_idx, row in enumerate(rows):
+        first = str(row[0]) if len(row) > 0 else ''
+        if marker is not None and header is not None and row_idx >= header + 2 and first.strip() == 'Class':
+            break
+        narrow.append(row[:2])
+        if marker is None and first.strip() == 'Class':
+            marker = row_idx
+        elif marker is not None and header is None and row_idx < marker + 5 and 'Roll No.' in first:
+            header = row_idx
+    
+    model = ClassSheetModel.from_rows(narrow)
+    if model.row_count < 4:
+        return []
+    return [dict(student) for student in model.students]
@@ -0,0 +1,78 @@
+"""Last good copy of every class sheet on disk, for cold starts and Google outages"""
+import json
+import sqlite3
+import threading
+import zlib
+
+from sheet_cache import CachedSheet
+
+
+class SnapshotStore:
+    """On-disk SQLite store of the last good version of every class sheet
+
+    Each row is keyed by (class, content hash) and holds the zlib-compressed
+    CSV rows as JSON, so a fresh process can serve a class before Google has
+    answered. Only data is stored - the ClassSheetModel is rebuilt from the
+    rows on load, so reading a snapshot never runs code from the file.
+    """
+    def __init__(self, path, keep_versions=3):
+        self.path = path
+        self.keep_versions = keep_versions
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sheet_snapshots (
+                    class_name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    downloaded_at REAL NOT NULL,
+                    rows BLOB NOT NULL,
+                    PRIMARY KEY (class_name, version)
+                )
+            ''')
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+    
+    def save(self, class_name, entry):
+        """Persist a sheet version, keeping only the newest few per class"""
+        rows = zlib.compress(json.dumps(entry.data, separators=(',', ':')).encode('utf-8'))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sheet_snapshots (class_name, version, etag, last_modified, downloaded_at, rows) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (class_name, entry.version, entry.etag, entry.last_modified, entry.downloaded_at, rows)
+            )
+            conn.execute('''
+                DELETE FROM sheet_snapshots WHERE class_name = ? AND version NOT IN (
+                    SELECT version FROM sheet_snapshots WHERE class_name = ?
+                    ORDER BY downloaded_at DESC LIMIT ?
+                )
+            ''', (class_name, class_name, self.keep_versions))
+    
+    def load(self, class_name):
+        """The newest stored version of a class as a CachedSheet, or None"""
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT version, etag, last_modified, downloaded_at, rows FROM sheet_snapshots
+                WHERE class_name = ? ORDER BY downloaded_at DESC LIMIT 1
+            ''', (class_name,)).fetchone()
+        if row is None:
+            return None
+        
+        version, etag, last_modified, downloaded_at, rows = row
+        data = json.loads(zlib.decompress(rows))
+        # Parsed and ranked again from the rows, under the version they were stored with
+        entry = CachedSheet(data, etag=etag, last_modified=last_modified, version=version,
+                            downloaded_at=downloaded_at)
+        # Count it as old as its download so it gets revalidated straight away
+        entry.fetched_at = downloaded_at
+        return entry
+    
+    def classes(self):
+        """Classes that have at least one stored snapshot"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT DISTINCT class_name FROM sheet_snapshots')]
@@ -0,0 +1,313 @@
+"""Where class sheets are read from: published CSV URLs, a local directory or the Sheets API"""
+import codecs
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+
+from instrumentation import metrics
+from resilience import PERMANENT_FAILURE, Deadline
+from sheet_model import sheet_version
+
+logger = logging.getLogger('student_report')
+
+
+# Bytes read from a sheet download (or local file) at a time while it is parsed
+CSV_CHUNK_SIZE = 64 * 1024
+
+
+def iter_response_body(response, chunk_size=CSV_CHUNK_SIZE):
+    """Body chunks of a streamed download, each handed over as soon as it arrives
+
+    ``iter_content`` blocks until a whole chunk is in, so a body trickling in
+    slowly would only be seen (and checked against a deadline) once per
+    chunk. urllib3 2's ``read1`` returns whatever the last read delivered;
+    older urllib3 falls back to ``iter_content``.
+    """
+    read1 = getattr(response.raw, 'read1', None)
+    if read1 is None:
+        yield from response.iter_content(chunk_size)
+        return
+    while True:
+        chunk = read1(chunk_size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv_lines(chunks):
+    """Decode CSV byte chunks incrementally into lines, split exactly as StringIO would
+
+    Lines keep their trailing newline so csv.reader still handles quoted cells
+    that span several lines.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    pending = ''
+    for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def read_csv_stream(chunks, deadline=None):
+    """Parse a CSV byte stream into rows as it arrives, returning (rows, sheet_version)
+
+    Only the parsed rows are kept; the raw bytes are hashed and dropped chunk
+    by chunk instead of holding the body, its decoded text and a StringIO copy.
+    With a ``deadline`` the read is abandoned (TimeoutError) once it passes,
+    however steadily the bytes keep trickling in.
+    """
+    digest = hashlib.sha1()
+    
+    def hashed():
+        for chunk in chunks:
+            if deadline is not None and deadline.expired():
+                raise TimeoutError(f"sheet download took longer than {deadline.seconds:g}s")
+            digest.update(chunk)
+            yield chunk
+    
+    rows = list(csv.reader(iter_csv_lines(hashed())))
+    return rows, digest.hexdigest()[:16]
+
+
+# A sheet read from a source: rows, content hash and any HTTP validators to revalidate with
+FetchedSheet = namedtuple('FetchedSheet', 'rows version etag last_modified')
+
+# Returned by a source when the cached copy of a sheet is still current
+NOT_MODIFIED = object()
+
+# Client errors that are worth retrying (request timeout, rate limited)
+RETRYABLE_HTTP_STATUSES = frozenset({408, 429})
+
+
+class SheetSource:
+    """Where class sheets are read from
+
+    ``fetch`` returns a FetchedSheet, NOT_MODIFIED when the cached copy is
+    still current, PERMANENT_FAILURE when retrying cannot help, or None when
+    the sheet could not be read; ``timeout`` caps the seconds one attempt may
+    take in total (sources that cannot bound it ignore it).
+    Sources with ``batched`` set answer ``fetch_many`` for many classes in one
+    round trip.
+    """
+    name = 'base'
+    batched = False
+    
+    def class_names(self):
+        """Classes this source defines on its own (registered on the connector)"""
+        return []
+    
+    def has_sheet(self, class_name):
+        """Whether this source can read the class at all"""
+        return True
+    
+    def fetch(self, class_name, cached=None, timeout=None):
+        raise NotImplementedError
+    
+    def fetch_many(self, class_names, cached):
+        """{class_name: fetch result} for several classes; ``cached`` maps class to its cached copy"""
+        return {class_name: self.fetch(class_name, cached.get(class_name)) for class_name in class_names}
+    
+    def open_stream(self, class_name, timeout=None):
+        """Raw CSV byte chunks of a sheet for partial reads, or None if it cannot be streamed"""
+        return None
+
+
+class PublishedCsvSource(SheetSource):
+    """One published-to-web CSV download per class, revalidated with ETag/Last-Modified"""
+    name = 'csv'
+    
+    def __init__(self, urls, get_session, timeout):
+        self.urls = urls
+        self.get_session = get_session
+        self.timeout = timeout
+    
+    def has_sheet(self, class_name):
+        return bool(self.urls.get(class_name))
+    
+    def fetch(self, class_name, cached=None, timeout=None):
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        
+        # requests' timeout only bounds each socket read, so the whole download is checked against this
+        attempt_deadline = Deadline(timeout or self.timeout)
+        try:
+            with metrics.span('fetch'):
+                response = self.get_session().get(self.urls[class_name], headers=headers, timeout=attempt_deadline.seconds, stream=True)
+            with response:
+                metrics.inc('sheet_fetch_responses_total', status=response.status_code)
+                
+                if response.status_code == 304 and cached is not None:
+                    return NOT_MODIFIED
+                
+                if response.status_code == 200:
+                    # Rows are parsed as the body arrives instead of after buffering all of it
+                    with metrics.span('csv_parse'):
+                        data, version = read_csv_stream(iter_response_body(response), attempt_deadline)
+                    return FetchedSheet(data, version, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        except Exception as e:
+            metrics.inc('sheet_fetch_failures_total', reason=type(e).__name__)
+            logger.error("Error getting data for class %s: %s", class_name, e)
+            return None
+        
+        metrics.inc('sheet_fetch_failures_total', reason=f"http_{response.status_code}")
+        logger.warning("❌ Failed to get data for class %s: HTTP %s", class_name, response.status_code)
+        if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_HTTP_STATUSES:
+            # Unpublished, deleted or private sheet: the same answer every time
+            return PERMANENT_FAILURE
+        return None
+    
+    def open_stream(self, class_name, timeout=None):
+        sheet_url = self.urls.get(class_name)
+        if not sheet_url:
+            return None
+        attempt_deadline = Deadline(timeout or self.timeout)
+        with metrics.span('fetch'):
+            response = self.get_session().get(sheet_url, timeout=attempt_deadline.seconds, stream=True)
+        metrics.inc('sheet_fetch_responses_total', status=response.status_code)
+        if response.status_code != 200:
+            response.close()
+            return None
+        
+        def read_response():
+            # Closing early (once the wanted rows were read) drops the rest of the download
+            with response:
+                for chunk in iter_response_body(response):
+                    if attempt_deadline.expired():
+                        raise TimeoutError(f"sheet download took longer than {attempt_deadline.seconds:g}s")
+                    yield chunk
+        return read_response()
+
+
+class LocalDirectorySource(SheetSource):
+    """<directory>/<class>.csv files used instead of Google (offline testing)"""
+    name = 'local'
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def _path(self, class_name):
+        return os.path.join(self.directory, f"{class_name}.csv")
+    
+    def class_names(self):
+        try:
+            return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith('.csv'))
+        except OSError:
+            return []
+    
+    def has_sheet(self, class_name):
+        return os.path.exists(self._path(class_name))
+    
+    def fetch(self, class_name, cached=None, timeout=None):
+        try:
+            with open(self._path(class_name), 'rb') as f, metrics.span('csv_parse'):
+                data, version = read_csv_stream(iter(lambda: f.read(CSV_CHUNK_SIZE), b''))
+        except OSError as e:
+            metrics.inc('sheet_fetch_failures_total', reason='local_file')
+            logger.warning("❌ Failed to read local sheet for class %s: %s", class_name, e)
+            return None
+        return FetchedSheet(data, version, None, None)
+    
+    def open_stream(self, class_name, timeout=None):
+        path = self._path(class_name)
+        if not os.path.exists(path):
+            return None
+        
+        def read_file():
+            with open(path, 'rb') as f:
+                yield from iter(lambda: f.read(CSV_CHUNK_SIZE), b'')
+        return read_file()
+
+
+class GspreadSource(SheetSource):
+    """Class sheets read through the Sheets API with gspread, many classes per request
+
+    ``classes`` maps each class to where it lives: a worksheet name or A1
+    range in the default ``spreadsheet``, or {"spreadsheet": key, "range": ...}.
+    All classes of one spreadsheet are read with a single values:batchGet call,
+    so refreshing the whole school costs one request per spreadsheet.
+    """
+    name = 'gspread'
+    batched = True
+    
+    def __init__(self, classes, spreadsheet=None, credentials_file=None, client=None):
+        if client is None:
+            try:
+                import gspread
+            except ImportError:
+                raise RuntimeError('gspread is not installed (pip install gspread)') from None
+            client = gspread.service_account(filename=credentials_file) if credentials_file else gspread.service_account()
+        self.client = client
+        self.ranges = {}
+        for class_name, target in classes.items():
+            if isinstance(target, str):
+                key, sheet_range = spreadsheet, target
+            else:
+                key, sheet_range = target.get('spreadsheet', spreadsheet), target.get('range') or class_name
+            if not key:
+                raise ValueError(f"No spreadsheet configured for class {class_name}")
+            # A bare worksheet name reads the whole tab; quote it so names like 1B are not taken for cells
+            if '!' not in sheet_range:
+                sheet_range = "'" + sheet_range.replace("'", "''") + "'"
+            self.ranges[class_name] = (key, sheet_range)
+        self._spreadsheets = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, path):
+        """Build the source from a JSON file: {"credentials": ..., "spreadsheet": ..., "classes": {...}}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['classes'], spreadsheet=config.get('spreadsheet'), credentials_file=config.get('credentials'))
+    
+    def class_names(self):
+        return list(self.ranges)
+    
+    def has_sheet(self, class_name):
+        return class_name in self.ranges
+    
+    def _spreadsheet(self, key):
+        with self._lock:
+            spreadsheet = self._spreadsheets.get(key)
+            if spreadsheet is None:
+                spreadsheet = self._spreadsheets[key] = self.client.open_by_key(key)
+            return spreadsheet
+    
+    def fetch(self, class_name, cached=None, timeout=None):
+        return self.fetch_many([class_name], {class_name: cached})[class_name]
+    
+    def fetch_many(self, class_names, cached):
+        by_spreadsheet = {}
+        for class_name in class_names:
+            if class_name in self.ranges:
+                key, sheet_range = self.ranges[class_name]
+                by_spreadsheet.setdefault(key, []).append((class_name, sheet_range))
+        
+        results = dict.fromkeys(class_names)
+        for key, wanted in by_spreadsheet.items():
+            try:
+                with metrics.span('fetch'):
+                    response = self._spreadsheet(key).values_batch_get([sheet_range for _, sheet_range in wanted])
+                metrics.inc('sheet_fetch_responses_total', status=200)
+            except Exception as e:
+                metrics.inc('sheet_fetch_failures_total', reason=type(e).__name__)
+                logger.error("Error getting data for classes %s: %s", ', '.join(c for c, _ in wanted), e)
+                continue
+            
+            for (class_name, _), value_range in zip(wanted, response.get('valueRanges', [])):
+                rows = [[str(cell) for cell in row] for row in value_range.get('values', [])]
+                version = sheet_version(json.dumps(rows))
+                previous = cached.get(class_name)
+                results[class_name] = NOT_MODIFIED if previous is not None and previous.version == version \
+                    else FetchedSheet(rows, version, None, None)
+        return results
@@ -0,0 +1,24 @@
+$(document).ready(function(){$('#classSelect').change(function(){const selectedClass=$(this).val();const rollSelect=$('#rollSelect');const submitBtn=$('#submitBtn');const loadingIndicator=$('#loadingIndicator');if(selectedClass){loadingIndicator.show();rollSelect.prop('disabled',true);submitBtn.prop('disabled',true);rollSelect.html('<option value="">Loading students...</option>');$.ajax({url:`/api/students/${encodeURIComponent(selectedClass)}`,method:'GET',success:function(response){rollSelect.empty();rollSelect.append('<option value="">Select roll number...</option>');if(response.success&&response.students&&response.students.length>0){response.students.forEach(function(student){const rollNumber=student['Roll Number'];const name=student['Name'];const optionText=`${rollNumber} - ${name}`;rollSelect.append(`<option value="${rollNumber}">${optionText}</option>`);});rollSelect.prop('disabled',false);}else{rollSelect.append('<option value="">No students found</option>');}
+loadingIndicator.hide();},error:function(xhr,status,error){console.error('Error fetching students:',error);rollSelect.html('<option value="">Error loading students</option>');loadingIndicator.hide();alert('Error loading students. Please try again.');}});}else{rollSelect.html('<option value="">First select a class...</option>');rollSelect.prop('disabled',true);submitBtn.prop('disabled',true);}});$('#rollSelect').change(function(){const selectedRoll=$(this).val();const submitBtn=$('#submitBtn');if(selectedRoll){submitBtn.prop('disabled',false);}else{submitBtn.prop('disabled',true);}});$('#studentForm').submit(function(e){e.preventDefault();const selectedClass=$('#classSelect').val();const selectedRoll=$('#rollSelect').val();if(selectedClass&&selectedRoll){const submitBtn=$('#submitBtn');const originalText=submitBtn.html();submitBtn.html('<i class="fas fa-spinner fa-spin me-2"></i>Generating Report...');submitBtn.prop('disabled',true);window.location.href=`/report/${encodeURIComponent(selectedClass)}/${encodeURIComponent(selectedRoll)}`;}else{alert('Please select both class and roll number.');}});let searchTimer=null;let searchRequest=null;$('#studentSearch').on('input',function(){const query=$(this).val().trim();const results=$('#searchResults');clearTimeout(searchTimer);if(!query){results.hide().empty();return;}
+searchTimer=setTimeout(function(){if(searchRequest){searchRequest.abort();}
+searchRequest=$.ajax({url:`/api/search?q=${encodeURIComponent(query)}`,method:'GET',success:function(response){results.empty();if(response.success&&response.results.length>0){response.results.forEach(function(student){const item=$('<a class="list-group-item list-group-item-action"></a>').attr('href',`/report/${encodeURIComponent(student.class)}/${encodeURIComponent(student.roll)}`);item.append($('<span class="fw-bold"></span>').text(student.name));item.append($('<span class="text-muted ms-2"></span>').text(`Class ${student.class} · Roll ${student.roll}`));results.append(item);});}else{results.append('<div class="list-group-item text-muted">No students found</div>');}
+results.show();},error:function(xhr,status){if(status!=='abort'){results.hide().empty();}}});},150);});$(document).on('click',function(e){if(!$(e.target).closest('#studentSearch, #searchResults').length){$('#searchResults').hide();}});$('.card').addClass('fade-in');$(window).resize(function(){adjustTableResponsiveness();});function adjustTableResponsiveness(){if($(window).width()<768){$('.table-responsive').addClass('small-screen');}else{$('.table-responsive').removeClass('small-screen');}}
+adjustTableResponsiveness();});function showSuccessMessage(message){const alertHtml=`
+        <div class="alert alert-success alert-dismissible fade show" role="alert">
+            <i class="fas fa-check-circle me-2"></i>
+            ${message}
+            <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+        </div>
+    `;$('.container').prepend(alertHtml);setTimeout(function(){$('.alert').alert('close');},5000);}
+function showErrorMessage(message){const alertHtml=`
+        <div class="alert alert-danger alert-dismissible fade show" role="alert">
+            <i class="fas fa-exclamation-circle me-2"></i>
+            ${message}
+            <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+        </div>
+    `;$('.container').prepend(alertHtml);setTimeout(function(){$('.alert').alert('close');},5000);}
+function validateForm(){const classValue=$('#classSelect').val();const rollValue=$('#rollSelect').val();if(!classValue){showErrorMessage('Please select a class.');return false;}
+if(!rollValue){showErrorMessage('Please select a roll number.');return false;}
+return true;}
+$(document).keydown(function(e){if(e.ctrlKey&&e.key==='r'){e.preventDefault();if(validateForm()){$('#studentForm').submit();}}
+if(e.key==='Escape'){$('#classSelect').val('').trigger('change');$('#studentSearch').val('');$('#searchResults').hide().empty();}});$(function(){$('[data-bs-toggle="tooltip"]').tooltip();});if('serviceWorker'in navigator){window.addEventListener('load',function(){navigator.serviceWorker.register('/static/js/sw.js').then(function(registration){console.log('ServiceWorker registration successful');}).catch(function(error){console.log('ServiceWorker registration failed');});});}
\ No newline at end of file
@@ -90,6 +90,58 @@ $(document).ready(function() {
         }
     });
     
+    // Type-ahead search across every class
+    let searchTimer = null;
+    let searchRequest = null;
+    $('#studentSearch').on('input', function() {
+        const query = $(this).val().trim();
+        const results = $('#searchResults');
+        
+        clearTimeout(searchTimer);
+        if (!query) {
+            results.hide().empty();
+            return;
+        }
+        
+        searchTimer = setTimeout(function() {
+            if (searchRequest) {
+                searchRequest.abort();
+            }
+            searchRequest = $.ajax({
+                url: `/api/search?q=${encodeURIComponent(query)}`,
+                method: 'GET',
+                success: function(response) {
+                    results.empty();
+                    if (response.success && response.results.length > 0) {
+                        response.results.forEach(function(student) {
+                            const item = $('<a class="list-group-item list-group-item-action"></a>')
+                                .attr('href', `/report/${encodeURIComponent(student.class)}/${encodeURIComponent(student.roll)}`);
+                            item.append($('<span class="fw-bold"></span>').text(student.name));
+                            item.append($('<span class="text-muted ms-2"></span>').text(`Class ${student.class} · Roll ${student.roll}`));
+                            results.append(item);
+                        });
+                    } else {
+                        results.append('<div class="list-group-item text-muted">No students found</div>');
+                    }
+                    results.show();
+                },
+                error: function(xhr, status) {
+                    // Aborted by a newer keystroke, or search is unavailable (e.g. static export)
+                    if (status !== 'abort') {
+                        results.hide().empty();
+                    }
+                }
+            });
+        }, 150);
+    });
+    
+    // Hide search results when clicking elsewhere
+    $(document).on('click', function(e) {
+        if (!$(e.target).closest('#studentSearch, #searchResults').length) {
+            $('#searchResults').hide();
+        }
+    });
+    
     // Add smooth animations
     $('.card').addClass('fade-in');
     
@@ -179,6 +231,8 @@ $(document).keydown(function(e) {
     // Escape to clear form
     if (e.key === 'Escape') {
         $('#classSelect').val('').trigger('change');
+        $('#studentSearch').val('');
+        $('#searchResults').hide().empty();
     }
 });
 
@@ -0,0 +1,63 @@
+"""Synthetic class sheets in the published-CSV layout the connector parses.
+
+Each subject section is laid out exactly like the real sheets:
+
+    Class    | 1B   |       |       | ...
+    Roll No. | Name | Topic 1 |     | Topic 2 |     | ...
+             |      | Time  | Marks | Time  | Marks | ...
+    1        | ...  | Below Average | 10 | Above Average | 7 | ...
+
+Used by the benchmark suite and anything else that needs school-scale data
+without touching Google Sheets.
+"""
+import csv
+import os
+import random
+from io import StringIO
+
+TIME_VALUES = ('Below Average', 'Above Average')
+
+
+def generate_class_rows(class_name='1B', students=40, topics=10, sections=2, seed=0, blank_ratio=0.1):
+    """Rows of a synthetic class sheet with ``sections`` subject blocks
+
+    ``blank_ratio`` of the marks cells are left empty, the way untested topics
+    appear in real sheets.
+    """
+    rnd = random.Random(f"{class_name}/{students}/{topics}/{sections}/{seed}")
+    width = 2 + 2 * topics
+    rows = []
+    for _ in range(sections):
+        rows.append(['Class', class_name] + [''] * (width - 2))
+        header = ['Roll No.', 'Name']
+        for topic in range(1, topics + 1):
+            header += [f'Topic {topic}', '']
+        rows.append(header)
+        rows.append(['', ''] + ['Time', 'Marks'] * topics)
+        for roll in range(1, students + 1):
+            row = [str(roll), f'Student {roll:04d}']
+            for _ in range(topics):
+                if rnd.random() < blank_ratio:
+                    row += ['', '']
+                else:
+                    row += [rnd.choice(TIME_VALUES), str(rnd.randint(0, 12))]
+            rows.append(row)
+        rows.append([''] * width)
+    return rows
+
+
+def generate_class_csv(class_name='1B', students=40, topics=10, sections=2, seed=0, blank_ratio=0.1):
+    """The same synthetic sheet serialised as CSV text"""
+    out = StringIO()
+    csv.writer(out, lineterminator='\n').writerows(
+        generate_class_rows(class_name, students, topics, sections, seed, blank_ratio))
+    return out.getvalue()
+
+
+def write_school(directory, class_names, students=40, topics=10, sections=2, seed=0):
+    """Write <class>.csv for every class (usable as SHEETS_LOCAL_DIR)"""
+    os.makedirs(directory, exist_ok=True)
+    for class_name in class_names:
+        with open(os.path.join(directory, f"{class_name}.csv"), 'w', encoding='utf-8', newline='') as f:
+            f.write(generate_class_csv(class_name, students, topics, sections, seed))
+    return directory
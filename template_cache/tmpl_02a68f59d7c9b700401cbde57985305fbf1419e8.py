@@ -0,0 +1,18 @@
+# jinja2 3.1 8570a1fc3f55f8254a43974985c69fe1a0b0e9d4 error.html
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'error.html'
+
+def root(context, missing=missing, environment=environment):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_message = resolve('message')
+    pass
+    yield '<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n    <title>Error - Student Report System</title>\n    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">\n    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">\n</head>\n<body>\n    <div class="container mt-5">\n        <div class="row justify-content-center">\n            <div class="col-lg-6 col-md-8">\n                <div class="card shadow">\n                    <div class="card-body text-center p-5">\n                        <i class="fas fa-exclamation-triangle fa-3x text-warning mb-3"></i>\n                        <h2 class="text-danger mb-3">Oops! Something went wrong</h2>\n                        <p class="lead">'
+    yield escape((undefined(name='message') if l_0_message is missing else l_0_message))
+    yield '</p>\n                        <a href="/" class="btn btn-primary mt-3">\n                            <i class="fas fa-arrow-left me-2"></i>Go Back to Search\n                        </a>\n                    </div>\n                </div>\n            </div>\n        </div>\n    </div>\n</body>\n</html>'
+
+blocks = {}
+debug_info = '18=13'
\ No newline at end of file
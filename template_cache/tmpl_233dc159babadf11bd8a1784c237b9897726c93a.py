@@ -0,0 +1,444 @@
+# jinja2 3.1 08ba20e6a54bb350e4531cec9c448947aa92dd7d topic_report.html
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'topic_report.html'
+
+def root(context, missing=missing, environment=environment):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_student = resolve('student')
+    l_0_asset_url = resolve('asset_url')
+    l_0_total_topics = resolve('total_topics')
+    l_0_total_marks = resolve('total_marks')
+    l_0_total_time_numeric = resolve('total_time_numeric')
+    l_0_has_numeric_time = resolve('has_numeric_time')
+    l_0_avg_marks = resolve('avg_marks')
+    l_0_stamp_in_browser = resolve('stamp_in_browser')
+    l_0_report_time = resolve('report_time')
+    l_0_url_for = resolve('url_for')
+    try:
+        t_1 = environment.filters['float']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'float' found.")
+    try:
+        t_2 = environment.filters['format']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'format' found.")
+    try:
+        t_3 = environment.filters['int']
+    except KeyError:
+        @internalcode
+        def t_3(*unused):
+            raise TemplateRuntimeError("No filter named 'int' found.")
+    try:
+        t_4 = environment.filters['length']
+    except KeyError:
+        @internalcode
+        def t_4(*unused):
+            raise TemplateRuntimeError("No filter named 'length' found.")
+    try:
+        t_5 = environment.filters['list']
+    except KeyError:
+        @internalcode
+        def t_5(*unused):
+            raise TemplateRuntimeError("No filter named 'list' found.")
+    try:
+        t_6 = environment.filters['lower']
+    except KeyError:
+        @internalcode
+        def t_6(*unused):
+            raise TemplateRuntimeError("No filter named 'lower' found.")
+    try:
+        t_7 = environment.filters['round']
+    except KeyError:
+        @internalcode
+        def t_7(*unused):
+            raise TemplateRuntimeError("No filter named 'round' found.")
+    try:
+        t_8 = environment.filters['selectattr']
+    except KeyError:
+        @internalcode
+        def t_8(*unused):
+            raise TemplateRuntimeError("No filter named 'selectattr' found.")
+    pass
+    yield '<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n    <title>Student Report - '
+    yield escape(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Name'))
+    yield '</title>\n    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">\n    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">\n    <link href="'
+    yield escape(context.call((undefined(name='asset_url') if l_0_asset_url is missing else l_0_asset_url), 'css/style.css'))
+    yield '" rel="stylesheet">\n        <!-- Chart.js CDN -->\n    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>\n    <style>\n        @media print {\n            .no-print { display: none !important; }\n            .container { max-width: 100% !important; }\n        }\n        .topic-card {\n            border-left: 4px solid #007bff;\n            transition: all 0.3s ease;\n            background: linear-gradient(135deg, #fff 0%, #f8f9fa 100%);\n        }\n        .topic-card:hover {\n            border-left-color: #0056b3;\n            transform: translateY(-2px);\n            box-shadow: 0 8px 25px rgba(0,123,255,0.15);\n        }\n        .progress-circle {\n            width: 80px;\n            height: 80px;\n            border-radius: 50%;\n            display: flex;\n            align-items: center;\n            justify-content: center;\n            font-weight: bold;\n            color: white;\n            position: relative;\n            overflow: hidden;\n        }\n        .progress-circle::before {\n            content: \'\';\n            position: absolute;\n            top: 0;\n            left: 0;\n            right: 0;\n            bottom: 0;\n            border-radius: 50%;\n            background: rgba(255,255,255,0.2);\n        }\n        .score-excellent { background: linear-gradient(135deg, #28a745, #20c997); }\n        .score-good { background: linear-gradient(135deg, #17a2b8, #007bff); }\n        .score-average { background: linear-gradient(135deg, #ffc107, #fd7e14); }\n        .score-poor { background: linear-gradient(135deg, #dc3545, #e83e8c); }\n        \n        /* Subject tabs styling */\n        .nav-tabs .nav-link {\n            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);\n            border: 1px solid #dee2e6;\n            color: #495057;\n            font-weight: 500;\n            transition: all 0.3s ease;\n        }\n        .nav-tabs .nav-link:hover {\n            background: linear-gradient(135deg, #e9ecef 0%, #dee2e6 100%);\n            border-color: #adb5bd;\n        }\n        .nav-tabs .nav-link.active {\n            background: linear-gradient(135deg, #007bff 0%, #0056b3 100%);\n            border-color: #007bff;\n            color: white;\n        }\n        .tab-content {\n            border: 1px solid #dee2e6;\n            border-top: none;\n            border-radius: 0 0 0.375rem 0.375rem;\n            background: white;\n            position: relative;\n            overflow: hidden;\n        }\n        \n        /* Ensure only active tab content is visible */\n        .tab-pane {\n            display: none !important;\n            opacity: 0;\n            visibility: hidden;\n        }\n        \n        .tab-pane.active {\n            display: block !important;\n            opacity: 1;\n            visibility: visible;\n        }\n        \n        .tab-pane.show.active {\n            display: block !important;\n            opacity: 1;\n            visibility: visible;\n        }\n        \n        /* Force hide non-active tabs */\n        .tab-pane:not(.active) {\n            display: none !important;\n        }\n        \n        .metric-card {\n            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);\n            border: none;\n            border-radius: 15px;\n            transition: all 0.3s ease;\n        }\n        .metric-card:hover {\n            transform: translateY(-5px);\n            box-shadow: 0 10px 25px rgba(102, 126, 234, 0.3);\n        }\n        \n        .report-header {\n            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);\n            border-radius: 15px 15px 0 0;\n        }\n        \n        .topic-badge {\n            font-size: 0.9rem;\n            padding: 8px 12px;\n            border-radius: 20px;\n        }\n        \n        .performance-indicator {\n            width: 12px;\n            height: 12px;\n            border-radius: 50%;\n            display: inline-block;\n            margin-right: 8px;\n        }\n        \n        /* Chart container styling */\n        .chart-container {\n            background: rgba(255, 255, 255, 0.95);\n            border-radius: 10px;\n            padding: 20px;\n            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);\n            width: 100%;\n            min-height: 400px;\n        }\n        \n        .chart-container canvas {\n            width: 100% !important;\n            height: 400px !important;\n        }\n        \n        .chart-container > div {\n            width: 100%;\n            height: 100%;\n        }\n        \n        .chart-legend {\n            display: flex;\n            justify-content: center;\n            gap: 20px;\n            margin-top: 15px;\n        }\n        \n        .legend-item {\n            display: flex;\n            align-items: center;\n            font-size: 0.85rem;\n            color: #6c757d;\n        }\n        \n        .legend-color {\n            width: 12px;\n            height: 12px;\n            border-radius: 50%;\n            margin-right: 8px;\n        }\n    </style>\n</head>\n<body class="bg-light">\n    <div class="container mt-4">\n        <!-- Header with Back Button -->\n        <div class="row no-print mb-4">\n            <div class="col-12">\n                <a href="/" class="btn btn-outline-secondary">\n                    <i class="fas fa-arrow-left me-2"></i>Back to Search\n                </a>\n                <button onclick="window.print()" class="btn btn-primary float-end">\n                    <i class="fas fa-print me-2"></i>Print Report\n                </button>\n            </div>\n        </div>\n\n        <!-- Report Card -->\n        <div class="card shadow-lg border-0">\n            <!-- Header -->\n            <div class="card-header report-header text-white text-center py-5">\n                <h1 class="mb-3 fw-bold">\n                    <i class="fas fa-chart-line me-3"></i>\n                    Academic Performance Report\n                </h1>\n                <p class="mb-0 fs-5 opacity-90">Topic-wise Assessment & Analytics</p>\n            </div>\n\n            <!-- Student Information -->\n            <div class="card-body p-4">\n                '
+    if environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'subjects'):
+        pass
+        yield '\n                    \n                    '
+        l_0_total_topics = 0
+        context.vars['total_topics'] = l_0_total_topics
+        context.exported_vars.add('total_topics')
+        yield '\n                    '
+        l_0_total_marks = 0
+        context.vars['total_marks'] = l_0_total_marks
+        context.exported_vars.add('total_marks')
+        yield '\n                    '
+        l_0_total_time_numeric = 0
+        context.vars['total_time_numeric'] = l_0_total_time_numeric
+        context.exported_vars.add('total_time_numeric')
+        yield '\n                    '
+        l_0_has_numeric_time = False
+        context.vars['has_numeric_time'] = l_0_has_numeric_time
+        context.exported_vars.add('has_numeric_time')
+        yield '\n                    '
+        for (l_1_subject_name, l_1_subject_data) in context.call(environment.getattr(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'subjects'), 'items')):
+            l_1_total_topics = l_0_total_topics
+            _loop_vars = {}
+            pass
+            yield '\n                        '
+            l_1_total_topics = ((undefined(name='total_topics') if l_1_total_topics is missing else l_1_total_topics) + t_4(environment.getattr(l_1_subject_data, 'topics')))
+            _loop_vars['total_topics'] = l_1_total_topics
+            yield '\n                        '
+            for l_2_topic in environment.getattr(l_1_subject_data, 'topics'):
+                l_2_total_marks = l_0_total_marks
+                l_2_total_time_numeric = l_0_total_time_numeric
+                l_2_has_numeric_time = l_0_has_numeric_time
+                _loop_vars = {}
+                pass
+                yield '\n                            '
+                l_2_total_marks = ((undefined(name='total_marks') if l_2_total_marks is missing else l_2_total_marks) + t_1(environment.getattr(l_2_topic, 'marks')))
+                _loop_vars['total_marks'] = l_2_total_marks
+                yield '\n                            '
+                if (environment.getattr(l_2_topic, 'time_category') and context.call(environment.getattr(context.call(environment.getattr(environment.getattr(l_2_topic, 'time_category'), 'replace'), '.', '', _loop_vars=_loop_vars), 'isdigit'), _loop_vars=_loop_vars)):
+                    pass
+                    yield '\n                                '
+                    l_2_total_time_numeric = ((undefined(name='total_time_numeric') if l_2_total_time_numeric is missing else l_2_total_time_numeric) + t_1(environment.getattr(l_2_topic, 'time_category')))
+                    _loop_vars['total_time_numeric'] = l_2_total_time_numeric
+                    yield '\n                                '
+                    l_2_has_numeric_time = True
+                    _loop_vars['has_numeric_time'] = l_2_has_numeric_time
+                    yield '\n                            '
+                yield '\n                        '
+            l_2_topic = l_2_total_marks = l_2_total_time_numeric = l_2_has_numeric_time = missing
+            yield '\n                    '
+        l_1_subject_name = l_1_subject_data = l_1_total_topics = missing
+        yield '\n                    '
+        l_0_avg_marks = (((undefined(name='total_marks') if l_0_total_marks is missing else l_0_total_marks) / (undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics)) if ((undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics) > 0) else 0)
+        context.vars['avg_marks'] = l_0_avg_marks
+        context.exported_vars.add('avg_marks')
+        yield '\n                '
+    else:
+        pass
+        yield '\n                    \n                    '
+        l_0_total_topics = t_4(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'topics'))
+        context.vars['total_topics'] = l_0_total_topics
+        context.exported_vars.add('total_topics')
+        yield '\n                    '
+        l_0_total_marks = 0
+        context.vars['total_marks'] = l_0_total_marks
+        context.exported_vars.add('total_marks')
+        yield '\n                    '
+        l_0_total_time_numeric = 0
+        context.vars['total_time_numeric'] = l_0_total_time_numeric
+        context.exported_vars.add('total_time_numeric')
+        yield '\n                    '
+        l_0_has_numeric_time = False
+        context.vars['has_numeric_time'] = l_0_has_numeric_time
+        context.exported_vars.add('has_numeric_time')
+        yield '\n                    '
+        for l_1_topic in environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'topics'):
+            l_1_total_marks = l_0_total_marks
+            l_1_total_time_numeric = l_0_total_time_numeric
+            l_1_has_numeric_time = l_0_has_numeric_time
+            _loop_vars = {}
+            pass
+            yield '\n                        '
+            l_1_total_marks = ((undefined(name='total_marks') if l_1_total_marks is missing else l_1_total_marks) + t_1(environment.getattr(l_1_topic, 'marks')))
+            _loop_vars['total_marks'] = l_1_total_marks
+            yield '\n                        '
+            if (environment.getattr(l_1_topic, 'time') and context.call(environment.getattr(context.call(environment.getattr(environment.getattr(l_1_topic, 'time'), 'replace'), '.', '', _loop_vars=_loop_vars), 'isdigit'), _loop_vars=_loop_vars)):
+                pass
+                yield '\n                            '
+                l_1_total_time_numeric = ((undefined(name='total_time_numeric') if l_1_total_time_numeric is missing else l_1_total_time_numeric) + t_1(environment.getattr(l_1_topic, 'time')))
+                _loop_vars['total_time_numeric'] = l_1_total_time_numeric
+                yield '\n                            '
+                l_1_has_numeric_time = True
+                _loop_vars['has_numeric_time'] = l_1_has_numeric_time
+                yield '\n                        '
+            yield '\n                    '
+        l_1_topic = l_1_total_marks = l_1_total_time_numeric = l_1_has_numeric_time = missing
+        yield '\n                    '
+        l_0_avg_marks = (((undefined(name='total_marks') if l_0_total_marks is missing else l_0_total_marks) / (undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics)) if ((undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics) > 0) else 0)
+        context.vars['avg_marks'] = l_0_avg_marks
+        context.exported_vars.add('avg_marks')
+        yield '\n                '
+    yield '\n                \n                <div class="row mb-5">\n                    <div class="col-lg-8">\n                        <h2 class="text-primary border-bottom pb-3 mb-4">\n                            <i class="fas fa-user-graduate me-2"></i>Student Information\n                        </h2>\n                        <div class="row">\n                            <div class="col-md-6">\n                                <div class="mb-3">\n                                    <label class="fw-bold text-muted">Student Name</label>\n                                    <div class="fs-5 fw-bold text-dark">'
+    yield escape(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Name'))
+    yield '</div>\n                                </div>\n                                <div class="mb-3">\n                                    <label class="fw-bold text-muted">Roll Number</label>\n                                    <div class="fs-5 fw-bold text-dark">'
+    yield escape(environment.getitem((undefined(name='student') if l_0_student is missing else l_0_student), 'Roll Number'))
+    yield '</div>\n                                </div>\n                            </div>\n                            <div class="col-md-6">\n                                <div class="mb-3">\n                                    <label class="fw-bold text-muted">Class</label>\n                                    <div class="fs-5 fw-bold text-dark">'
+    yield escape(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Class'))
+    yield '</div>\n                                </div>\n                                <div class="mb-3">\n                                    <label class="fw-bold text-muted">Total Topics</label>\n                                    <div class="fs-5 fw-bold text-dark">'
+    yield escape((undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics))
+    yield '</div>\n                                </div>\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-lg-4 text-center">\n                        <div class="progress-circle score-'
+    if ((undefined(name='avg_marks') if l_0_avg_marks is missing else l_0_avg_marks) >= 10):
+        pass
+        yield 'excellent'
+    elif ((undefined(name='avg_marks') if l_0_avg_marks is missing else l_0_avg_marks) >= 8):
+        pass
+        yield 'good'
+    elif ((undefined(name='avg_marks') if l_0_avg_marks is missing else l_0_avg_marks) >= 6):
+        pass
+        yield 'average'
+    else:
+        pass
+        yield 'poor'
+    yield ' mx-auto">\n                            <div>\n                                <div style="font-size: 1.5rem;">'
+    yield escape(t_2('%.1f', (undefined(name='avg_marks') if l_0_avg_marks is missing else l_0_avg_marks)))
+    yield '</div>\n                                <small>Avg Score</small>\n                            </div>\n                        </div>\n                        <div class="mt-3">\n                            <small class="text-muted">Overall Performance</small>\n                        </div>\n                    </div>\n                </div>\n\n                <!-- Summary Statistics -->\n                <div class="row mb-5">\n                    <div class="col-md-3 col-6 mb-3">\n                        <div class="card metric-card text-white text-center border-0 shadow">\n                            <div class="card-body p-4">\n                                <i class="fas fa-list-ol fa-2x mb-3 opacity-75"></i>\n                                <h3 class="fw-bold">'
+    yield escape((undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics))
+    yield '</h3>\n                                <p class="mb-0 opacity-90">Total Topics</p>\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-md-3 col-6 mb-3">\n                        <div class="card text-white text-center border-0 shadow" style="background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);">\n                            <div class="card-body p-4">\n                                <i class="fas fa-clock fa-2x mb-3 opacity-75"></i>\n                                '
+    if (undefined(name='has_numeric_time') if l_0_has_numeric_time is missing else l_0_has_numeric_time):
+        pass
+        yield '\n                                    <h3 class="fw-bold">'
+        yield escape(t_2('%.0f', (undefined(name='total_time_numeric') if l_0_total_time_numeric is missing else l_0_total_time_numeric)))
+        yield '</h3>\n                                    <p class="mb-0 opacity-90">Total Minutes</p>\n                                '
+    else:
+        pass
+        yield '\n                                    <h3 class="fw-bold">'
+        yield escape((undefined(name='total_topics') if l_0_total_topics is missing else l_0_total_topics))
+        yield '</h3>\n                                    <p class="mb-0 opacity-90">Time Categories</p>\n                                '
+    yield '\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-md-3 col-6 mb-3">\n                        <div class="card text-white text-center border-0 shadow" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">\n                            <div class="card-body p-4">\n                                <i class="fas fa-trophy fa-2x mb-3 opacity-75"></i>\n                                <h3 class="fw-bold">'
+    yield escape(t_2('%.1f', (undefined(name='total_marks') if l_0_total_marks is missing else l_0_total_marks)))
+    yield '</h3>\n                                <p class="mb-0 opacity-90">Total Score</p>\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-md-3 col-6 mb-3">\n                        <div class="card text-white text-center border-0 shadow" style="background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);">\n                            <div class="card-body p-4">\n                                <i class="fas fa-chart-line fa-2x mb-3 opacity-75"></i>\n                                <h3 class="fw-bold">'
+    yield escape(t_2('%.1f', (undefined(name='avg_marks') if l_0_avg_marks is missing else l_0_avg_marks)))
+    yield '</h3>\n                                <p class="mb-0 opacity-90">Average Score</p>\n                            </div>\n                        </div>\n                    </div>\n                </div>\n\n                <!-- Topic-wise Performance -->\n                <div class="row mb-5">\n                    <div class="col-12">\n                        <h2 class="text-primary border-bottom pb-3 mb-4">\n                            <i class="fas fa-tasks me-2"></i>Topic-wise Performance\n                        </h2>\n                        \n                        '
+    if environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'subjects'):
+        pass
+        yield '\n                        <!-- Multi-subject layout with tabs -->\n                        <ul class="nav nav-tabs" id="subjectTabs" role="tablist">\n                            '
+        for (l_1_subject_name, l_1_subject_data) in context.call(environment.getattr(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'subjects'), 'items')):
+            _loop_vars = {}
+            pass
+            yield '\n                            <li class="nav-item" role="presentation">\n                                <button class="nav-link" \n                                        id="'
+            yield escape(t_6(l_1_subject_name))
+            yield '-tab" \n                                        data-bs-target="#'
+            yield escape(t_6(l_1_subject_name))
+            yield '" \n                                        type="button" \n                                        role="tab" \n                                        aria-controls="'
+            yield escape(t_6(l_1_subject_name))
+            yield '" \n                                        aria-selected="false">\n                                    <i class="fas fa-'
+            if (l_1_subject_name == 'Maths'):
+                pass
+                yield 'calculator'
+            elif (l_1_subject_name == 'Science'):
+                pass
+                yield 'flask'
+            else:
+                pass
+                yield 'book'
+            yield ' me-2"></i>\n                                    '
+            yield escape(l_1_subject_name)
+            yield '\n                                </button>\n                            </li>\n                            '
+        l_1_subject_name = l_1_subject_data = missing
+        yield '\n                        </ul>\n                        \n                        <div class="tab-content p-4" id="subjectTabContent">\n                            '
+        for (l_1_subject_name, l_1_subject_data) in context.call(environment.getattr(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'subjects'), 'items')):
+            l_1_subject_strong_topics = resolve('subject_strong_topics')
+            l_1_subject_need_attention_topics = resolve('subject_need_attention_topics')
+            l_1_subject_weak_topics = resolve('subject_weak_topics')
+            _loop_vars = {}
+            pass
+            yield '\n                            <div class="tab-pane fade" \n                                 id="'
+            yield escape(t_6(l_1_subject_name))
+            yield '" \n                                 role="tabpanel" \n                                 aria-labelledby="'
+            yield escape(t_6(l_1_subject_name))
+            yield '-tab">\n                                \n                                '
+            if environment.getattr(l_1_subject_data, 'topics'):
+                pass
+                yield '\n                                <div class="row">\n                                    '
+                for l_2_topic in environment.getattr(l_1_subject_data, 'topics'):
+                    l_2_marks_num = missing
+                    _loop_vars = {}
+                    pass
+                    yield '\n                                    '
+                    l_2_marks_num = t_1(environment.getattr(l_2_topic, 'marks'))
+                    _loop_vars['marks_num'] = l_2_marks_num
+                    yield '\n                                    <div class="col-lg-6 col-md-12 mb-4">\n                                        <div class="card topic-card h-100 border-0 shadow-sm">\n                                            <div class="card-body p-4">\n                                                <div class="d-flex justify-content-between align-items-start mb-3">\n                                                    <h5 class="card-title mb-0 fw-bold">\n                                                        <i class="fas fa-book me-2 text-primary"></i>\n                                                        '
+                    yield escape(environment.getattr(l_2_topic, 'name'))
+                    yield '\n                                                    </h5>\n                                                    <span class="topic-badge '
+                    yield escape(environment.getattr(l_2_topic, 'performance_class'))
+                    yield '">\n                                                        '
+                    yield escape(environment.getattr(l_2_topic, 'marks'))
+                    yield '\n                                                    </span>\n                                                </div>\n                                                \n                                                <div class="row mb-3">\n                                                    <div class="col-6">\n                                                        <div class="d-flex align-items-center">\n                                                            <i class="fas fa-clock text-info me-2"></i>\n                                                            <div>\n                                                                <small class="text-muted d-block">Time Category</small>\n                                                                <span class="fw-bold '
+                    if ('below' in context.call(environment.getattr(environment.getattr(l_2_topic, 'time_category'), 'lower'), _loop_vars=_loop_vars)):
+                        pass
+                        yield 'text-success'
+                    else:
+                        pass
+                        yield 'text-warning'
+                    yield '">\n                                                                    '
+                    yield escape(environment.getattr(l_2_topic, 'time_category'))
+                    yield '\n                                                                </span>\n                                                            </div>\n                                                        </div>\n                                                    </div>\n                                                    <div class="col-6">\n                                                        <div class="d-flex align-items-center">\n                                                            <i class="fas fa-star text-warning me-2"></i>\n                                                            <div>\n                                                                <small class="text-muted d-block">Score</small>\n                                                                <span class="fw-bold">'
+                    yield escape(environment.getattr(l_2_topic, 'marks'))
+                    yield '/12</span>\n                                                            </div>\n                                                        </div>\n                                                    </div>\n                                                </div>\n                                                \n                                                <!-- Rank Display -->\n                                                <div class="row mb-3">\n                                                    <div class="col-12">\n                                                        <div class="d-flex align-items-center justify-content-center">\n                                                            <i class="fas fa-trophy text-success me-2"></i>\n                                                            <div class="text-center">\n                                                                <small class="text-muted d-block">Class Rank</small>\n                                                                <span class="fw-bold fs-5 text-primary">\n                                                                    '
+                    if (environment.getattr(l_2_topic, 'rank') != 'N/A'):
+                        pass
+                        yield '\n                                                                        #'
+                        yield escape(environment.getattr(l_2_topic, 'rank'))
+                        yield '\n                                                                    '
+                    else:
+                        pass
+                        yield '\n                                                                        Not Ranked\n                                                                    '
+                    yield '\n                                                                </span>\n                                                            </div>\n                                                        </div>\n                                                    </div>\n                                                </div>\n                                                \n                                                <!-- Progress bar based on marks out of 12 -->\n                                                <div class="mb-2">\n                                                    <div class="d-flex justify-content-between align-items-center mb-1">\n                                                        <small class="text-muted">Performance</small>\n                                                        <small class="text-muted">'
+                    yield escape(t_3(t_7((((undefined(name='marks_num') if l_2_marks_num is missing else l_2_marks_num) / 12) * 100))))
+                    yield '%</small>\n                                                    </div>\n                                                    <div class="progress" style="height: 8px; border-radius: 10px;">\n                                                        <div class="progress-bar '
+                    yield escape(environment.getattr(l_2_topic, 'performance_class'))
+                    yield '" \n                                                             style="width: '
+                    yield escape(t_7((((undefined(name='marks_num') if l_2_marks_num is missing else l_2_marks_num) / 12) * 100)))
+                    yield '%; border-radius: 10px;"></div>\n                                                    </div>\n                                                </div>\n                                                \n                                                <!-- Performance indicator -->\n                                                <div class="mt-2">\n                                                    <span class="performance-indicator '
+                    yield escape(environment.getattr(l_2_topic, 'performance_class'))
+                    yield '"></span>\n                                                    <small class="text-muted">'
+                    yield escape(environment.getattr(l_2_topic, 'performance_text'))
+                    yield '</small>\n                                                </div>\n                                            </div>\n                                        </div>\n                                    </div>\n                                    '
+                l_2_topic = l_2_marks_num = missing
+                yield '\n                                </div>\n                                \n                                <!-- Subject-specific Performance Analysis -->\n                                '
+                l_1_subject_strong_topics = t_5(context.eval_ctx, t_8(context, environment.getattr(l_1_subject_data, 'topics'), 'color', 'equalto', 'green'))
+                _loop_vars['subject_strong_topics'] = l_1_subject_strong_topics
+                yield '\n                                '
+                l_1_subject_need_attention_topics = t_5(context.eval_ctx, t_8(context, environment.getattr(l_1_subject_data, 'topics'), 'color', 'equalto', 'orange'))
+                _loop_vars['subject_need_attention_topics'] = l_1_subject_need_attention_topics
+                yield '\n                                '
+                l_1_subject_weak_topics = t_5(context.eval_ctx, t_8(context, environment.getattr(l_1_subject_data, 'topics'), 'color', 'equalto', 'red'))
+                _loop_vars['subject_weak_topics'] = l_1_subject_weak_topics
+                yield '\n                                \n                                <div class="row mt-4">\n                                    <div class="col-12">\n                                        <div class="card border-0 shadow-sm">\n                                            <div class="card-body p-4">\n                                                <h5 class="card-title">\n                                                    <i class="fas fa-chart-bar me-2 text-primary"></i>\n                                                    '
+                yield escape(l_1_subject_name)
+                yield ' Performance Analysis\n                                                </h5>\n                                                \n                                                <!-- Performance Overview for this subject -->\n                                                <div class="row mb-4">\n                                                    <div class="col-md-6">\n                                                        <h6 class="text-muted mb-3">Performance Overview</h6>\n                                                        '
+                if ((t_4((undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics)) > t_4((undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics))) and (t_4((undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics)) > t_4((undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics)))):
+                    pass
+                    yield '\n                                                            <div class="alert alert-success border-0 shadow-sm">\n                                                                <i class="fas fa-trophy me-2"></i>\n                                                                <strong>Good Going!</strong><br>\n                                                                <small>Strong performance in '
+                    yield escape(l_1_subject_name)
+                    yield ' with efficient learning patterns.</small>\n                                                            </div>\n                                                        '
+                elif ((t_4((undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics)) > t_4((undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics))) and (t_4((undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics)) > t_4((undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics)))):
+                    pass
+                    yield '\n                                                            <div class="alert alert-warning border-0 shadow-sm">\n                                                                <i class="fas fa-exclamation-triangle me-2"></i>\n                                                                <strong>Need Attention.</strong><br>\n                                                                <small>Good scores in '
+                    yield escape(l_1_subject_name)
+                    yield ' but work on time efficiency.</small>\n                                                            </div>\n                                                        '
+                elif (t_4((undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics)) > 0):
+                    pass
+                    yield '\n                                                            <div class="alert alert-danger border-0 shadow-sm">\n                                                                <i class="fas fa-flag me-2"></i>\n                                                                <strong>Need Immediate Attention.</strong><br>\n                                                                <small>Focus on strengthening '
+                    yield escape(l_1_subject_name)
+                    yield ' fundamentals.</small>\n                                                            </div>\n                                                        '
+                else:
+                    pass
+                    yield '\n                                                            <div class="alert alert-info border-0 shadow-sm">\n                                                                <i class="fas fa-info-circle me-2"></i>\n                                                                <strong>Getting Started.</strong><br>\n                                                                <small>Continue working on '
+                    yield escape(l_1_subject_name)
+                    yield ' topics.</small>\n                                                            </div>\n                                                        '
+                yield '\n                                                        \n                                                        <!-- Category breakdown for this subject -->\n                                                        <div class="mt-3">\n                                                            <h6 class="text-muted mb-2">'
+                yield escape(l_1_subject_name)
+                yield ' Category Breakdown:</h6>\n                                                            <div class="row text-center">\n                                                                <div class="col-4">\n                                                                    <div class="text-success fw-bold">'
+                yield escape(t_4((undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics)))
+                yield '</div>\n                                                                    <small class="text-muted">Strong</small>\n                                                                </div>\n                                                                <div class="col-4">\n                                                                    <div class="text-warning fw-bold">'
+                yield escape(t_4((undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics)))
+                yield '</div>\n                                                                    <small class="text-muted">Need Attention</small>\n                                                                </div>\n                                                                <div class="col-4">\n                                                                    <div class="text-danger fw-bold">'
+                yield escape(t_4((undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics)))
+                yield '</div>\n                                                                    <small class="text-muted">Weak</small>\n                                                                </div>\n                                                            </div>\n                                                        </div>\n                                                    </div>\n                                                    \n                                                    <div class="col-md-6">\n                                                        <h6 class="text-muted mb-3">'
+                yield escape(l_1_subject_name)
+                yield ' Topic Analysis</h6>\n                                                        \n                                                        <!-- Strong Topics for this subject -->\n                                                        <div class="mb-3">\n                                                            <h6 class="text-success mb-2">\n                                                                <i class="fas fa-star me-1"></i>Strong Topics ('
+                yield escape(t_4((undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics)))
+                yield ')\n                                                            </h6>\n                                                            '
+                if (undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics):
+                    pass
+                    yield '\n                                                                <div class="d-flex flex-wrap gap-1">\n                                                                    '
+                    for l_2_topic in (undefined(name='subject_strong_topics') if l_1_subject_strong_topics is missing else l_1_subject_strong_topics):
+                        _loop_vars = {}
+                        pass
+                        yield '\n                                                                        <span class="badge bg-success-subtle text-success border border-success-subtle px-2 py-1">\n                                                                            '
+                        yield escape(context.call(environment.getattr(environment.getattr(l_2_topic, 'name'), 'replace'), 'Topic ', 'T', _loop_vars=_loop_vars))
+                        yield ' ('
+                        yield escape(t_2('%.0f', environment.getattr(l_2_topic, 'score_percentage')))
+                        yield '%)\n                                                                        </span>\n                                                                    '
+                    l_2_topic = missing
+                    yield '\n                                                                </div>\n                                                                <small class="text-muted d-block mt-1">High scores (>75%) with efficient time</small>\n                                                            '
+                else:
+                    pass
+                    yield '\n                                                                <small class="text-muted">No strong topics in '
+                    yield escape(l_1_subject_name)
+                    yield ' yet</small>\n                                                            '
+                yield '\n                                                        </div>\n                                                        \n                                                        <!-- Need Attention Topics for this subject -->\n                                                        <div class="mb-3">\n                                                            <h6 class="text-warning mb-2">\n                                                                <i class="fas fa-exclamation-circle me-1"></i>Need Attention ('
+                yield escape(t_4((undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics)))
+                yield ')\n                                                            </h6>\n                                                            '
+                if (undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics):
+                    pass
+                    yield '\n                                                                <div class="d-flex flex-wrap gap-1">\n                                                                    '
+                    for l_2_topic in (undefined(name='subject_need_attention_topics') if l_1_subject_need_attention_topics is missing else l_1_subject_need_attention_topics):
+                        _loop_vars = {}
+                        pass
+                        yield '\n                                                                        <span class="badge bg-warning-subtle text-warning border border-warning-subtle px-2 py-1">\n                                                                            '
+                        yield escape(context.call(environment.getattr(environment.getattr(l_2_topic, 'name'), 'replace'), 'Topic ', 'T', _loop_vars=_loop_vars))
+                        yield ' ('
+                        yield escape(t_2('%.0f', environment.getattr(l_2_topic, 'score_percentage')))
+                        yield '%)\n                                                                        </span>\n                                                                    '
+                    l_2_topic = missing
+                    yield '\n                                                                </div>\n                                                                <small class="text-muted d-block mt-1">Good scores but slow completion time</small>\n                                                            '
+                else:
+                    pass
+                    yield '\n                                                                <small class="text-muted">No topics need attention in '
+                    yield escape(l_1_subject_name)
+                    yield '</small>\n                                                            '
+                yield '\n                                                        </div>\n                                                        \n                                                        <!-- Weak Topics for this subject -->\n                                                        <div class="mb-3">\n                                                            <h6 class="text-danger mb-2">\n                                                                <i class="fas fa-times-circle me-1"></i>Weak Topics ('
+                yield escape(t_4((undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics)))
+                yield ')\n                                                            </h6>\n                                                            '
+                if (undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics):
+                    pass
+                    yield '\n                                                                <div class="d-flex flex-wrap gap-1">\n                                                                    '
+                    for l_2_topic in (undefined(name='subject_weak_topics') if l_1_subject_weak_topics is missing else l_1_subject_weak_topics):
+                        _loop_vars = {}
+                        pass
+                        yield '\n                                                                        <span class="badge bg-danger-subtle text-danger border border-danger-subtle px-2 py-1">\n                                                                            '
+                        yield escape(context.call(environment.getattr(environment.getattr(l_2_topic, 'name'), 'replace'), 'Topic ', 'T', _loop_vars=_loop_vars))
+                        yield ' ('
+                        yield escape(t_2('%.0f', environment.getattr(l_2_topic, 'score_percentage')))
+                        yield '%)\n                                                                        </span>\n                                                                    '
+                    l_2_topic = missing
+                    yield '\n                                                                </div>\n                                                                <small class="text-muted d-block mt-1">Scores ≤75% - need focused practice</small>\n                                                            '
+                else:
+                    pass
+                    yield '\n                                                                <small class="text-muted">No weak topics in '
+                    yield escape(l_1_subject_name)
+                    yield '</small>\n                                                            '
+                yield '\n                                                        </div>\n                                                    </div>\n                                                </div>\n                                            </div>\n                                        </div>\n                                    </div>\n                                </div>\n                                \n                                <!-- Progress Chart for this subject -->\n                                <div class="row mt-4">\n                                    <div class="col-12">\n                                        <div class="card border-0 shadow-sm">\n                                            <div class="card-body p-4">\n                                                <h5 class="card-title">\n                                                    <i class="fas fa-chart-line me-2 text-primary"></i>\n                                                    '
+                yield escape(l_1_subject_name)
+                yield ' Progress Tracker\n                                                </h5>\n                                                <p class="text-muted small mb-3">Track your performance improvement across '
+                yield escape(l_1_subject_name)
+                yield ' topics</p>\n                                                \n                                <div class="chart-container">\n                                    <div style="position: relative; height: 400px; width: 100%;">\n                                        <canvas id="'
+                yield escape(t_6(l_1_subject_name))
+                yield 'ProgressChart"></canvas>\n                                    </div>\n                                </div>                                                    <div class="chart-legend">\n                                                        <div class="legend-item">\n                                                            <div class="legend-color" style="background: #007bff;"></div>\n                                                            <span>Score Progression</span>\n                                                        </div>\n                                                        <div class="legend-item">\n                                                            <div class="legend-color" style="background: #28a745;"></div>\n                                                            <span>Target (75%)</span>\n                                                        </div>\n                                                    </div>\n                                                    \n                                                    <!-- Filled in from /api/history once the sheet has more than one recorded version -->\n                                                    <div class="mt-4 d-none" id="'
+                yield escape(t_6(l_1_subject_name))
+                yield 'HistoryContainer">\n                                                        <h6 class="card-title">\n                                                            <i class="fas fa-history me-2 text-primary"></i>\n                                                            '
+                yield escape(l_1_subject_name)
+                yield ' Over Time\n                                                        </h6>\n                                                        <div style="position: relative; height: 300px; width: 100%;">\n                                                            <canvas id="'
+                yield escape(t_6(l_1_subject_name))
+                yield 'HistoryChart"></canvas>\n                                                        </div>\n                                                    </div>\n                                                </div>\n                                            </div>\n                                        </div>\n                                    </div>\n                                </div>\n                                '
+            else:
+                pass
+                yield '\n                                <div class="alert alert-info border-0 shadow-sm">\n                                    <i class="fas fa-info-circle me-2"></i>\n                                    No topic data available for '
+                yield escape(l_1_subject_name)
+                yield '.\n                                </div>\n                                '
+            yield '\n                            </div>\n                            '
+        l_1_subject_name = l_1_subject_data = l_1_subject_strong_topics = l_1_subject_need_attention_topics = l_1_subject_weak_topics = missing
+        yield '\n                        </div>\n                        \n                        '
+    else:
+        pass
+        yield '\n                        <div class="alert alert-warning border-0 shadow-sm">\n                            <i class="fas fa-info-circle me-2"></i>\n                            No topic data available for this student.\n                        </div>\n                        '
+    yield '\n                    </div>\n                </div>\n\n            </div>\n        </div>\n\n        <!-- Footer -->\n        <div class="card-footer bg-light text-center py-4 border-0">\n            <div class="row">\n                <div class="col-md-6">\n                    <p class="mb-1"><strong>Report Generated:</strong></p>\n                    <p class="text-muted"'
+    if (undefined(name='stamp_in_browser') if l_0_stamp_in_browser is missing else l_0_stamp_in_browser):
+        pass
+        yield ' data-report-time'
+    yield '>'
+    yield escape(context.call(environment.getattr((undefined(name='report_time') if l_0_report_time is missing else l_0_report_time), 'strftime'), '%B %d, %Y at %I:%M %p'))
+    yield '</p>\n                </div>\n                <div class="col-md-6">\n                    <p class="mb-1"><strong>Academic Session:</strong></p>\n                    <p class="text-muted">2025-26</p>\n                </div>\n            </div>\n            <hr class="my-3">\n            <p class="mb-0 text-muted small">\n                <i class="fas fa-info-circle me-1"></i>\n                This is a computer-generated report based on topic-wise assessment data. \n                For any queries, please contact the academic office.\n            </p>\n        </div>\n    </div>\n    </div>\n\n    <!-- Bootstrap JS -->\n    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>\n    \n    <!-- Chart.js CDN -->\n    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>\n    \n    <!-- Tab functionality and Chart initialization -->\n    <script>\n        // Cached pages are the same bytes for every reader: show the time this one is viewed at\n        (function () {\n            const reportTime = document.querySelector(\'[data-report-time]\');\n            if (!reportTime) return;\n            const now = new Date();\n            const pad = n => String(n).padStart(2, \'0\');\n            const month = now.toLocaleString(\'en-US\', { month: \'long\' });\n            const hours = now.getHours() % 12 || 12;\n            reportTime.textContent = `${month} ${pad(now.getDate())}, ${now.getFullYear()} at ` +\n                `${pad(hours)}:${pad(now.getMinutes())} ${now.getHours() < 12 ? \'AM\' : \'PM\'}`;\n        })();\n        \n        // Chart series are precomputed on the server and fetched separately (columnar JSON)\n        const chartDataUrl = \''
+    yield escape(context.call((undefined(name='url_for') if l_0_url_for is missing else l_0_url_for), 'get_chart_data_api', class_name=environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Class'), roll_number=environment.getitem((undefined(name='student') if l_0_student is missing else l_0_student), 'Roll Number')))
+    yield "';\n        // Average marks of each subject across every recorded version of the sheet\n        const historyUrl = '"
+    yield escape(context.call((undefined(name='url_for') if l_0_url_for is missing else l_0_url_for), 'get_history_api', class_name=environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Class'), roll_number=environment.getitem((undefined(name='student') if l_0_student is missing else l_0_student), 'Roll Number')))
+    yield "';\n        \n        // Function to create Chart.js charts\n        function createProgressChart(canvasId, subjectName, labels, data, pointColors) {\n            const ctx = document.getElementById(canvasId);\n            if (!ctx) {\n                console.error('Canvas not found:', canvasId);\n                return;\n            }\n            \n            new Chart(ctx, {\n                type: 'line',\n                data: {\n                    labels: labels,\n                    datasets: [{\n                        label: subjectName + ' Progress',\n                        data: data,\n                        borderColor: '#007bff',\n                        backgroundColor: 'rgba(0, 123, 255, 0.1)',\n                        borderWidth: 3,\n                        pointBackgroundColor: pointColors,\n                        pointBorderColor: '#ffffff',\n                        pointBorderWidth: 2,\n                        pointRadius: 8,\n                        pointHoverRadius: 10,\n                        fill: true,\n                        tension: 0.4\n                    }]\n                },\n                options: {\n                    responsive: true,\n                    maintainAspectRatio: false,\n                    plugins: {\n                        title: {\n                            display: true,\n                            text: subjectName + ' Progress Chart',\n                            font: {\n                                size: 16,\n                                weight: 'bold'\n                            }\n                        },\n                        legend: {\n                            display: false\n                        }\n                    },\n                    scales: {\n                        y: {\n                            beginAtZero: true,\n                            max: 12,\n                            title: {\n                                display: true,\n                                text: 'Marks',\n                                font: {\n                                    weight: 'bold'\n                                }\n                            },\n                            grid: {\n                                color: 'rgba(0, 0, 0, 0.1)'\n                            }\n                        },\n                        x: {\n                            title: {\n                                display: true,\n                                text: 'Topics',\n                                font: {\n                                    weight: 'bold'\n                                }\n                            },\n                            grid: {\n                                display: false\n                            }\n                        }\n                    }\n                }\n            });\n            \n            console.log('Chart created successfully for:', subjectName);\n        }\n        \n        // Line chart of a subject's average percentage over time\n        function createHistoryChart(subjectName, points) {\n            const container = document.getElementById(subjectName.toLowerCase() + 'HistoryContainer');\n            if (!container) {\n                return;\n            }\n            container.classList.remove('d-none');\n            \n            new Chart(document.getElementById(subjectName.toLowerCase() + 'HistoryChart'), {\n                type: 'line',\n                data: {\n                    labels: points.map(point => new Date(point[0] * 1000).toLocaleDateString()),\n                    datasets: [{\n                        label: subjectName + ' Average',\n                        data: points.map(point => point[1]),\n                        borderColor: '#6f42c1',\n                        backgroundColor: 'rgba(111, 66, 193, 0.1)',\n                        borderWidth: 3,\n                        pointRadius: 5,\n                        fill: true,\n                        tension: 0.3,\n                        spanGaps: true\n                    }]\n                },\n                options: {\n                    responsive: true,\n                    maintainAspectRatio: false,\n                    plugins: {\n                        legend: {\n                            display: false\n                        }\n                    },\n                    scales: {\n                        y: {\n                            beginAtZero: true,\n                            max: 100,\n                            title: {\n                                display: true,\n                                text: 'Average %',\n                                font: {\n                                    weight: 'bold'\n                                }\n                            }\n                        },\n                        x: {\n                            grid: {\n                                display: false\n                            }\n                        }\n                    }\n                }\n            });\n        }\n        \n        // Initialize tabs and charts\n        document.addEventListener('DOMContentLoaded', function() {\n            // Initialize first tab as active\n            const firstTabButton = document.querySelector('#subjectTabs .nav-link:first-child');\n            const firstTabPane = document.querySelector('#subjectTabContent .tab-pane:first-child');\n            \n            if (firstTabButton && firstTabPane) {\n                firstTabButton.classList.add('active');\n                firstTabPane.classList.add('active', 'show');\n            }\n            \n            // Add click event listeners to tab buttons\n            document.querySelectorAll('#subjectTabs .nav-link').forEach(function(button) {\n                button.addEventListener('click', function(e) {\n                    e.preventDefault();\n                    \n                    // Remove active class from all tabs and panes\n                    document.querySelectorAll('#subjectTabs .nav-link').forEach(btn => btn.classList.remove('active'));\n                    document.querySelectorAll('#subjectTabContent .tab-pane').forEach(pane => {\n                        pane.classList.remove('active', 'show');\n                    });\n                    \n                    // Add active class to clicked tab\n                    this.classList.add('active');\n                    \n                    // Show corresponding tab pane\n                    const targetId = this.getAttribute('data-bs-target').substring(1);\n                    const targetPane = document.getElementById(targetId);\n                    if (targetPane) {\n                        targetPane.classList.add('active', 'show');\n                    }\n                });\n            });\n            \n            // Initialize charts\n            fetch(chartDataUrl)\n                .then(response => response.json())\n                .then(chartData => {\n                    if (!chartData.success) {\n                        console.error('Chart data unavailable:', chartData.error);\n                        return;\n                    }\n                    for (const [subjectName, series] of Object.entries(chartData.subjects)) {\n                        const canvasId = subjectName.toLowerCase() + 'ProgressChart';\n                        // Point colours come from the server as indexes into the palette\n                        const pointColors = series.points.map(point => chartData.palette[point]);\n                        createProgressChart(canvasId, subjectName, series.labels, series.marks, pointColors);\n                    }\n                })\n                .catch(error => console.error('Error loading chart data:', error));\n            \n            fetch(historyUrl)\n                .then(response => response.json())\n                .then(history => {\n                    if (!history.success) {\n                        return;\n                    }\n                    for (const [subjectName, series] of Object.entries(history.subjects)) {\n                        if (series.average.length > 1) {\n                            createHistoryChart(subjectName, series.average);\n                        }\n                    }\n                })\n                .catch(error => console.error('Error loading history:', error));\n        });\n    </script>\n</body>\n</html>"
+
+blocks = {}
+debug_info = '6=70&9=72&203=74&205=77&206=81&207=85&208=89&209=93&210=98&211=101&212=108&213=111&214=114&215=117&219=125&222=132&223=136&224=140&225=144&226=148&227=155&228=158&229=161&230=164&233=170&245=175&249=177&255=179&259=181&265=183&267=196&283=198&292=200&293=203&296=208&306=211&315=213&329=215&332=218&335=222&336=224&339=226&341=228&342=238&349=242&351=249&353=251&355=253&357=256&358=261&365=264&367=266&368=268&378=270&379=277&389=279&403=281&404=284&418=290&421=292&422=294&428=296&429=298&438=302&439=305&440=308&448=311&455=313&459=316&461=318&465=321&467=323&471=326&477=331&483=334&486=336&490=338&494=340&502=342&507=344&509=346&511=349&513=353&519=362&526=365&528=367&530=370&532=374&538=383&545=386&547=388&549=391&551=395&557=404&574=407&576=409&580=411&594=413&597=415&600=417&611=422&635=431&673=437&675=439'
\ No newline at end of file
@@ -0,0 +1,180 @@
+# jinja2 3.1 815e9eeecc46e5094c1db8daaa574bc091f13592 report.html
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'report.html'
+
+def root(context, missing=missing, environment=environment):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_student = resolve('student')
+    l_0_asset_url = resolve('asset_url')
+    l_0_generated_at = resolve('generated_at')
+    l_0_math_total = l_0_science_total = l_0_english_total = l_0_social_total = l_0_hindi_total = l_0_result = missing
+    try:
+        t_1 = environment.filters['int']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'int' found.")
+    pass
+    yield '<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n    <title>Student Report - '
+    yield escape(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'Name'))
+    yield '</title>\n    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">\n    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">\n    <link href="'
+    yield escape(context.call((undefined(name='asset_url') if l_0_asset_url is missing else l_0_asset_url), 'css/style.css'))
+    yield '" rel="stylesheet">\n    <style>\n        @media print {\n            .no-print { display: none !important; }\n            .container { max-width: 100% !important; }\n        }\n    </style>\n</head>\n<body>\n    <div class="container mt-4">\n        <!-- Header with Back Button -->\n        <div class="row no-print mb-4">\n            <div class="col-12">\n                <a href="/" class="btn btn-secondary">\n                    <i class="fas fa-arrow-left me-2"></i>Back to Search\n                </a>\n                <button onclick="window.print()" class="btn btn-info float-end">\n                    <i class="fas fa-print me-2"></i>Print Report\n                </button>\n            </div>\n        </div>\n\n        <!-- Report Card -->\n        <div class="card shadow-lg">\n            <!-- Header -->\n            <div class="card-header bg-primary text-white text-center py-4">\n                <h1 class="mb-2">\n                    <i class="fas fa-graduation-cap me-3"></i>\n                    Student Academic Report\n                </h1>\n                <p class="mb-0">Academic Session: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Academic Year', '2024-25'))
+    yield '</p>\n            </div>\n\n            <!-- Student Information -->\n            <div class="card-body">\n                <div class="row mb-4">\n                    <div class="col-lg-8">\n                        <h2 class="text-primary border-bottom pb-2">\n                            <i class="fas fa-user me-2"></i>Student Information\n                        </h2>\n                        <div class="row">\n                            <div class="col-md-6">\n                                <table class="table table-borderless">\n                                    <tr>\n                                        <td class="fw-bold">Name:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Name', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Roll Number:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Roll Number', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Class:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Class', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Section:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Section', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                </table>\n                            </div>\n                            <div class="col-md-6">\n                                <table class="table table-borderless">\n                                    <tr>\n                                        <td class="fw-bold">Father\'s Name:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Father Name', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Date of Birth:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Date of Birth', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Contact:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Contact Number', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                    <tr>\n                                        <td class="fw-bold">Address:</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Address', 'N/A'))
+    yield '</td>\n                                    </tr>\n                                </table>\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-lg-4 text-center">\n                        <div class="border rounded p-3 bg-light">\n                            <i class="fas fa-user-circle fa-5x text-muted mb-2"></i>\n                            <p class="text-muted">Student Photo</p>\n                        </div>\n                    </div>\n                </div>\n\n                <!-- Academic Performance -->\n                <div class="row mb-4">\n                    <div class="col-12">\n                        <h2 class="text-primary border-bottom pb-2">\n                            <i class="fas fa-chart-line me-2"></i>Academic Performance\n                        </h2>\n                        <div class="table-responsive">\n                            <table class="table table-striped table-hover">\n                                <thead class="table-primary">\n                                    <tr>\n                                        <th>Subject</th>\n                                        <th>Theory (80)</th>\n                                        <th>Practical (20)</th>\n                                        <th>Total (100)</th>\n                                        <th>Grade</th>\n                                        <th>Status</th>\n                                    </tr>\n                                </thead>\n                                <tbody>\n                                    <!-- Mathematics -->\n                                    <tr>\n                                        <td class="fw-bold">Mathematics</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Math Theory', 'N/A'))
+    yield '</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Math Practical', 'N/A'))
+    yield '</td>\n                                        <td class="fw-bold">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Math Total', 'N/A'))
+    yield '</td>\n                                        <td>\n                                            <span class="badge bg-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Math Grade', 'N/A'))
+    yield '</span>\n                                        </td>\n                                        <td>\n                                            '
+    l_0_math_total = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Math Total', 0)
+    context.vars['math_total'] = l_0_math_total
+    context.exported_vars.add('math_total')
+    yield '\n                                            '
+    if (t_1((undefined(name='math_total') if l_0_math_total is missing else l_0_math_total)) >= 40):
+        pass
+        yield '\n                                                <span class="badge bg-success">Pass</span>\n                                            '
+    else:
+        pass
+        yield '\n                                                <span class="badge bg-danger">Fail</span>\n                                            '
+    yield '\n                                        </td>\n                                    </tr>\n                                    <!-- Science -->\n                                    <tr>\n                                        <td class="fw-bold">Science</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Science Theory', 'N/A'))
+    yield '</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Science Practical', 'N/A'))
+    yield '</td>\n                                        <td class="fw-bold">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Science Total', 'N/A'))
+    yield '</td>\n                                        <td>\n                                            <span class="badge bg-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Science Grade', 'N/A'))
+    yield '</span>\n                                        </td>\n                                        <td>\n                                            '
+    l_0_science_total = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Science Total', 0)
+    context.vars['science_total'] = l_0_science_total
+    context.exported_vars.add('science_total')
+    yield '\n                                            '
+    if (t_1((undefined(name='science_total') if l_0_science_total is missing else l_0_science_total)) >= 40):
+        pass
+        yield '\n                                                <span class="badge bg-success">Pass</span>\n                                            '
+    else:
+        pass
+        yield '\n                                                <span class="badge bg-danger">Fail</span>\n                                            '
+    yield '\n                                        </td>\n                                    </tr>\n                                    <!-- English -->\n                                    <tr>\n                                        <td class="fw-bold">English</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'English Theory', 'N/A'))
+    yield '</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'English Practical', 'N/A'))
+    yield '</td>\n                                        <td class="fw-bold">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'English Total', 'N/A'))
+    yield '</td>\n                                        <td>\n                                            <span class="badge bg-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'English Grade', 'N/A'))
+    yield '</span>\n                                        </td>\n                                        <td>\n                                            '
+    l_0_english_total = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'English Total', 0)
+    context.vars['english_total'] = l_0_english_total
+    context.exported_vars.add('english_total')
+    yield '\n                                            '
+    if (t_1((undefined(name='english_total') if l_0_english_total is missing else l_0_english_total)) >= 40):
+        pass
+        yield '\n                                                <span class="badge bg-success">Pass</span>\n                                            '
+    else:
+        pass
+        yield '\n                                                <span class="badge bg-danger">Fail</span>\n                                            '
+    yield '\n                                        </td>\n                                    </tr>\n                                    <!-- Social Studies -->\n                                    <tr>\n                                        <td class="fw-bold">Social Studies</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Social Theory', 'N/A'))
+    yield '</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Social Practical', 'N/A'))
+    yield '</td>\n                                        <td class="fw-bold">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Social Total', 'N/A'))
+    yield '</td>\n                                        <td>\n                                            <span class="badge bg-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Social Grade', 'N/A'))
+    yield '</span>\n                                        </td>\n                                        <td>\n                                            '
+    l_0_social_total = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Social Total', 0)
+    context.vars['social_total'] = l_0_social_total
+    context.exported_vars.add('social_total')
+    yield '\n                                            '
+    if (t_1((undefined(name='social_total') if l_0_social_total is missing else l_0_social_total)) >= 40):
+        pass
+        yield '\n                                                <span class="badge bg-success">Pass</span>\n                                            '
+    else:
+        pass
+        yield '\n                                                <span class="badge bg-danger">Fail</span>\n                                            '
+    yield '\n                                        </td>\n                                    </tr>\n                                    <!-- Hindi -->\n                                    <tr>\n                                        <td class="fw-bold">Hindi</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Hindi Theory', 'N/A'))
+    yield '</td>\n                                        <td>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Hindi Practical', 'N/A'))
+    yield '</td>\n                                        <td class="fw-bold">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Hindi Total', 'N/A'))
+    yield '</td>\n                                        <td>\n                                            <span class="badge bg-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Hindi Grade', 'N/A'))
+    yield '</span>\n                                        </td>\n                                        <td>\n                                            '
+    l_0_hindi_total = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Hindi Total', 0)
+    context.vars['hindi_total'] = l_0_hindi_total
+    context.exported_vars.add('hindi_total')
+    yield '\n                                            '
+    if (t_1((undefined(name='hindi_total') if l_0_hindi_total is missing else l_0_hindi_total)) >= 40):
+        pass
+        yield '\n                                                <span class="badge bg-success">Pass</span>\n                                            '
+    else:
+        pass
+        yield '\n                                                <span class="badge bg-danger">Fail</span>\n                                            '
+    yield '\n                                        </td>\n                                    </tr>\n                                </tbody>\n                            </table>\n                        </div>\n                    </div>\n                </div>\n\n                <!-- Summary -->\n                <div class="row mb-4">\n                    <div class="col-md-6">\n                        <div class="card bg-light">\n                            <div class="card-body text-center">\n                                <h4 class="text-primary">Overall Performance</h4>\n                                <h2 class="text-success">'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Overall Percentage', 'N/A'))
+    yield '%</h2>\n                                <p class="mb-0">Total Marks: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Total Marks', 'N/A'))
+    yield '/500</p>\n                            </div>\n                        </div>\n                    </div>\n                    <div class="col-md-6">\n                        <div class="card bg-light">\n                            <div class="card-body text-center">\n                                <h4 class="text-primary">Result</h4>\n                                '
+    l_0_result = context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Result', 'N/A')
+    context.vars['result'] = l_0_result
+    context.exported_vars.add('result')
+    yield '\n                                '
+    if ((undefined(name='result') if l_0_result is missing else l_0_result) == 'Pass'):
+        pass
+        yield '\n                                    <h2 class="text-success">'
+        yield escape((undefined(name='result') if l_0_result is missing else l_0_result))
+        yield '</h2>\n                                '
+    elif ((undefined(name='result') if l_0_result is missing else l_0_result) == 'Fail'):
+        pass
+        yield '\n                                    <h2 class="text-danger">'
+        yield escape((undefined(name='result') if l_0_result is missing else l_0_result))
+        yield '</h2>\n                                '
+    else:
+        pass
+        yield '\n                                    <h2 class="text-muted">'
+        yield escape((undefined(name='result') if l_0_result is missing else l_0_result))
+        yield '</h2>\n                                '
+    yield '\n                                <p class="mb-0">Class Rank: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Class Rank', 'N/A'))
+    yield '</p>\n                            </div>\n                        </div>\n                    </div>\n                </div>\n\n                <!-- Additional Information -->\n                <div class="row">\n                    <div class="col-12">\n                        <h2 class="text-primary border-bottom pb-2">\n                            <i class="fas fa-info-circle me-2"></i>Additional Information\n                        </h2>\n                        <div class="row">\n                            <div class="col-md-6">\n                                <h5>Attendance</h5>\n                                <p>Total Days: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Total Days', 'N/A'))
+    yield '</p>\n                                <p>Present: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Days Present', 'N/A'))
+    yield '</p>\n                                <p>Attendance %: '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Attendance Percentage', 'N/A'))
+    yield '%</p>\n                            </div>\n                            <div class="col-md-6">\n                                <h5>Remarks</h5>\n                                <p>'
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Teacher Remarks', 'Good performance. Keep it up!'))
+    yield '</p>\n                                <p><strong>Class Teacher:</strong> '
+    yield escape(context.call(environment.getattr((undefined(name='student') if l_0_student is missing else l_0_student), 'get'), 'Class Teacher', 'N/A'))
+    yield '</p>\n                            </div>\n                        </div>\n                    </div>\n                </div>\n            </div>\n\n            <!-- Footer -->\n            <div class="card-footer bg-light text-center">\n                <p class="mb-2"><strong>Report Generated:</strong> '
+    yield escape((undefined(name='generated_at') if l_0_generated_at is missing else l_0_generated_at))
+    yield '</p>\n                <p class="mb-0 text-muted">This is a computer-generated report and does not require a signature.</p>\n            </div>\n        </div>\n    </div>\n\n    <!-- Bootstrap JS -->\n    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>\n</body>\n</html>'
+
+blocks = {}
+debug_info = '6=22&9=24&39=26&54=28&58=30&62=32&66=34&74=36&78=38&82=40&86=42&122=44&123=46&124=48&126=50&129=52&130=56&140=63&141=65&142=67&144=69&147=71&148=75&158=82&159=84&160=86&162=88&165=90&166=94&176=101&177=103&178=105&180=107&183=109&184=113&194=120&195=122&196=124&198=126&201=128&202=132&221=139&222=141&230=143&231=147&232=150&233=152&234=155&236=160&238=163&253=165&254=167&255=169&259=171&260=173&269=175'
\ No newline at end of file
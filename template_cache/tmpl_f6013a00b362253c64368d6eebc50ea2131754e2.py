@@ -0,0 +1,31 @@
+# jinja2 3.1 073c0c954f1573424167b0f36ea488d4d3382600 index.html
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'index.html'
+
+def root(context, missing=missing, environment=environment):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_asset_url = resolve('asset_url')
+    l_0_classes = resolve('classes')
+    pass
+    yield '<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n    <title>Student Report System</title>\n    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">\n    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">\n    <link href="'
+    yield escape(context.call((undefined(name='asset_url') if l_0_asset_url is missing else l_0_asset_url), 'css/style.css'))
+    yield '" rel="stylesheet">\n</head>\n<body>\n    <div class="container-fluid">\n        <!-- Header -->\n        <div class="row">\n            <div class="col-12">\n                <nav class="navbar navbar-expand-lg navbar-dark bg-primary">\n                    <div class="container">\n                        <a class="navbar-brand" href="#">\n                            <i class="fas fa-graduation-cap me-2"></i>\n                            Student Report System\n                        </a>\n                    </div>\n                </nav>\n            </div>\n        </div>\n\n        <!-- Main Content -->\n        <div class="container mt-5">\n            <div class="row justify-content-center">\n                <div class="col-lg-8 col-md-10 col-12">\n                    <div class="card shadow-lg">\n                        <div class="card-header bg-gradient-primary text-white text-center">\n                            <h2 class="mb-0">\n                                <i class="fas fa-search me-2"></i>\n                                Student Report Lookup\n                            </h2>\n                        </div>\n                        <div class="card-body p-5">\n                            <!-- Quick Search -->\n                            <div class="mb-4 position-relative">\n                                <label for="studentSearch" class="form-label h5">\n                                    <i class="fas fa-bolt me-2"></i>Quick Search\n                                </label>\n                                <input type="search" class="form-control form-control-lg" id="studentSearch"\n                                       placeholder="Student name, or class and roll number (e.g. 7B 12)" autocomplete="off">\n                                <div id="searchResults" class="list-group position-absolute w-100 shadow" style="z-index: 1000; display: none;"></div>\n                            </div>\n\n                            <form id="studentForm">\n                                <!-- Class Selection -->\n                                <div class="mb-4">\n                                    <label for="classSelect" class="form-label h5">\n                                        <i class="fas fa-school me-2"></i>Select Class\n                                    </label>\n                                    <select class="form-select form-select-lg" id="classSelect" required>\n                                        <option value="">Choose a class...</option>\n                                        '
+    for l_1_class in (undefined(name='classes') if l_0_classes is missing else l_0_classes):
+        _loop_vars = {}
+        pass
+        yield '\n                                        <option value="'
+        yield escape(l_1_class)
+        yield '">'
+        yield escape(l_1_class)
+        yield '</option>\n                                        '
+    l_1_class = missing
+    yield '\n                                    </select>\n                                </div>\n\n                                <!-- Roll Number Selection -->\n                                <div class="mb-4">\n                                    <label for="rollSelect" class="form-label h5">\n                                        <i class="fas fa-id-card me-2"></i>Select Roll Number\n                                    </label>\n                                    <select class="form-select form-select-lg" id="rollSelect" required disabled>\n                                        <option value="">First select a class...</option>\n                                    </select>\n                                </div>\n\n                                <!-- Submit Button -->\n                                <div class="d-grid">\n                                    <button type="submit" class="btn btn-primary btn-lg" id="submitBtn" disabled>\n                                        <i class="fas fa-file-alt me-2"></i>\n                                        Generate Report\n                                    </button>\n                                </div>\n                            </form>\n\n                            <!-- Loading indicator -->\n                            <div id="loadingIndicator" class="text-center mt-3" style="display: none;">\n                                <div class="spinner-border text-primary" role="status">\n                                    <span class="visually-hidden">Loading...</span>\n                                </div>\n                                <p class="mt-2">Loading students...</p>\n                            </div>\n                        </div>\n                    </div>\n                </div>\n            </div>\n\n            <!-- Report Container -->\n            <div id="reportContainer" class="mt-4" style="display: none;">\n                <!-- Report content will be loaded here -->\n            </div>\n        </div>\n\n        <!-- Footer -->\n        <footer class="bg-light text-center text-muted py-3 mt-5">\n            <div class="container">\n                <p class="mb-0">&copy; 2025 Student Report System. All rights reserved.</p>\n            </div>\n        </footer>\n    </div>\n\n    <!-- Bootstrap JS -->\n    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>\n    <!-- jQuery -->\n    <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>\n    <!-- Custom JS -->\n    <script src="'
+    yield escape(context.call((undefined(name='asset_url') if l_0_asset_url is missing else l_0_asset_url), 'js/main.js'))
+    yield '"></script>\n</body>\n</html>'
+
+blocks = {}
+debug_info = '9=14&57=16&58=20&113=26'
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Minification edge cases: a wrong build is cached by browsers for a year"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import build_assets
+
+
+def test_css_keeps_strings_and_url_values():
+    css = 'a { content: " a  b /* not a comment */ "; background: url( "img/x y.png" ) ; }'
+    assert build_assets.minify_css(css) == 'a{content:" a  b /* not a comment */ ";background:url("img/x y.png")}'
+
+
+def test_css_keeps_unquoted_and_data_urls():
+    css = ".a { background: url(img/a.png) no-repeat; mask: url('data:image/png;base64,iVBOR/w0+KGgo='); }"
+    minified = build_assets.minify_css(css)
+    assert 'url(img/a.png) no-repeat' in minified
+    assert "url('data:image/png;base64,iVBOR/w0+KGgo=')" in minified
+
+
+def test_css_refuses_to_change_a_quoted_string():
+    # csscompressor drops the space inside this data URI; the build must fail rather than ship it
+    css = "/* it's fine */ .a { mask: url('data:image/svg+xml;utf8,<svg a=\"1\"/>'); }"
+    with pytest.raises(ValueError):
+        build_assets.minify_css(css)
+
+
+def test_css_keeps_significant_whitespace():
+    css = '/* c */ .a  .b > .c:hover { width: calc(100% - 2px); margin : 0 auto ; }'
+    assert build_assets.minify_css(css) == '.a .b>.c:hover{width:calc(100% - 2px);margin:0 auto}'
+
+
+def test_js_keeps_strings_and_template_literals():
+    js = 'const s = "a // b /* c */";  // comment\nconst t = `x  // y ${ n /* z */ }\n  line`;\n'
+    minified = build_assets.minify_js(js)
+    assert '"a // b /* c */"' in minified
+    assert '`x  // y ${ n /* z */ }\n  line`' in minified
+    assert 'comment' not in minified
+
+
+def test_js_keeps_regex_literals_and_division():
+    js = 'var r = /ab\\/c[/]d/g; // x\nvar q = a / 2 / b;\nif (/\\d+/.test(s)) {}\n'
+    minified = build_assets.minify_js(js)
+    assert '/ab\\/c[/]d/g' in minified
+    assert 'a/2/b' in minified
+    assert '/\\d+/.test(s)' in minified
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+@pytest.mark.parametrize('asset', [asset for asset in build_assets.ASSETS if asset.endswith('.js')])
+def test_built_scripts_parse(asset, tmp_path):
+    with open(os.path.join(build_assets.STATIC_DIR, asset), encoding='utf-8') as f:
+        path = tmp_path / 'bundle.js'
+        path.write_text(build_assets.minify_js(f.read()), encoding='utf-8')
+    subprocess.run(['node', '--check', str(path)], check=True)
+
+
+def test_build_writes_hashed_files_and_manifest(tmp_path):
+    static_dir = tmp_path / 'static'
+    shutil.copytree(build_assets.STATIC_DIR, static_dir, ignore=shutil.ignore_patterns('dist'))
+    manifest = build_assets.build(str(static_dir))
+    assert json.loads((static_dir / 'dist' / 'manifest.json').read_text()) == manifest
+    for asset, built in manifest.items():
+        assert (static_dir / built).is_file() and (static_dir / (built + '.gz')).is_file()
+    assert build_assets.check(str(static_dir))
+    (static_dir / 'css' / 'style.css').write_text('a { color: red }', encoding='utf-8')
+    assert not build_assets.check(str(static_dir))
+
+
+def test_committed_build_is_current():
+    assert build_assets.check(), 'static/dist is out of date: run python build_assets.py'
@@ -0,0 +1,87 @@
+"""SheetChanges between two sheet versions, and the change feed that publishes them"""
+import copy
+
+import pytest
+
+from changes import ChangeFeed
+from sheet_model import ClassSheetModel
+
+ROWS = [['Class', '1A', '', '', '', ''],
+        ['Roll No.', 'Name', 'Topic 1', '', 'Topic 2', ''],
+        ['', '', 'Time', 'Marks', 'Time', 'Marks'],
+        ['1', 'Ann', 'Above Average', '10', 'Below Average', '4'],
+        ['2', 'Bob', 'Below Average', '8', 'Above Average', '6'],
+        ['3', 'Cy', 'Below Average', '2', 'Below Average', '9']]
+
+
+@pytest.fixture
+def old():
+    return ClassSheetModel.from_rows(ROWS, version='v1', timestamp=100)
+
+
+def _edit(old, edit):
+    rows = copy.deepcopy(ROWS)
+    edit(rows)
+    return ClassSheetModel.from_rows(rows, previous=old, version='v2', timestamp=200, previous_data=ROWS)
+
+
+def test_unchanged_sheet_has_no_changes(old):
+    changes = _edit(old, lambda rows: None).changes
+    assert changes.is_empty()
+    assert changes.to_dict()['previous_version'] == 'v1'
+
+
+def test_edited_mark_records_the_cell_and_everyone_whose_rank_moved(old):
+    def edit(rows):
+        rows[5][3] = '12'     # Cy jumps from last to first in Topic 1
+
+    new = _edit(old, edit)
+    changes = new.changes.to_dict()
+    assert not changes['structural']
+    assert changes['topics'] == {'Subject': ['Topic 1']}
+    assert changes['cells'] == [{'subject': 'Subject', 'topic': 'Topic 1', 'roll': '3', 'field': 'marks',
+                                 'old': 2.0, 'new': 12.0}]
+    assert changes['rolls'] == ['1', '2', '3']
+    # Students whose reports changed get the new revision; the others keep theirs
+    assert new.revisions['3'] == ('v2', 200)
+
+
+def test_time_edit_only_touches_that_student(old):
+    def edit(rows):
+        rows[3][4] = 'Above Average'
+
+    new = _edit(old, edit)
+    changes = new.changes.to_dict()
+    assert changes['cells'][0]['field'] == 'time'
+    assert changes['rolls'] == ['1']
+    assert new.revisions['2'] == ('v1', 100)
+
+
+def test_rename_is_recorded(old):
+    def edit(rows):
+        rows[4][1] = 'Robert'
+
+    changes = _edit(old, edit).changes.to_dict()
+    assert changes['cells'] == [{'subject': 'Subject', 'topic': None, 'roll': '2', 'field': 'name',
+                                 'old': 'Bob', 'new': 'Robert'}]
+    assert changes['rolls'] == ['2']
+
+
+def test_new_student_is_a_structural_change(old):
+    new = _edit(old, lambda rows: rows.append(['4', 'Dee', 'Below Average', '5', 'Below Average', '5']))
+    assert new.changes.structural
+    assert set(new.revisions) == {'1', '2', '3', '4'}
+    assert all(revision == ('v2', 200) for revision in new.revisions.values())
+
+
+def test_feed_returns_records_after_a_sequence_number(old):
+    feed = ChangeFeed(max_entries=2)
+    changes = _edit(old, lambda rows: rows[3].__setitem__(3, '11')).changes
+    for class_name in ('1A', '1B', '1A'):
+        feed.record(class_name, changes, at=200)
+
+    records, latest = feed.since(0)
+    assert latest == 3
+    assert [record['seq'] for record in records] == [2, 3]     # the oldest fell out of the bounded log
+    assert [record['seq'] for record in feed.since(2, class_name='1A')[0]] == [3]
+    assert feed.since(3) == ([], 3)
@@ -0,0 +1,31 @@
+"""Static export: which classes a re-run regenerates"""
+import json
+
+import app_simple
+import export_reports
+from synthetic_sheets import generate_class_rows
+
+
+def test_rerun_regenerates_only_on_a_new_sheet_or_render_fingerprint(tmp_path, monkeypatch):
+    connector = app_simple.GoogleSheetsConnector(snapshot_path='off', history_path='off', local_dir='')
+    monkeypatch.setattr(app_simple, 'sheets_connector', connector)
+    connector.load_class_sheet('1A', generate_class_rows('1A', 3, 2, 1, 0))
+    page = tmp_path / 'report' / '1A' / '1' / 'index.html'
+
+    def export():
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text('stale')
+        index = export_reports.export_all(str(tmp_path), class_names=['1A'], workers=1)
+        return index['classes']['1A'], page.read_text()
+
+    entry, html = export()
+    assert entry['fingerprint'] == app_simple.render_fingerprint() and 'Student 0001' in html
+    assert json.loads((tmp_path / 'index.json').read_text())['classes']['1A'] == entry
+
+    # Same sheet, same template and assets: nothing to do
+    assert export()[1] == 'stale'
+
+    # A deploy with another template or asset build re-renders the class
+    monkeypatch.setattr(app_simple, '_render_fingerprint', 'next-deploy')
+    entry, html = export()
+    assert entry['fingerprint'] == 'next-deploy' and 'Student 0001' in html
@@ -0,0 +1,118 @@
+"""HistoryStore: delta-encoded sheet versions, replayed back into per-student trends"""
+import pytest
+
+import app_simple
+from history import HistoryStore
+from sheet_model import ClassSheetModel
+
+TOPICS = ['Topic 1', 'Topic 2']
+
+
+def _rows(*students):
+    return [['Class', '1A', '', '', '', ''],
+            ['Roll No.', 'Name', *[cell for topic in TOPICS for cell in (topic, '')]],
+            ['', '', *['Time', 'Marks'] * len(TOPICS)],
+            *students]
+
+
+# Four versions of one class: edited marks and times, a student who joins,
+# one who leaves and comes back, and a cleared cell
+REVISIONS = [
+    (100, _rows(['1', 'Ann', 'Above Average', '10', 'Below Average', '4'],
+                ['2', 'Bob', 'Below Average', '8', 'Above Average', '6'],
+                ['3', 'Cy', 'Below Average', '2', 'Below Average', '9'])),
+    (200, _rows(['1', 'Ann', 'Above Average', '11', 'Below Average', '4'],
+                ['2', 'Bob', 'Below Average', '8', 'Below Average', '6'],
+                ['3', 'Cy', 'Below Average', '2', 'Below Average', '9'],
+                ['4', 'Dee', 'Above Average', '7', 'Above Average', '12'])),
+    (300, _rows(['1', 'Ann', 'Above Average', '11', 'Above Average', '5'],
+                ['2', 'Bob', 'Below Average', '8', 'Below Average', '6'],
+                ['4', 'Dee', 'Above Average', '7', '', ''])),
+    (400, _rows(['1', 'Ann', 'Above Average', '11', 'Above Average', '5'],
+                ['2', 'Bob', 'Above Average', '12', 'Below Average', '6'],
+                ['3', 'Cy', 'Above Average', '6', 'Below Average', '9'],
+                ['4', 'Dee', 'Above Average', '7', '', ''])),
+]
+
+
+def _full_state(rows):
+    """{(roll, topic): (marks, time)} read straight off a sheet"""
+    state = {}
+    for row in rows[3:]:
+        for i, topic in enumerate(TOPICS):
+            time_category, marks = row[2 + 2 * i], row[3 + 2 * i]
+            state[(row[0], topic)] = (float(marks or 0), time_category)
+    return state
+
+
+def _value_at(points, at):
+    """(marks, time) a trend series says was in effect at ``at``"""
+    value = (None, '')
+    for recorded_at, marks, time_category in points:
+        if recorded_at <= at:
+            value = (marks, time_category)
+    return value
+
+
+def _record(store, revisions):
+    return [store.append('1A', ClassSheetModel.from_rows(rows), f"v{at}", at) for at, rows in revisions]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history.sqlite3'))
+
+
+def test_only_changed_cells_are_written(store):
+    # 3 students x 2 topics, then: Ann's marks, Bob's time and Dee's two topics; Ann's Topic 2 and Cy's
+    # two closed cells, Dee's cleared cell; Bob's marks and Cy's two topics again
+    assert _record(store, REVISIONS) == [6, 4, 4, 3]
+    assert _record(store, REVISIONS[-1:]) == [0]     # a version already recorded is skipped
+
+
+def test_replayed_trends_match_every_full_sheet(store):
+    _record(store, REVISIONS)
+    rolls = {row[0] for _, rows in REVISIONS for row in rows[3:]}
+    for roll in rolls:
+        history = store.student_history('1A', roll)
+        assert history['versions'] == len(REVISIONS)
+        topics = history['subjects']['Subject']['topics']
+        for at, rows in REVISIONS:
+            expected = _full_state(rows)
+            for topic in TOPICS:
+                assert _value_at(topics.get(topic, []), at) == expected.get((roll, topic), (None, ''))
+
+
+def test_subject_average_follows_the_latest_marks(store):
+    _record(store, REVISIONS)
+    average = store.student_history('1A', '1')['subjects']['Subject']['average']
+    # Ann: (10 + 4), (11 + 4), (11 + 5) out of 12 each; nothing of hers changed in the last version
+    assert average == [[100, 58.33], [200, 62.5], [300, 66.67]]
+    assert store.student_history('1A', '2', since=250)['subjects']['Subject']['average'][0][0] == 200
+
+
+def test_a_new_process_replays_the_deltas_before_appending(store):
+    _record(store, REVISIONS[:3])
+    # A fresh store has no cached state and has to rebuild it from the recorded deltas
+    reopened = HistoryStore(store.path)
+    assert _record(reopened, REVISIONS[3:]) == [3]
+    history = reopened.student_history('1A', '3')
+    assert _value_at(history['subjects']['Subject']['topics']['Topic 1'], 300) == (None, '')
+    assert _value_at(history['subjects']['Subject']['topics']['Topic 1'], 400) == (6.0, 'Above Average')
+
+
+def test_history_endpoint(tmp_path, monkeypatch):
+    connector = app_simple.GoogleSheetsConnector(snapshot_path='off', history_path=str(tmp_path / 'history.sqlite3'))
+    monkeypatch.setattr(app_simple, 'sheets_connector', connector)
+    for _, rows in REVISIONS:
+        connector.load_class_sheet('1A', rows)
+    client = app_simple.app.test_client()
+
+    data = client.get('/api/history/1A/2').get_json()
+    assert data['success'] and data['versions'] == len(REVISIONS)
+    topics = data['subjects']['Subject']['topics']
+    assert [point[1:] for point in topics['Topic 1']] == [[8.0, 'Below Average'], [12.0, 'Above Average']]
+    assert [point[1:] for point in topics['Topic 2']] == [[6.0, 'Above Average'], [6.0, 'Below Average']]
+
+    assert client.get('/api/history/9Z/1').get_json() == {'success': False,
+                                                          'error': 'No history recorded for class 9Z'}
@@ -0,0 +1,94 @@
+"""The /report page: rendered-page cache, validators and unknown students"""
+import gzip
+import re
+from datetime import datetime
+
+import pytest
+
+import app_simple
+from page_cache import brotli
+from synthetic_sheets import generate_class_rows
+
+CLASS = 'TEST-REPORT'
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # A connector of its own, so the suite never writes into the app's real snapshot and history stores
+    connector = app_simple.GoogleSheetsConnector(snapshot_path=str(tmp_path / 'snapshots.sqlite3'),
+                                                 history_path=str(tmp_path / 'history.sqlite3'))
+    monkeypatch.setattr(app_simple, 'sheets_connector', connector)
+    connector.load_class_sheet(CLASS, generate_class_rows(CLASS, 5, 4, 2, 0))
+    app_simple.rendered_reports.invalidate(CLASS)
+    yield app_simple.app.test_client()
+    app_simple.rendered_reports.invalidate(CLASS)
+
+
+def _report_time(html):
+    match = re.search(r'(\w+ \d{2}, \d{4} at \d{2}:\d{2} [AP]M)', html)
+    return datetime.strptime(match.group(1), '%B %d, %Y at %I:%M %p')
+
+
+def test_cached_page_is_stamped_in_the_browser(client):
+    html = client.get(f"/report/{CLASS}/1").get_data(as_text=True)
+    assert 'data-report-time' in html
+    # Without scripts the page still shows when it was rendered
+    assert abs((datetime.now() - _report_time(html)).total_seconds()) < 120
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br', 'identity'])
+def test_cache_hits_serve_the_stored_bytes(client, encoding, monkeypatch):
+    if encoding == 'br' and brotli is None:
+        pytest.skip('brotli is not installed')
+    first = client.get(f"/report/{CLASS}/2", headers={'Accept-Encoding': encoding})
+
+    def no_compression(*args, **kwargs):
+        raise AssertionError('cache hit was compressed again')
+    monkeypatch.setattr(gzip, 'compress', no_compression)
+    if brotli is not None:
+        monkeypatch.setattr(brotli, 'compress', no_compression)
+    hits = app_simple.rendered_reports.get_stats()['hits']
+    second = client.get(f"/report/{CLASS}/2", headers={'Accept-Encoding': encoding})
+
+    assert app_simple.rendered_reports.get_stats()['hits'] == hits + 1
+    assert second.get_data() == first.get_data()
+    body = second.get_data()
+    if encoding != 'identity':
+        assert second.headers['Content-Encoding'] == encoding
+        body = brotli.decompress(body) if encoding == 'br' else gzip.decompress(body)
+    assert 'Student 0002' in body.decode()
+
+
+def test_unchanged_report_answers_304(client):
+    etag = client.get(f"/report/{CLASS}/3").headers['ETag']
+    assert client.get(f"/report/{CLASS}/3", headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_unknown_roll_is_404_and_not_cached(client):
+    before = app_simple.rendered_reports.get_stats()['size']
+    response = client.get(f"/report/{CLASS}/999")
+    assert response.status_code == 404
+    assert 'No data found' in response.get_data(as_text=True)
+    assert app_simple.rendered_reports.get_stats()['size'] == before
+
+
+def test_new_template_or_build_changes_the_etag(client, monkeypatch):
+    etag = client.get(f"/report/{CLASS}/4").headers['ETag']
+    monkeypatch.setattr(app_simple, '_render_fingerprint', 'next-deploy')
+    response = client.get(f"/report/{CLASS}/4", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_print_streams_every_report(client):
+    response = client.get(f"/print/{CLASS}")
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert html.count('class="print-page"') == 5
+    assert html.rstrip().endswith('</html>')
+
+
+def test_print_without_reports_is_404(client):
+    response = client.get('/print/NO-SUCH-CLASS')
+    assert response.status_code == 404
+    assert 'No reports found' in response.get_data(as_text=True)
@@ -0,0 +1,164 @@
+"""Sheet downloads under a deadline: retries, permanent failures and the circuit breaker"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import app_simple
+import fake_sheets_server
+from resilience import PERMANENT_FAILURE, CircuitBreaker, Deadline, FetchPolicy
+from sources import PublishedCsvSource, read_csv_stream
+
+
+@pytest.fixture
+def fake_sheets():
+    server, sheets = fake_sheets_server.serve(port=0, classes=['1A'], students=5, topics=3)
+    yield f"http://127.0.0.1:{server.server_address[1]}", sheets
+    server.shutdown()
+
+
+@pytest.fixture
+def trickle_url():
+    """A sheet whose rows arrive one every 50ms, so no single read ever times out"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            lines = [b'Roll No.,Name\n'] + [b'%d,Student %d\n' % (i, i) for i in range(40)]
+            self.send_response(200)
+            self.send_header('Content-Length', str(sum(map(len, lines))))
+            self.end_headers()
+            try:
+                for line in lines:
+                    self.wfile.write(line)
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                # The client gave up at its deadline and hung up
+                pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/sheet.csv"
+    server.shutdown()
+
+
+def _connector(urls, **kwargs):
+    connector = app_simple.GoogleSheetsConnector(snapshot_path='off', history_path='off', **kwargs)
+    connector.class_sheet_urls.update(urls)
+    return connector
+
+
+def test_read_csv_stream_gives_up_at_the_deadline():
+    def slow_chunks():
+        for i in range(20):
+            time.sleep(0.02)
+            yield b'%d,x\n' % i
+
+    with pytest.raises(TimeoutError):
+        read_csv_stream(slow_chunks(), Deadline(0.1))
+    assert len(read_csv_stream(slow_chunks())[0]) == 20
+
+
+def test_download_is_bounded_in_total_not_per_read(trickle_url):
+    source = PublishedCsvSource({'1A': trickle_url}, requests.Session, timeout=10)
+    started = time.monotonic()
+    assert source.fetch('1A', timeout=0.3) is None
+    assert time.monotonic() - started < 1.0
+
+
+def test_missing_sheet_is_not_retried_or_held_against_the_breaker(fake_sheets):
+    url, sheets = fake_sheets
+    connector = _connector({'GONE': f"{url}/GONE.csv"},
+                           fetch_policy=FetchPolicy(retries=2, backoff=0.01),
+                           circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(3):
+        assert connector._fetch_from_source('GONE') is PERMANENT_FAILURE
+    assert sheets.stats['not_found'] == 3
+    assert connector.breaker.state('GONE') == CircuitBreaker.CLOSED
+    assert connector.fetch_policy.get_stats()['retries'] == 0
+
+
+@pytest.mark.parametrize('status, expected', [(404, PERMANENT_FAILURE), (403, PERMANENT_FAILURE),
+                                              (429, None), (408, None), (503, None)])
+def test_only_client_errors_other_than_408_and_429_are_permanent(status, expected):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        source = PublishedCsvSource({'1A': f"http://127.0.0.1:{server.server_address[1]}/"},
+                                               requests.Session, timeout=5)
+        assert source.fetch('1A') is expected
+    finally:
+        server.shutdown()
+
+
+def test_fetch_policy_stops_at_a_permanent_failure():
+    calls = []
+
+    def attempt(timeout):
+        calls.append(timeout)
+        return PERMANENT_FAILURE
+
+    assert FetchPolicy(retries=3, backoff=0).run(attempt) == (PERMANENT_FAILURE, 1)
+    assert len(calls) == 1
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        assert breaker.acquire('1A') == CircuitBreaker.CLOSED
+        breaker.record_failure('1A')
+    breaker.record_success('1A')        # a success resets the count
+    for _ in range(3):
+        breaker.acquire('1A')
+        breaker.record_failure('1A')
+
+    assert breaker.state('1A') == CircuitBreaker.OPEN
+    assert breaker.acquire('1A') == CircuitBreaker.OPEN
+    assert 0 < breaker.retry_in('1A') <= 60
+    assert breaker.state('1B') == CircuitBreaker.CLOSED
+    assert breaker.get_stats()['opened'] == 1
+
+
+@pytest.fixture
+def tripped():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.acquire('1A')
+    breaker.record_failure('1A')
+    time.sleep(0.06)
+    return breaker
+
+
+def test_half_open_lets_a_single_trial_through(tripped):
+    assert tripped.state('1A') == CircuitBreaker.HALF_OPEN
+    assert tripped.acquire('1A') == CircuitBreaker.HALF_OPEN
+    assert tripped.acquire('1A') == CircuitBreaker.OPEN      # everyone else still fails fast
+    tripped.record_success('1A')
+    assert tripped.state('1A') == CircuitBreaker.CLOSED
+    assert tripped.acquire('1A') == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_opens_the_circuit_again(tripped):
+    assert tripped.acquire('1A') == CircuitBreaker.HALF_OPEN
+    tripped.record_failure('1A')
+    assert tripped.state('1A') == CircuitBreaker.OPEN
+    assert tripped.acquire('1A') == CircuitBreaker.OPEN
+
+
+def test_released_trial_goes_to_the_next_caller(tripped):
+    assert tripped.acquire('1A') == CircuitBreaker.HALF_OPEN
+    tripped.release('1A')
+    assert tripped.acquire('1A') == CircuitBreaker.HALF_OPEN
@@ -0,0 +1,137 @@
+"""School-wide student search: ranking, cold workers and concurrent searches"""
+import threading
+import time
+
+import pytest
+
+import app_simple
+import fake_sheets_server
+from search import StudentSearchIndex
+from sheet_cache import CachedSheet
+from snapshots import SnapshotStore
+from synthetic_sheets import generate_class_rows
+
+CLASSES = ['1A', '2A', '3A']
+
+
+@pytest.fixture
+def slow_sheets():
+    server, sheets = fake_sheets_server.serve(port=0, classes=CLASSES, students=5, topics=3, latency_ms=400)
+    yield f"http://127.0.0.1:{server.server_address[1]}", sheets
+    server.shutdown()
+
+
+@pytest.fixture
+def connector(slow_sheets, tmp_path):
+    url, _ = slow_sheets
+    snapshot_path = str(tmp_path / 'snapshots.sqlite3')
+    # An earlier process left a snapshot of one class behind
+    SnapshotStore(snapshot_path).save('2A', CachedSheet(generate_class_rows('2A', 5, 3, 2, 0)))
+    connector = app_simple.GoogleSheetsConnector(snapshot_path=snapshot_path, history_path='off')
+    connector.class_sheet_urls.update({class_name: f"{url}/{class_name}.csv" for class_name in CLASSES})
+    return connector
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.05)
+
+
+def test_cold_search_answers_from_snapshots_without_waiting(connector):
+    started = time.monotonic()
+    results = connector.search_students('student 3')
+    assert time.monotonic() - started < 0.3
+    assert {result['class'] for result in results} == {'2A'}
+
+    # The other classes are indexed in the background
+    _wait_for(lambda: all(connector.search_index.has_class(class_name) for class_name in CLASSES))
+    assert {result['class'] for result in connector.search_students('student 3')} == set(CLASSES)
+
+
+def test_concurrent_cold_searches_queue_each_class_once(connector, slow_sheets):
+    _, sheets = slow_sheets
+    threads = [threading.Thread(target=connector.search_students, args=('student',)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    _wait_for(lambda: all(connector.search_index.has_class(class_name) for class_name in CLASSES))
+    # One student-list read per class, however many searches raced for it
+    assert sheets.stats['requests'] == len(CLASSES)
+
+
+@pytest.fixture
+def index():
+    index = StudentSearchIndex()
+    index.update_class('7B', [{'Roll Number': '12', 'Name': 'Maria Lopez'},
+                              {'Roll Number': '3', 'Name': 'Mario Rossi'}])
+    index.update_class('10A', [{'Roll Number': '12', 'Name': 'Marian  Keyes'},
+                               {'Roll Number': '5', 'Name': 'Tom Marr'}])
+    return index
+
+
+def _found(results):
+    return [(result['class'], result['roll'], result['match']) for result in results]
+
+
+def test_class_and_roll_number_is_an_exact_match(index):
+    assert _found(index.search('7b/12'))[0] == ('7B', '12', 'exact')
+    assert _found(index.search('7B 12'))[0] == ('7B', '12', 'exact')
+
+
+def test_bare_roll_number_lists_every_class_in_grade_order(index):
+    assert _found(index.search('12'))[:2] == [('7B', '12', 'roll'), ('10A', '12', 'roll')]
+
+
+def test_prefixes_match_any_name_word_alphabetically(index):
+    assert _found(index.search('mar')) == [('7B', '12', 'prefix'), ('10A', '12', 'prefix'),
+                                           ('7B', '3', 'prefix'), ('10A', '5', 'prefix')]
+    assert _found(index.search('mar ros')) == [('7B', '3', 'prefix')]
+
+
+def test_misspelt_names_are_found_by_similarity(index):
+    results = index.search('maria lopes')
+    assert _found(results)[0] == ('7B', '12', 'similar')
+    assert all(result['match'] == 'similar' for result in results)
+
+
+def test_reindexing_a_class_replaces_its_students(index):
+    assert not index.update_class('7B', [{'Roll Number': '12', 'Name': 'Maria Lopez'},
+                                         {'Roll Number': '3', 'Name': 'Mario Rossi'}])
+    assert index.update_class('7B', [{'Roll Number': '12', 'Name': 'Maria Lopez'}])
+    assert ('7B', '3', 'prefix') not in _found(index.search('mario'))
+    assert index.get_stats() == {'classes': 2, 'students': 3, 'tokens': 6}
+
+
+
+class _ReindexedMidSearch(StudentSearchIndex):
+    """Reindexes a class the moment a search has read the index state, as a concurrent update would"""
+    def __init__(self, class_name, students):
+        self.pending = None
+        super().__init__()
+        self.class_name, self.students = class_name, students
+
+    @property
+    def _state(self):
+        state = self.__dict__['_state']
+        if self.pending:
+            self.pending = False
+            self.update_class(self.class_name, self.students)
+        return state
+
+    @_state.setter
+    def _state(self, state):
+        self.__dict__['_state'] = state
+
+
+def test_search_during_reindexing_sees_one_consistent_state():
+    index = _ReindexedMidSearch('7B', [{'Roll Number': '1', 'Name': 'Zed Young'}])
+    index.update_class('7B', [{'Roll Number': str(i), 'Name': f"Pat Avery{i}"} for i in range(5)])
+
+    index.pending = True
+    results = index.search('pat avery4')
+    # The search answers from the index as it was when it started; the update shows up next time
+    assert _found(results)[0] == ('7B', '4', 'prefix')
+    assert [result['name'] for result in index.search('zed')] == ['Zed Young']
@@ -0,0 +1,63 @@
+"""SheetCache: freshness windows, LRU eviction and counters"""
+import pytest
+
+from sheet_cache import CachedSheet, SheetCache
+from synthetic_sheets import generate_class_rows
+
+
+@pytest.fixture
+def entry():
+    return CachedSheet(generate_class_rows('1A', 3, 2, 1, 0))
+
+
+def test_entry_is_fresh_then_stale_then_expired(entry):
+    cache = SheetCache(ttl=60, stale_ttl=300)
+    assert cache.is_fresh(entry)
+
+    entry.fetched_at -= 61
+    assert not cache.is_fresh(entry)
+    assert cache.is_servable_stale(entry)
+
+    entry.fetched_at -= 300
+    assert not cache.is_servable_stale(entry)
+
+    entry.touch()
+    assert cache.is_fresh(entry)
+
+
+def test_stale_ttl_zero_never_serves_stale(entry):
+    cache = SheetCache(ttl=60, stale_ttl=0)
+    entry.fetched_at -= 61
+    assert not cache.is_servable_stale(entry)
+
+
+def test_least_recently_used_class_is_evicted(entry):
+    cache = SheetCache(max_entries=2)
+    cache.put('1A', entry)
+    cache.put('1B', entry)
+    cache.get('1A')            # 1B is now the least recently used
+    cache.put('1C', entry)
+
+    assert cache.get('1B') is None
+    assert cache.get('1A') is entry and cache.get('1C') is entry
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['size'] == 2
+    assert stats['classes'] == ['1A', '1C']
+
+
+def test_invalidate_one_class_or_everything(entry):
+    cache = SheetCache()
+    cache.put('1A', entry)
+    cache.put('1B', entry)
+    cache.invalidate('1A')
+    assert cache.get('1A') is None and cache.get('1B') is entry
+    cache.invalidate()
+    assert cache.entries() == []
+
+
+def test_hit_ratio_counts_stale_hits():
+    cache = SheetCache()
+    for counter in ('hits', 'hits', 'stale_hits', 'misses'):
+        cache.record(counter)
+    assert cache.get_stats()['hit_ratio'] == 0.75
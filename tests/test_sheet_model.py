@@ -0,0 +1,35 @@
+"""ClassSheetModel: parsing a class sheet into students, scores and ranks"""
+from sheet_model import ClassSheetModel, scan_student_list
+
+
+def _sheet(*students):
+    return [['Class', '1A', '', '', '', ''],
+            ['Roll No.', 'Name', 'Topic 1', '', 'Topic 2', ''],
+            ['', '', 'Time', 'Marks', 'Time', 'Marks'],
+            *students]
+
+
+def test_rows_without_a_name_cell_are_not_students():
+    rows = _sheet(['1', 'Ann', 'Above Average', '9', 'Below Average', '4'],
+                  ['4'],
+                  ['2', '', 'Below Average', '3', 'Above Average', '7'])
+    expected = [{'Roll Number': '1', 'Name': 'Ann'}, {'Roll Number': '2', 'Name': ''}]
+    assert ClassSheetModel.from_rows(rows).students == expected
+    assert scan_student_list(rows) == expected
+
+
+def test_duplicate_roll_number_keeps_its_lowest_placing():
+    rows = _sheet(['1', 'Ann', 'Above Average', '12', 'Above Average', '5'],
+                  ['2', 'Bob', 'Above Average', '8', 'Above Average', '6'],
+                  ['1', 'Ann', 'Above Average', '3', 'Above Average', '9'])
+    ranks = ClassSheetModel.from_rows(rows).rank_tables()['Subject']
+    # Every row is ranked; the roll number listed twice ends up with the worse of its two ranks
+    assert ranks['Topic 1'] == {'1': 3, '2': 2}
+    assert ranks['Topic 2'] == {'1': 3, '2': 2}
+
+
+def test_tied_marks_share_the_best_rank():
+    rows = _sheet(['1', 'Ann', 'Above Average', '9', '', ''],
+                  ['2', 'Bob', 'Above Average', '9', '', ''],
+                  ['3', 'Cy', 'Above Average', '4', '', ''])
+    assert ClassSheetModel.from_rows(rows).rank_tables()['Subject']['Topic 1'] == {'1': 1, '2': 1, '3': 3}
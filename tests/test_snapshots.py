@@ -0,0 +1,104 @@
+"""SnapshotStore: what a fresh process gets back from disk"""
+import json
+import os
+import pickle
+import sqlite3
+import stat
+import zlib
+
+import pytest
+
+import app_simple
+from sheet_cache import CachedSheet
+from snapshots import SnapshotStore
+from synthetic_sheets import generate_class_rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / 'snapshots.sqlite3'), keep_versions=2)
+
+
+def _sheet(seed=0, **validators):
+    return CachedSheet(generate_class_rows('1A', 6, 4, 2, seed), downloaded_at=1_700_000_000 + seed, **validators)
+
+
+def test_round_trip_keeps_rows_validators_and_rebuilds_the_model(store):
+    saved = _sheet(etag='"abc"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    store.save('1A', saved)
+
+    loaded = store.load('1A')
+    assert loaded.data == saved.data
+    assert (loaded.version, loaded.etag, loaded.last_modified) == (saved.version, '"abc"', saved.last_modified)
+    assert loaded.downloaded_at == saved.downloaded_at
+    assert loaded.model.version == saved.version
+    assert loaded.model.students == saved.model.students
+    assert loaded.model.rank_tables() == saved.model.rank_tables()
+    # Restored copies count as old as their download, so they are revalidated right away
+    assert loaded.fetched_at == saved.downloaded_at
+
+
+def test_newest_version_wins_and_old_ones_are_pruned(store):
+    for seed in range(4):
+        store.save('1A', _sheet(seed))
+    assert store.load('1A').version == _sheet(3).version
+    with sqlite3.connect(store.path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM sheet_snapshots').fetchone()[0] == 2
+
+
+class _Planted:
+    ran = False
+
+    def __reduce__(self):
+        return (_mark_planted_code_as_run, ())
+
+
+def _mark_planted_code_as_run():
+    _Planted.ran = True
+
+
+def test_pickled_models_in_older_files_are_never_loaded(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    saved = _sheet()
+    # The layout earlier versions wrote, with a pickle someone planted in it
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE sheet_snapshots (class_name TEXT NOT NULL, version TEXT NOT NULL, etag TEXT, '
+                     'last_modified TEXT, downloaded_at REAL NOT NULL, rows BLOB NOT NULL, model BLOB, '
+                     'PRIMARY KEY (class_name, version))')
+        conn.execute('INSERT INTO sheet_snapshots VALUES (?, ?, NULL, NULL, ?, ?, ?)',
+                     ('1A', saved.version, saved.downloaded_at,
+                      zlib.compress(json.dumps(saved.data).encode('utf-8')), zlib.compress(pickle.dumps(_Planted()))))
+
+    store = SnapshotStore(path)
+    assert store.load('1A').model.rank_tables() == saved.model.rank_tables()
+    assert not _Planted.ran
+    store.save('1A', _sheet(1))
+    assert store.load('1A').version == _sheet(1).version
+
+
+def test_default_stores_live_in_a_private_data_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv('SHEET_SNAPSHOT_PATH', raising=False)
+    monkeypatch.delenv('SHEET_HISTORY_PATH', raising=False)
+    monkeypatch.setenv('APP_DATA_DIR', str(tmp_path / 'data'))
+    connector = app_simple.GoogleSheetsConnector()
+    assert connector.snapshots.path == str(tmp_path / 'data' / 'snapshots.sqlite3')
+    assert connector.history.path == str(tmp_path / 'data' / 'history.sqlite3')
+    assert stat.S_IMODE(os.stat(tmp_path / 'data').st_mode) == 0o700
+
+
+def test_data_directory_other_users_can_write_to_is_refused(tmp_path, monkeypatch):
+    shared = tmp_path / 'shared'
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    monkeypatch.delenv('SHEET_SNAPSHOT_PATH', raising=False)
+    monkeypatch.delenv('SHEET_HISTORY_PATH', raising=False)
+    monkeypatch.setenv('APP_DATA_DIR', str(shared))
+    assert app_simple.app_data_dir() is None
+    connector = app_simple.GoogleSheetsConnector()
+    assert connector.snapshots is None and connector.history is None
+
+
+def test_unknown_class_and_class_listing(store):
+    assert store.load('9Z') is None
+    store.save('1A', _sheet())
+    assert store.classes() == ['1A']
@@ -0,0 +1,42 @@
+"""Caching headers of the built assets served from static/dist/"""
+import json
+import os
+
+import pytest
+
+import app_simple
+
+
+@pytest.fixture
+def client():
+    return app_simple.app.test_client()
+
+
+@pytest.fixture
+def manifest():
+    with open(app_simple.ASSET_MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_fingerprinted_asset_is_immutable_and_precompressed(client, manifest):
+    response = client.get(f"/static/{manifest['css/style.css']}", headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == app_simple.IMMUTABLE_CACHE_CONTROL
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+@pytest.mark.parametrize('path', ['manifest.json', 'css/style.css', 'js/main.js'])
+def test_unhashed_names_are_not_served(client, path):
+    assert client.get(f"/static/dist/{path}").status_code == 404
+
+
+def test_precompressed_variants_are_not_served_directly(client, manifest):
+    built = manifest['js/main.js']
+    assert os.path.isfile(os.path.join(app_simple.app.static_folder, built + '.gz'))
+    assert client.get(f"/static/{built}.gz").status_code == 404
+
+
+def test_templates_reference_the_build(manifest):
+    with app_simple.app.test_request_context():
+        assert app_simple.asset_url('js/charts.js') == f"/static/{manifest['js/charts.js']}"